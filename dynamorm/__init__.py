@@ -5,6 +5,7 @@
     from dynamorm import DynaModel
 
 """
+from .aggregates import Avg, Count, Max, Min, Sum  # noqa
 from .model import DynaModel  # noqa
 from .indexes import GlobalIndex, LocalIndex, ProjectAll, ProjectKeys, ProjectInclude  # noqa
 from .relationships import ManyToOne, OneToMany, OneToOne  # noqa
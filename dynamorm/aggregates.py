@@ -0,0 +1,214 @@
+"""Aggregates summarize the items of a query or scan in a single pass, without creating instances of your model.
+
+Only the attributes that the aggregates (and groups) need are requested, through a ``ProjectionExpression``, and each
+page is aggregated as it is read, so the memory used is constant for each group rather than growing with the number of
+items:
+
+.. code-block:: python
+
+    from dynamorm import Avg, Count, Sum
+
+    totals = Order.query(customer='alice').aggregate(orders=Count(), total=Sum('amount'))
+    # {'orders': 12, 'total': Decimal('1043.50')}
+
+    by_status = Order.scan().aggregate(by='status', segments=8, total=Sum('amount'), average=Avg('amount'))
+    # {'open': {'total': Decimal('120.00'), 'average': Decimal('40.00')}, 'shipped': {...}}
+
+The values of the aggregates are the raw values of the items (numbers are ``Decimal`` objects), and items that don't
+have the aggregated attribute are left out of it, just like ``NULL`` values are left out of SQL aggregates.  Groups are
+keyed by the value of the ``by`` attribute (or a tuple of values, when grouping by several attributes), which is None
+for items that don't have it.  Values that can't be dict keys are converted into ones that can: lists become tuples,
+sets become frozensets and maps become tuples of their ``(key, value)`` pairs, sorted by key.  Scans can be aggregated
+over segments of the table in parallel.
+
+New aggregates subclass :class:`Aggregate`, implementing its ``add`` & ``merge`` methods.
+"""
+
+import abc
+
+import six
+
+from .conditions import MISSING, resolve
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Aggregate(object):
+    """The base class of aggregates, whose subclasses must implement :meth:`add` & :meth:`merge`
+
+    Aggregates keep a state for each group, which is updated with each item and then turned into the result.  The states
+    of the same group from different segments of a scan are merged together.
+
+    :param str attribute: The name (or path, such as ``address.city``) of the attribute to aggregate
+    """
+    def __init__(self, attribute=None):
+        self.attribute = attribute
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, self.attribute)
+
+    def start(self):
+        """Return the state of a group with no items"""
+        return None
+
+    def update(self, state, item):
+        """Return the state updated with a raw item, skipping items that don't have the attribute"""
+        value = resolve(item, self.attribute) if self.attribute else item
+        if value is MISSING or value is None:
+            return state
+        return self.add(state, value)
+
+    @abc.abstractmethod
+    def add(self, state, value):
+        """Return the state updated with a value"""
+
+    @abc.abstractmethod
+    def merge(self, state, other):
+        """Return the combination of two states of the same group"""
+
+    def result(self, state):
+        """Return the result of a state"""
+        return state
+
+
+class Count(Aggregate):
+    """Count the items, or if an attribute is given the items that have it"""
+    def start(self):
+        return 0
+
+    def add(self, state, value):
+        return state + 1
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Sum(Aggregate):
+    """Add up the values of an attribute"""
+    def start(self):
+        return 0
+
+    def add(self, state, value):
+        return state + value
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Min(Aggregate):
+    """The smallest value of an attribute, or None if no items have it"""
+    def add(self, state, value):
+        return value if state is None else min(state, value)
+
+    def merge(self, state, other):
+        return self.add(state, other) if other is not None else state
+
+
+class Max(Aggregate):
+    """The largest value of an attribute, or None if no items have it"""
+    def add(self, state, value):
+        return value if state is None else max(state, value)
+
+    def merge(self, state, other):
+        return self.add(state, other) if other is not None else state
+
+
+class Avg(Aggregate):
+    """The average value of an attribute, or None if no items have it"""
+    def start(self):
+        return (0, 0)
+
+    def add(self, state, value):
+        return (state[0] + value, state[1] + 1)
+
+    def merge(self, state, other):
+        return (state[0] + other[0], state[1] + other[1])
+
+    def result(self, state):
+        total, count = state
+        return total / count if count else None
+
+
+def hashable(value):
+    """Return a value that can be used as the key of a group in place of a list, set or map"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, hashable(member)) for key, member in six.iteritems(value)))
+    if isinstance(value, (list, tuple)):
+        return tuple(hashable(member) for member in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class Aggregation(object):
+    """Aggregates raw items into groups, for :meth:`dynamorm.table.ReadIterator.aggregate`
+
+    :param by: The name of the attribute to group by, or a list of names, or None to aggregate every item together
+    :param dict aggregates: The :class:`Aggregate` objects, by the names of their results
+    """
+    def __init__(self, by, aggregates):
+        if not aggregates:
+            raise ValueError("At least one aggregate is required")
+
+        self.by = by
+        self.aggregates = aggregates
+        self.groups = {}
+
+    @property
+    def attributes(self):
+        """Return the names of the attributes needed by the groups & aggregates, in order and without duplicates"""
+        names = []
+        if self.by is not None:
+            names.extend([self.by] if isinstance(self.by, six.string_types) else self.by)
+        names.extend(aggregate.attribute for aggregate in six.itervalues(self.aggregates) if aggregate.attribute)
+        return [name for position, name in enumerate(names) if name not in names[:position]]
+
+    def group_of(self, item):
+        if self.by is None:
+            return None
+        if isinstance(self.by, six.string_types):
+            return self.value(item, self.by)
+        return tuple(self.value(item, name) for name in self.by)
+
+    @staticmethod
+    def value(item, name):
+        value = resolve(item, name)
+        return None if value is MISSING else hashable(value)
+
+    def add(self, items):
+        """Add raw items to their groups"""
+        for item in items:
+            group = self.group_of(item)
+            try:
+                states = self.groups[group]
+            except KeyError:
+                states = self.groups[group] = dict(
+                    (name, aggregate.start()) for name, aggregate in six.iteritems(self.aggregates)
+                )
+
+            for name, aggregate in six.iteritems(self.aggregates):
+                states[name] = aggregate.update(states[name], item)
+
+    def merge(self, other):
+        """Merge the groups of another aggregation into this one"""
+        for group, other_states in six.iteritems(other.groups):
+            states = self.groups.get(group)
+            if states is None:
+                self.groups[group] = other_states
+                continue
+            for name, aggregate in six.iteritems(self.aggregates):
+                states[name] = aggregate.merge(states[name], other_states[name])
+
+    def results(self):
+        """Return the results; a dict of the aggregates by name, or a dict of those by group when grouping"""
+        results = dict((group, self.result(states)) for group, states in six.iteritems(self.groups))
+        if self.by is not None:
+            return results
+
+        try:
+            return results[None]
+        except KeyError:
+            # no items were read
+            return self.result(dict((name, aggregate.start()) for name, aggregate in six.iteritems(self.aggregates)))
+
+    def result(self, states):
+        return dict((name, aggregate.result(states[name])) for name, aggregate in six.iteritems(self.aggregates))
@@ -0,0 +1,599 @@
+"""Bulk exports write every item of a model's table to files, for loading into analytics tools, and bulk imports load
+files of items into a table.
+
+For exports the table is read with a parallel scan, and each segment of the scan is written to its own file as its
+pages arrive, so only a page of items per segment is held in memory.  The items are written as they are stored in the
+table (they are not loaded into model instances), in one of these formats:
+
+* ``ndjson``: one JSON object per line
+* ``csv``: one column per field of the schema, with a header row; values that aren't strings are written as JSON, as
+  are the strings of fields that aren't string fields when they would otherwise be read back as JSON
+* ``parquet``: written in row groups of ``row_group_size`` items; this requires `pyarrow`_.  The type of each column
+  comes from its field: integer fields are ``int64``, float fields ``float64``, boolean fields ``bool`` and all others
+  are strings (numbers are written as exact decimal text, binary values as base64 and lists, maps & sets as JSON)
+
+Numbers are never converted to floats (unless they belong to float fields), so they're written exactly.
+
+.. code-block:: python
+
+    progress = Thing.export('/data/things', format='csv', segments=8)
+    print("Exported {0} items at {1:.0f} items/s".format(progress.items, progress.rate))
+
+The progress of each segment is checkpointed in the directory after every page, and running the same export again
+resumes from where it stopped (``ndjson`` & ``csv`` segments resume from their last page, ``parquet`` segments that
+weren't finished are written again).
+
+Imports read NDJSON or CSV files (such as those written by exports) a chunk of records at a time, validate the records
+through the model's schema in a pool of processes, and write the valid items with concurrent batch writes:
+
+.. code-block:: python
+
+    result = Thing.import_file('/data/things/things-00000.csv')
+    print("Imported {0} items, rejected {1}".format(result.imported, result.rejected))
+
+Records that fail validation are written to a "rejects" file (``<path>.rejects.ndjson`` by default) along with their
+line number and validation errors, rather than stopping the import.  The byte offset of the file that has been fully
+imported is checkpointed (to ``<path>.checkpoint.json`` by default) after every chunk, and importing the same file again
+resumes from there.
+
+.. _pyarrow: https://arrow.apache.org/docs/python/
+"""
+
+import collections
+import csv
+import decimal
+import json
+import logging
+import os
+import threading
+import time
+
+import six
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from six.moves import collections_abc
+
+from .concurrency import concurrent_map
+from .cursors import decode_cursor, encode_cursor
+from .exceptions import ValidationError
+from .processes import picklable, process_count
+from .streams import FileCheckpointStore
+from .values import dumps, plain
+
+log = logging.getLogger(__name__)
+
+# The name of the file that the progress of an export is checkpointed to, in the export's directory
+EXPORT_CHECKPOINTS = 'export.checkpoints.json'
+
+
+class ExportProgress(collections.namedtuple('ExportProgress', ['items', 'pages', 'segments_done', 'segments',
+                                                               'elapsed'])):
+    """The progress of an export; ``items`` & ``pages`` count what was written by this run"""
+    __slots__ = ()
+
+    @property
+    def rate(self):
+        """The number of items written per second"""
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+
+class ImportResult(collections.namedtuple('ImportResult', ['imported', 'rejected', 'offset', 'elapsed'])):
+    """The result of an import; ``imported`` & ``rejected`` count the records that were handled by this run, and
+    ``offset`` is the byte offset of the file that has been imported up to"""
+    __slots__ = ()
+
+    @property
+    def rate(self):
+        """The number of records handled per second"""
+        return (self.imported + self.rejected) / self.elapsed if self.elapsed else 0.0
+
+
+class Exporter(object):
+    """Export the items of a model's table to files in a directory, through a parallel scan
+
+    :param model: The model class whose table is exported
+    :param str path: The directory to write the files to, which is created if it doesn't exist
+    :param str format: One of ``ndjson``, ``csv`` or ``parquet``
+    :param int segments: The number of segments to scan the table in, each of which is written to its own file; defaults
+                         to ``max_workers`` of the table
+    :param bool resume: If True (the default) an export that was stopped part way through is resumed, otherwise it is
+                        started again
+    :param progress: A function that is called with an :class:`ExportProgress` after every page is written
+    :param int row_group_size: The number of items in each row group of Parquet files
+    :param bool consistent: If True the scan uses consistent reads
+    """
+    def __init__(self, model, path, format='ndjson', segments=None, resume=True, progress=None, row_group_size=10000,
+                 consistent=False):
+        if format not in WRITERS:
+            raise ValueError("Unknown export format: {0}".format(format))
+
+        self.model = model
+        self.path = path
+        self.format = format
+        self.segments = segments or model.Table.max_workers
+        self.resume = resume
+        self.progress = progress
+        self.row_group_size = row_group_size
+        self.consistent = consistent
+
+        table = model.Table
+        self.fields = list(table.key_schema_names) + sorted(
+            name for name in table.schema.dynamorm_fields() if name not in table.key_schema_names
+        )
+        self.types = value_types(table.schema, self.fields)
+
+        self.lock = threading.Lock()
+        self.checkpoints = None
+        self.started = None
+        self.items = self.pages = self.segments_done = 0
+
+    def segment_path(self, segment):
+        """Return the path of the file that a segment is written to"""
+        return os.path.join(self.path, '{0}-{1:05d}.{2}'.format(self.model.Table.name, segment, self.format))
+
+    def run(self):
+        """Export the table, returning the final :class:`ExportProgress`
+
+        :raises ValueError: If resuming an export that was started with a different format or number of segments
+        """
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+        checkpoint_path = os.path.join(self.path, EXPORT_CHECKPOINTS)
+        if not self.resume and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.checkpoints = FileCheckpointStore(checkpoint_path)
+
+        settings = {'format': self.format, 'segments': self.segments}
+        previous = self.checkpoints.get('settings')
+        if previous is None:
+            self.checkpoints.set('settings', settings)
+        elif previous != settings:
+            raise ValueError("The export in {0} was started with different settings ({1}), pass resume=False to start "
+                             "it again".format(self.path, previous))
+
+        self.started = time.time()
+        self.items = self.pages = self.segments_done = 0
+        concurrent_map(self.export_segment, range(self.segments), self.segments)
+
+        progress = self.current_progress()
+        log.info("Exported %d items of %s in %.1fs (%.0f items/s)", progress.items, self.model.Table.name,
+                 progress.elapsed, progress.rate)
+        return progress
+
+    def export_segment(self, segment):
+        """Scan a single segment of the table, writing its items to the segment's file"""
+        state = self.checkpoints.get(str(segment)) or {'last': None, 'offset': None, 'items': 0, 'done': False}
+        if state['done']:
+            self.report(0, page=False, done=True)
+            return
+
+        writer_class = WRITERS[self.format]
+        if not writer_class.resumable:
+            state = {'last': None, 'offset': None, 'items': 0, 'done': False}
+
+        scan_kwargs = {'Segment': segment, 'TotalSegments': self.segments}
+        if self.consistent:
+            scan_kwargs['ConsistentRead'] = True
+        if state['last']:
+            scan_kwargs['ExclusiveStartKey'] = decode_cursor(state['last']).last
+
+        writer = writer_class(self.segment_path(segment), self.fields, offset=state['offset'],
+                              row_group_size=self.row_group_size, types=self.types)
+        try:
+            while True:
+                response = self.model.Table.scan(scan_kwargs=dict(scan_kwargs))
+                writer.write(response['Items'])
+
+                last = response.get('LastEvaluatedKey')
+                state = {
+                    'last': encode_cursor(last) if last else None,
+                    'offset': writer.offset(),
+                    'items': state['items'] + response['Count'],
+                    'done': last is None,
+                }
+                if last is None:
+                    writer.close()
+
+                if writer.resumable or last is None:
+                    self.checkpoints.set(str(segment), state)
+                self.report(response['Count'], done=last is None)
+
+                if last is None:
+                    return
+                scan_kwargs['ExclusiveStartKey'] = last
+        finally:
+            writer.close()
+
+    def report(self, count, page=True, done=False):
+        """Count a page and/or a finished segment, and pass the progress to the progress function"""
+        with self.lock:
+            self.items += count
+            self.pages += 1 if page else 0
+            self.segments_done += 1 if done else 0
+            progress = self.current_progress()
+
+        log.debug("Export of %s: %d items, %d/%d segments done", self.model.Table.name, progress.items,
+                  progress.segments_done, progress.segments)
+        if self.progress is not None:
+            self.progress(progress)
+
+    def current_progress(self):
+        return ExportProgress(self.items, self.pages, self.segments_done, self.segments, time.time() - self.started)
+
+
+class Importer(object):
+    """Import the records of an NDJSON or CSV file into a model's table
+
+    :param model: The model class whose table the items are written to
+    :param str path: The file to import
+    :param str format: Either ``ndjson`` or ``csv``, defaults to ``csv`` for files ending in ``.csv`` and ``ndjson``
+                       otherwise
+    :param str rejects: The file that rejected records are appended to, defaults to ``<path>.rejects.ndjson``
+    :param str checkpoint: The file that progress is checkpointed to, defaults to ``<path>.checkpoint.json``
+    :param bool resume: If True (the default) an import that was stopped part way through is resumed, otherwise it is
+                        started again
+    :param int chunk_size: The number of records that are validated & written together
+    :param int processes: The number of processes that validate records, defaults to the number of CPUs.  If this is 0,
+                          or the model can't be sent to a process (see :mod:`dynamorm.processes`), the records are
+                          validated in threads instead
+    :param int max_workers: The number of threads that write batches, defaults to ``max_workers`` of the table
+    :param progress: A function that is called with an :class:`ImportResult` after every chunk is imported
+    """
+    def __init__(self, model, path, format=None, rejects=None, checkpoint=None, resume=True, chunk_size=500,
+                 processes=None, max_workers=None, progress=None):
+        self.model = model
+        self.path = path
+        self.format = format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        if self.format not in ('ndjson', 'csv'):
+            raise ValueError("Unknown import format: {0}".format(self.format))
+
+        self.rejects = rejects or path + '.rejects.ndjson'
+        self.checkpoint = checkpoint or path + '.checkpoint.json'
+        self.resume = resume
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.max_workers = max_workers or model.Table.max_workers
+        self.progress = progress
+        self.types = value_types(model.Table.schema, model.Table.schema.dynamorm_fields())
+
+    def run(self):
+        """Import the file, returning the :class:`ImportResult` of this run"""
+        if not self.resume and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        checkpoints = FileCheckpointStore(self.checkpoint)
+        state = checkpoints.get('progress') or {'offset': 0, 'line': 0}
+
+        started = time.time()
+        imported = rejected = 0
+        validator = self.validator()
+        writer = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            with open(self.path, 'rb') as source, open(self.rejects, 'ab' if state['offset'] else 'wb') as rejects:
+                pending = collections.deque()
+                chunks = self.chunks(source, state['offset'], state['line'])
+                while True:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        records, offset, line = chunk
+                        validation = validator.submit(validate_records, self.model, records)
+                        pending.append((writer.submit(self.write, validation), offset, line))
+
+                    # keep a bounded number of chunks in flight, and checkpoint them in the order of the file
+                    while pending and (chunk is None or len(pending) > 2 * self.max_workers):
+                        write, offset, line = pending.popleft()
+                        written, failed = write.result()
+                        rejects.write(b''.join(
+                            json.dumps({'line': number, 'record': record, 'errors': errors},
+                                       sort_keys=True, default=str).encode('utf-8') + b'\n'
+                            for number, record, errors in failed
+                        ))
+                        rejects.flush()
+                        checkpoints.set('progress', {'offset': offset, 'line': line})
+
+                        imported += written
+                        rejected += len(failed)
+                        if self.progress is not None:
+                            self.progress(ImportResult(imported, rejected, offset, time.time() - started))
+
+                    if chunk is None:
+                        break
+        finally:
+            writer.shutdown(wait=True)
+            validator.shutdown(wait=True)
+
+        result = ImportResult(imported, rejected, (checkpoints.get('progress') or {}).get('offset', 0),
+                              time.time() - started)
+        log.info("Imported %d items into %s from %s (%d rejected) in %.1fs (%.0f records/s)", result.imported,
+                 self.model.Table.name, self.path, result.rejected, result.elapsed, result.rate)
+        return result
+
+    def validator(self):
+        """Return the executor that validates records, a process pool unless processes is 0 or the model can't be
+        pickled"""
+        if self.processes == 0:
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+
+        if not picklable(self.model):
+            log.warning("%s can't be pickled, so its records will be validated in threads", self.model.__name__)
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return ProcessPoolExecutor(max_workers=process_count(self.processes))
+
+    def write(self, validation):
+        """Write the valid items of a chunk once it has been validated, returning the number written and the rejects"""
+        valid, failed = validation.result()
+        if valid:
+            self.model.Table.put_batch(*valid)
+        return len(valid), failed
+
+    def chunks(self, source, offset, line):
+        """Generate chunks of ``(line number, record)`` pairs from the file, along with the offset & line number that
+        follow them"""
+        header = None
+        if self.format == 'csv':
+            header_line = self.read_record(source)
+            header = next(csv.reader([header_line.decode('utf-8')] if six.PY3 else [header_line]))
+            if header and six.PY2:
+                header = [name.decode('utf-8') for name in header]
+            line = max(line, 1)
+            offset = max(offset, source.tell())
+
+        source.seek(offset)
+        records = []
+        while True:
+            raw = self.read_record(source)
+            if not raw:
+                break
+            line += raw.count(b'\n') or 1
+            if raw.strip():
+                records.append((line, self.parse(raw, header)))
+
+            if len(records) == self.chunk_size:
+                yield records, source.tell(), line
+                records = []
+
+        if records:
+            yield records, source.tell(), line
+
+    def read_record(self, source):
+        """Read the raw bytes of the next record; CSV records continue over lines while they have an open quote"""
+        raw = source.readline()
+        if self.format == 'csv':
+            while raw and raw.count(b'"') % 2:
+                more = source.readline()
+                if not more:
+                    break
+                raw += more
+        return raw
+
+    def parse(self, raw, header):
+        """Parse a raw record into a dict, or an :class:`InvalidRecord` if it can't be parsed"""
+        text = raw.decode('utf-8')
+        if header is None:
+            try:
+                record = json.loads(text, parse_float=decimal.Decimal)
+            except ValueError as exc:
+                return InvalidRecord(text.rstrip('\r\n'), 'Invalid JSON: {0}'.format(exc))
+            if not isinstance(record, dict):
+                return InvalidRecord(text.rstrip('\r\n'), 'Records must be JSON objects')
+            return record
+
+        if six.PY2:
+            cells = [cell.decode('utf-8') for cell in next(csv.reader([raw]))]
+        else:
+            cells = next(csv.reader([text]))
+        if len(cells) != len(header):
+            return InvalidRecord(text.rstrip('\r\n'), 'Expected {0} columns, found {1}'.format(len(header), len(cells)))
+        return dict((name, csv_cell(cell, self.types.get(name))) for name, cell in zip(header, cells) if cell != '')
+
+
+# A record that couldn't be parsed, which is rejected along with the reason
+InvalidRecord = collections.namedtuple('InvalidRecord', ['text', 'error'])
+
+
+def validate_records(model, records):
+    """Validate ``(line number, record)`` pairs through the model's schema, returning the valid items and a list of
+    ``(line number, record, errors)`` for the others
+
+    This runs in the processes of an :class:`Importer`.
+    """
+    valid, failed = [], []
+    for number, record in records:
+        if isinstance(record, InvalidRecord):
+            failed.append((number, record.text, {'_record': [record.error]}))
+            continue
+
+        missing = [name for name in model.Table.key_schema_names if record.get(name) in (None, '')]
+        if missing:
+            failed.append((number, record, dict((name, ['A value is required for the key.']) for name in missing)))
+            continue
+
+        try:
+            valid.append(model.Schema.dynamorm_validate(model._versioned(record)))
+        except ValidationError as exc:
+            failed.append((number, record, jsonable(exc.errors)))
+    return valid, failed
+
+
+def jsonable(errors):
+    """Convert validation errors (which may hold exception objects) into plain dicts, lists & strings"""
+    if hasattr(errors, 'to_primitive'):
+        errors = errors.to_primitive()
+    if isinstance(errors, collections_abc.Mapping):
+        return dict((six.text_type(key), jsonable(val)) for key, val in six.iteritems(errors))
+    if isinstance(errors, (list, tuple)):
+        return [jsonable(val) for val in errors]
+    if isinstance(errors, six.string_types):
+        return errors
+    return six.text_type(errors)
+
+
+def value_types(schema, names):
+    """Return a dict of the type of each named attribute's values: the column type of its field (see
+    ``field_to_column_type``), ``decimal`` for number fields that don't hold floats, or None"""
+    fields = schema.dynamorm_fields()
+    types = {}
+    for name in names:
+        field = fields.get(name)
+        value_type = None if field is None else schema.field_to_column_type(field)
+        if value_type == 'float' and schema.field_to_number_parser(field) is None:
+            value_type = 'decimal'
+        types[name] = value_type
+    return types
+
+
+def csv_cell(cell, value_type=None):
+    """Convert the text of a CSV cell back into a value; the cells of string fields are text, and other cells holding
+    JSON maps, lists & strings (as written by exports) are decoded, other cells are left as text for the schema to
+    convert"""
+    if value_type != 'str' and cell[:1] in ('{', '[', '"'):
+        try:
+            return json.loads(cell, parse_float=decimal.Decimal)
+        except ValueError:
+            pass
+    return cell
+
+
+class NDJSONWriter(object):
+    """Write items to a file as lines of JSON, starting at ``offset`` (or the start of a new file)"""
+    resumable = True
+
+    def __init__(self, path, fields, offset=None, row_group_size=None, types=None):
+        self.fields = fields
+        self.types = types or {}
+        if offset is None:
+            self.file = open(path, 'wb')
+            self.start()
+        else:
+            self.file = open(path, 'r+b')
+            self.file.seek(offset)
+            self.file.truncate()
+
+    def start(self):
+        """Called when a new file is started"""
+
+    def write(self, items):
+        self.file.write(b''.join(self.line(item) for item in items))
+        self.file.flush()
+
+    def line(self, item):
+        return dumps(plain(item)).encode('utf-8') + b'\n'
+
+    def offset(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class CSVWriter(NDJSONWriter):
+    """Write items to a file as CSV, with a column for each field"""
+    def start(self):
+        self.file.write(csv_line(self.fields))
+
+    def line(self, item):
+        return csv_line([csv_value(plain(item.get(field)), self.types.get(field)) for field in self.fields])
+
+
+class ParquetWriter(object):
+    """Write items to a Parquet file, in row groups of ``row_group_size`` items, with a column type for each field"""
+    resumable = False
+
+    def __init__(self, path, fields, offset=None, row_group_size=10000, types=None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Exporting to Parquet requires pyarrow, install it with: pip install dynamorm[parquet]")
+
+        self.pyarrow = pyarrow
+        self.path = path
+        self.fields = fields
+        self.types = types or {}
+        self.schema = pyarrow.schema([
+            (field, getattr(pyarrow, ARROW_TYPES.get(self.types.get(field), 'string'))()) for field in fields
+        ])
+        self.row_group_size = row_group_size
+        self.rows = []
+        self.writer = None
+        self.closed = False
+
+    def write(self, items):
+        self.rows.extend(
+            dict((field, parquet_value(item.get(field), self.types.get(field))) for field in self.fields)
+            for item in items
+        )
+        while len(self.rows) >= self.row_group_size:
+            self.flush(self.rows[:self.row_group_size])
+            self.rows = self.rows[self.row_group_size:]
+
+    def flush(self, rows):
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(self.pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def offset(self):
+        return None
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.rows or self.writer is None:
+            self.flush(self.rows)
+            self.rows = []
+        self.writer.close()
+
+
+# The names of the pyarrow types of the Parquet columns of each type of value, the others are strings
+ARROW_TYPES = {
+    'int': 'int64',
+    'float': 'float64',
+    'bool': 'bool_',
+}
+
+WRITERS = {
+    'ndjson': NDJSONWriter,
+    'csv': CSVWriter,
+    'parquet': ParquetWriter,
+}
+
+
+def csv_value(value, value_type=None):
+    """Return the text of a CSV cell for a plain value; strings are written as they are, unless they belong to a field
+    that isn't a string field and :func:`csv_cell` would decode them as JSON"""
+    if value is None:
+        return u''
+    if isinstance(value, six.text_type) and (value_type == 'str' or value[:1] not in ('{', '[', '"')):
+        return value
+    return dumps(value)
+
+
+def csv_line(cells):
+    """Return a line of CSV, encoded as UTF-8"""
+    if six.PY2:
+        buffer = six.BytesIO()
+        csv.writer(buffer).writerow([cell.encode('utf-8') for cell in cells])
+        return buffer.getvalue()
+    buffer = six.StringIO()
+    csv.writer(buffer).writerow(cells)
+    return buffer.getvalue().encode('utf-8')
+
+
+def parquet_value(value, value_type=None):
+    """Convert a value read from DynamoDB into one for a Parquet column of the type of its field"""
+    if value is None:
+        return None
+    if value_type == 'int' and isinstance(value, decimal.Decimal):
+        if value != value.to_integral_value():
+            raise ValueError("{0} is not an integer".format(value))
+        return int(value)
+    if value_type == 'float' and isinstance(value, decimal.Decimal):
+        return float(value)
+    if value_type in ARROW_TYPES:
+        return value
+
+    value = plain(value)
+    return value if isinstance(value, six.string_types) else dumps(value)
@@ -0,0 +1,198 @@
+"""Columnar results hold the values of each attribute of the items of a query or scan in a column, for analytics.
+
+The columns are built directly from the raw pages of the read, without creating instances of your model, and only the
+attributes you ask for (or all of the fields of the schema) are requested.  The type of each column comes from the
+type of its field in the schema:
+
+.. code-block:: python
+
+    columns = Order.scan().to_columns('status', 'amount')
+    # {'status': ['open', 'shipped', ...], 'amount': array('d', [40.0, 12.5, ...])}
+
+    arrays = Order.scan().to_numpy('status', 'amount')   # numpy arrays, requires numpy
+    table = Order.scan().to_arrow('status', 'amount')    # a pyarrow Table, requires pyarrow
+    frame = table.to_pandas()
+
+Integer & float fields become ``int64`` & ``float64`` columns (``array.array`` objects, when neither numpy nor pyarrow
+are used), boolean fields become ``bool`` columns and string fields become string columns.  The values of any other
+fields, and of attributes that aren't in the schema, are kept as they were read.  Values that are missing, or that
+don't match the type of their field, are null in Arrow tables.  With numpy, and in plain columns, they're ``NaN`` in
+numeric columns (which makes integer columns with missing values into float columns) and None in the others.  Numbers
+with a fractional part raise a ``ValueError`` in integer columns, rather than being truncated.
+"""
+
+import array
+import collections
+import decimal
+
+import six
+
+from boto3.dynamodb.types import Binary
+
+from .conditions import MISSING, resolve
+from .values import arrow_value
+
+# The array typecodes of the columns that are held in typed buffers
+TYPECODES = {
+    'int': 'q' if six.PY3 else 'l',
+    'float': 'd',
+    'bool': 'b',
+}
+
+# The values that take the place of missing values in typed buffers
+PLACEHOLDERS = {
+    'int': 0,
+    'float': float('nan'),
+    'bool': 0,
+}
+
+
+class Column(object):
+    """A column of values, which are appended to a typed buffer (for ``int``, ``float`` & ``bool`` columns) or a list
+
+    :param str column_type: The type of the column, or None to keep values as they are
+    :param str name: The name of the column, for errors
+    """
+    def __init__(self, column_type=None, name=None):
+        self.column_type = column_type
+        self.name = name
+        typecode = TYPECODES.get(column_type)
+        self.values = array.array(typecode) if typecode else []
+
+        # a byte for each value that's 1 if the value is missing, only created once a value is missing
+        self.missing = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        """Append a raw value, or ``MISSING``
+
+        :raises ValueError: If a number with a fractional part is appended to an integer column
+        """
+        if self.column_type == 'int' and isinstance(value, (float, decimal.Decimal)) and value % 1:
+            raise ValueError("The value {0} of the integer column {1} is not an integer".format(value, self.name))
+
+        if value is not MISSING and value is not None:
+            try:
+                value = self.convert(value)
+            except (TypeError, ValueError, ArithmeticError):
+                value = MISSING
+
+        if value is MISSING or value is None:
+            if self.missing is None:
+                self.missing = bytearray(len(self.values))
+            self.missing.append(1)
+            self.values.append(PLACEHOLDERS.get(self.column_type))
+            return
+
+        if self.missing is not None:
+            self.missing.append(0)
+        self.values.append(value)
+
+    def convert(self, value):
+        if self.column_type == 'int':
+            if not isinstance(value, (six.integer_types, float, decimal.Decimal)) or isinstance(value, bool):
+                raise TypeError("Not a number")
+            return int(value)
+        if self.column_type == 'float':
+            if not isinstance(value, (six.integer_types, float, decimal.Decimal)) or isinstance(value, bool):
+                raise TypeError("Not a number")
+            return float(value)
+        if self.column_type == 'bool':
+            if not isinstance(value, bool):
+                raise TypeError("Not a boolean")
+            return int(value)
+        if self.column_type == 'str' and not isinstance(value, six.string_types):
+            raise TypeError("Not a string")
+        if isinstance(value, Binary):
+            return value.value
+        return value
+
+    def is_missing(self, position):
+        return self.missing is not None and self.missing[position] == 1
+
+    def to_python(self):
+        """Return the column as an ``array.array`` for numbers, or a list"""
+        if self.column_type == 'int' and self.missing is not None:
+            return array.array('d', (
+                PLACEHOLDERS['float'] if self.is_missing(position) else value
+                for position, value in enumerate(self.values)
+            ))
+        if self.column_type == 'bool':
+            return [None if self.is_missing(position) else bool(value) for position, value in enumerate(self.values)]
+        return self.values
+
+    def to_numpy(self, numpy):
+        """Return the column as a numpy array"""
+        if self.column_type in ('int', 'float'):
+            values = self.to_python()
+            return numpy.frombuffer(values, dtype=numpy.float64 if values.typecode == 'd' else numpy.int64)
+        if self.column_type == 'bool' and self.missing is None:
+            return numpy.frombuffer(self.values, dtype=numpy.int8).astype(bool)
+
+        column = numpy.empty(len(self.values), dtype=object)
+        column[:] = self.to_python()
+        return column
+
+    def to_arrow(self, pyarrow):
+        """Return the column as a pyarrow array"""
+        if self.column_type in ('int', 'float'):
+            arrow_type = pyarrow.int64() if self.column_type == 'int' else pyarrow.float64()
+            if self.missing is None:
+                return pyarrow.Array.from_buffers(arrow_type, len(self.values), [None, pyarrow.py_buffer(self.values)])
+            return pyarrow.array(self.nullable(), type=arrow_type)
+        if self.column_type == 'bool':
+            return pyarrow.array(self.to_python(), type=pyarrow.bool_())
+        if self.column_type == 'str':
+            return pyarrow.array(self.values, type=pyarrow.string())
+        return pyarrow.array([arrow_value(value) for value in self.values])
+
+    def nullable(self):
+        """Return a list of the values, with None for the missing values"""
+        return [None if self.is_missing(position) else value for position, value in enumerate(self.values)]
+
+
+class ColumnBuilder(object):
+    """Build the columns of the named attributes from pages of raw items, for the ``to_columns``, ``to_numpy`` &
+    ``to_arrow`` methods of :class:`dynamorm.table.ReadIterator`
+
+    :param schema: The schema of the model, whose fields give the types of the columns
+    :param names: The names (or paths, such as ``address.city``) of the attributes
+    """
+    def __init__(self, schema, names):
+        fields = schema.dynamorm_fields()
+        self.columns = collections.OrderedDict(
+            (name, Column(schema.field_to_column_type(fields[name]) if name in fields else None, name))
+            for name in names
+        )
+
+    def add(self, items):
+        """Append the values of a page of raw items to the columns"""
+        if not isinstance(items, list):
+            # the items of incremental reads can only be iterated over once
+            items = list(items)
+        for name, column in six.iteritems(self.columns):
+            append = column.append
+            for item in items:
+                append(resolve(item, name))
+
+    def to_python(self):
+        return collections.OrderedDict((name, column.to_python()) for name, column in six.iteritems(self.columns))
+
+    def to_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Numpy columns require numpy, install it with: pip install dynamorm[numpy]")
+        return collections.OrderedDict((name, column.to_numpy(numpy)) for name, column in six.iteritems(self.columns))
+
+    def to_arrow(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("Arrow tables require pyarrow, install it with: pip install dynamorm[arrow]")
+        return pyarrow.Table.from_arrays(
+            [column.to_arrow(pyarrow) for column in six.itervalues(self.columns)],
+            names=list(self.columns)
+        )
@@ -0,0 +1,185 @@
+"""Helpers for coordinating the requests that DynamORM sends to DynamoDB from multiple threads."""
+
+import copy
+import logging
+import sys
+import threading
+
+import six
+
+from concurrent.futures import ThreadPoolExecutor
+from six.moves import queue
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+
+log = logging.getLogger(__name__)
+
+
+class SingleFlight(object):
+    """Coalesce concurrent calls that share the same key into a single call
+
+    The first caller for a key (the "leader") executes the function.  Any caller that arrives with the same key while
+    the leader is still executing waits for it to finish and receives a deep copy of its result (or has its exception
+    raised), instead of executing the function again.  Once the leader finishes the key is forgotten, so calls that
+    arrive later execute the function as normal.
+
+    The ``saved`` attribute counts how many calls were avoided by sharing an in-flight result.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.saved = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """Call ``func(*args, **kwargs)``, unless a call for ``key`` is already in flight
+
+        :param key: A hashable value identifying the call, see :func:`freeze`
+        :param func: The function to call
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                self.saved += 1
+
+        if not leader:
+            call.done.wait()
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+        return call.result
+
+
+class _Call(object):
+    """The state of a single in-flight call of a :class:`SingleFlight`"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
+
+
+def concurrent_map(func, iterable, max_workers):
+    """Call ``func`` on every item of ``iterable`` from a pool of up to ``max_workers`` threads
+
+    The results are returned as a list, in the same order as the items.  If any call raises an exception then the first
+    one (in the order of the items) is raised once all of the calls have completed.
+    """
+    items = list(iterable)
+    if len(items) < 2 or max_workers < 2:
+        return [func(item) for item in items]
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    try:
+        return list(executor.map(func, items))
+    finally:
+        executor.shutdown(wait=True)
+
+
+def concurrent_chain(iterables, max_workers, ordered=True, buffer_size=1000):
+    """Iterate over many iterables concurrently, from a pool of up to ``max_workers`` threads, and yield their items
+
+    When ``ordered`` is True the items are yielded in the same order as ``itertools.chain`` would (all of the items of
+    the first iterable, then all of the items of the second, and so on), otherwise they are yielded as soon as they are
+    produced.  If any iterable raises an exception it is raised once its items have been reached.
+
+    Up to ``buffer_size`` items that haven't been yielded yet are buffered for each iterable (or for all of them, when
+    not ordered), after which its thread waits for them to be consumed.
+
+    If the generator is closed before it is exhausted the iterables are abandoned once they produce their next item.
+    """
+    iterables = list(iterables)
+    if not iterables:
+        return
+
+    if ordered:
+        queues = [queue.Queue(maxsize=buffer_size) for _ in iterables]
+    else:
+        queues = [queue.Queue(maxsize=buffer_size)] * len(iterables)
+    stop = threading.Event()
+
+    def put(out, message):
+        """Put a message on a queue once it has room, returning False if the generator was closed first"""
+        while not stop.is_set():
+            try:
+                out.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def drain(position):
+        out = queues[position]
+        try:
+            for item in iterables[position]:
+                if not put(out, (_ITEM, item)):
+                    return
+        except Exception:
+            put(out, (_ERROR, sys.exc_info()))
+        else:
+            put(out, (_DONE, None))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(iterables))))
+    try:
+        for position in range(len(iterables)):
+            executor.submit(drain, position)
+
+        remaining = len(iterables)
+        position = 0
+        while remaining:
+            kind, value = queues[position].get()
+            if kind is _ITEM:
+                yield value
+                continue
+
+            if kind is _ERROR:
+                six.reraise(*value)
+
+            remaining -= 1
+            if ordered:
+                position += 1
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
+
+
+# markers for the kinds of messages that concurrent_chain passes from its threads
+_ITEM = object()
+_ERROR = object()
+_DONE = object()
+
+
+def freeze(value):
+    """Return a hashable representation of a (possibly nested) structure of request parameters
+
+    Dicts, lists & sets are converted into tuples & frozensets, and boto3 condition & attribute objects (which are not
+    hashable) are converted into tuples of their operator and values.  Every value is tagged with its type, so that
+    values which compare as equal but are sent differently (such as ``1`` & ``True``, or a dict & a list of its items)
+    have different representations.
+    """
+    if isinstance(value, dict):
+        return (type(value), tuple(sorted(
+            ((key, freeze(val)) for key, val in six.iteritems(value)),
+            key=lambda item: item[0]
+        )))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(val) for val in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(freeze(val) for val in value))
+    if isinstance(value, ConditionBase):
+        expression = value.get_expression()
+        return (type(value), expression['operator'], freeze(expression['values']))
+    if isinstance(value, AttributeBase):
+        return (type(value), value.name)
+    return (type(value), value)
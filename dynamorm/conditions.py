@@ -0,0 +1,160 @@
+"""Evaluate boto3 condition expressions against items on the client, rather than in DynamoDB.
+
+This is used for reads that DynamORM serves through ``BatchGetItem`` (which doesn't accept a ``FilterExpression``),
+so that the filters of the read can still be applied to the items it returns:
+
+.. code-block:: python
+
+    from dynamorm import Q
+    from dynamorm.conditions import evaluate
+
+    evaluate(Q(count__gt=10) | Q(name__begins_with="a"), {"name": "alpha", "count": 3})  # True
+
+The comparisons follow DynamoDB's rules as closely as is practical: comparing values of different types, or an
+attribute that doesn't exist, is False (except for ``<>``, which is True).
+"""
+
+import decimal
+import re
+
+import six
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+from boto3.dynamodb.types import Binary
+from six.moves import collections_abc
+
+# A marker for attributes that don't exist in an item
+MISSING = object()
+
+# The parts of an attribute path, such as ``address.lines[0]``
+PATH_PART = re.compile(r'([^.\[\]]+)|\[(\d+)\]')
+
+
+def evaluate(condition, item):
+    """Return True if the item matches the condition
+
+    :param condition: A boto3 condition, such as one built by :func:`dynamorm.table.Q`
+    :param dict item: The (raw) item to evaluate the condition against
+    """
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = expression['values']
+
+    if operator == 'AND':
+        return all(evaluate(value, item) for value in values)
+    if operator == 'OR':
+        return any(evaluate(value, item) for value in values)
+    if operator == 'NOT':
+        return not evaluate(values[0], item)
+
+    if operator == 'attribute_exists':
+        return operand(values[0], item) is not MISSING
+    if operator == 'attribute_not_exists':
+        return operand(values[0], item) is MISSING
+
+    operands = [operand(value, item) for value in values]
+    if operator == '<>':
+        return operands[0] is MISSING or operands[0] != operands[1]
+    if MISSING in operands:
+        return False
+
+    try:
+        if operator == '=':
+            return operands[0] == operands[1]
+        if operator == '<':
+            return comparable(*operands) and operands[0] < operands[1]
+        if operator == '<=':
+            return comparable(*operands) and operands[0] <= operands[1]
+        if operator == '>':
+            return comparable(*operands) and operands[0] > operands[1]
+        if operator == '>=':
+            return comparable(*operands) and operands[0] >= operands[1]
+        if operator == 'BETWEEN':
+            return (
+                comparable(operands[0], operands[1]) and comparable(operands[0], operands[2]) and
+                operands[1] <= operands[0] <= operands[2]
+            )
+        if operator == 'IN':
+            return operands[0] in operands[1]
+        if operator == 'begins_with':
+            return comparable(*operands) and operands[0][:len(operands[1])] == operands[1]
+        if operator == 'contains':
+            if isinstance(operands[0], (six.string_types, six.binary_type)):
+                return comparable(*operands) and operands[1] in operands[0]
+            return isinstance(operands[0], (list, tuple, set, frozenset)) and operands[1] in operands[0]
+        if operator == 'attribute_type':
+            return attribute_type(operands[0]) == operands[1]
+    except TypeError:
+        return False
+
+    raise ValueError("Unsupported condition operator: {0}".format(operator))
+
+
+def operand(value, item):
+    """Return the value of an operand of a condition; attributes (and their sizes) are looked up in the item"""
+    if isinstance(value, ConditionBase):
+        # the only conditions that are used as operands are sizes
+        expression = value.get_expression()
+        if expression['operator'] != 'size':
+            raise ValueError("Unsupported condition operand: {0}".format(expression['operator']))
+        attribute = operand(expression['values'][0], item)
+        if attribute is MISSING:
+            return MISSING
+        if isinstance(attribute, Binary):
+            attribute = attribute.value
+        return len(attribute)
+
+    if isinstance(value, AttributeBase):
+        return resolve(item, value.name)
+
+    if isinstance(value, Binary):
+        return value.value
+    return value
+
+
+def resolve(item, name):
+    """Return the value of an attribute path (such as ``address.lines[0]``) in an item, or ``MISSING``"""
+    value = item
+    for key, position in PATH_PART.findall(name):
+        try:
+            if key:
+                value = value[key] if isinstance(value, collections_abc.Mapping) else MISSING
+            else:
+                value = value[int(position)] if isinstance(value, list) else MISSING
+        except (KeyError, IndexError):
+            value = MISSING
+
+        if value is MISSING:
+            break
+
+    if isinstance(value, Binary):
+        return value.value
+    return value
+
+
+def comparable(left, right):
+    """Return True if two values are of the same DynamoDB type, and so can be ordered"""
+    return attribute_type(left) == attribute_type(right)
+
+
+def attribute_type(value):
+    """Return the DynamoDB type of a (deserialized) value, as used by ``attribute_type``"""
+    if isinstance(value, bool):
+        return 'BOOL'
+    if isinstance(value, six.string_types):
+        return 'S'
+    if isinstance(value, (six.integer_types, float, decimal.Decimal)):
+        return 'N'
+    if isinstance(value, (six.binary_type, bytearray, Binary)):
+        return 'B'
+    if value is None:
+        return 'NULL'
+    if isinstance(value, collections_abc.Mapping):
+        return 'M'
+    if isinstance(value, (list, tuple)):
+        return 'L'
+    if isinstance(value, (set, frozenset)):
+        member_types = set(attribute_type(member) for member in value)
+        if len(member_types) == 1:
+            return member_types.pop() + 'S'
+    return None
@@ -0,0 +1,130 @@
+"""Cursors are compact, URL safe tokens that let API clients resume a query or scan where a previous page stopped.
+
+Rather than exposing the ``last`` attribute of a read (the ``LastEvaluatedKey`` dict, which contains ``Decimal``
+values that need special care to encode) you can hand clients a cursor, and resume from it when they ask for the next
+page:
+
+.. code-block:: python
+
+    books = Book.query(author=author).limit(10)
+    page = list(books)
+    next_page_token = books.cursor()
+
+    # ... later, in another request
+    books = Book.query(author=author).limit(10).start_cursor(next_page_token)
+
+The cursor records the index that was read and whether the read was reversed, and resuming a read that uses a
+different index or direction (or, for queries, a different hash key) raises :class:`dynamorm.exceptions.InvalidCursor`.
+
+If the table defines a ``cursor_secret`` (or you pass a ``secret``) the cursor is signed with an HMAC, so that clients
+can't alter it to start reading from a key of their own choosing.
+"""
+
+import base64
+import collections
+import decimal
+import hashlib
+import hmac
+import json
+
+import six
+
+from boto3.dynamodb.types import Binary
+
+from .exceptions import InvalidCursor
+
+# The number of bytes of the HMAC-SHA256 digest that are kept in signed cursors
+SIGNATURE_LENGTH = 16
+
+Cursor = collections.namedtuple('Cursor', ['last', 'index_name', 'reverse'])
+
+
+def encode_cursor(last, index_name=None, reverse=False, secret=None):
+    """Encode the ``last`` key of a read into a cursor
+
+    :param dict last: The ``LastEvaluatedKey`` of a read
+    :param str index_name: The name of the index that was read, if any
+    :param bool reverse: True if the read was reversed
+    :param secret: If set the cursor is signed with this secret
+    """
+    payload = {'k': dict((name, _encode_value(value)) for name, value in six.iteritems(last))}
+    if index_name:
+        payload['i'] = index_name
+    if reverse:
+        payload['r'] = 1
+
+    data = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    token = _b64encode(data)
+    if secret is not None:
+        token = '.'.join([token, _b64encode(_sign(data, secret))])
+    return token
+
+
+def decode_cursor(token, secret=None):
+    """Decode a cursor into a :class:`Cursor` of the last key, index name & direction
+
+    :param str token: The cursor
+    :param secret: If set the cursor must have been signed with this secret
+    :raises InvalidCursor: If the cursor can't be decoded, or its signature is missing or wrong
+    """
+    try:
+        if isinstance(token, six.binary_type):
+            token = token.decode('ascii')
+        parts = token.split('.')
+        data = _b64decode(parts[0])
+    except (ValueError, TypeError, UnicodeError, AttributeError):
+        raise InvalidCursor("The cursor could not be decoded")
+
+    if secret is not None:
+        try:
+            signature = _b64decode(parts[1])
+        except (IndexError, ValueError, TypeError):
+            raise InvalidCursor("The cursor is not signed")
+        if not hmac.compare_digest(signature, _sign(data, secret)):
+            raise InvalidCursor("The cursor signature is not valid")
+
+    try:
+        payload = json.loads(data.decode('utf-8'))
+        last = dict((name, _decode_value(value)) for name, value in six.iteritems(payload['k']))
+    except (ValueError, TypeError, KeyError, AttributeError, UnicodeError, decimal.InvalidOperation):
+        raise InvalidCursor("The cursor could not be decoded")
+
+    return Cursor(last, payload.get('i'), bool(payload.get('r')))
+
+
+def _encode_value(value):
+    """Encode a key value into JSON; strings are left as they are, numbers & binary values are tagged with their type"""
+    if isinstance(value, six.string_types):
+        return value
+    if isinstance(value, Binary):
+        value = value.value
+    if isinstance(value, (six.binary_type, bytearray)):
+        return ['B', _b64encode(bytes(value))]
+    if isinstance(value, (six.integer_types, float, decimal.Decimal)) and not isinstance(value, bool):
+        return ['N', str(value)]
+    raise TypeError("Unsupported key value in cursor: {0!r}".format(value))
+
+
+def _decode_value(value):
+    if isinstance(value, six.string_types):
+        return value
+    value_type, encoded = value
+    if value_type == 'N':
+        return decimal.Decimal(encoded)
+    if value_type == 'B':
+        return Binary(_b64decode(encoded))
+    raise ValueError("Unknown key value type in cursor: {0}".format(value_type))
+
+
+def _sign(data, secret):
+    if isinstance(secret, six.text_type):
+        secret = secret.encode('utf-8')
+    return hmac.new(secret, data, hashlib.sha256).digest()[:SIGNATURE_LENGTH]
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode((data + '=' * (-len(data) % 4)).encode('ascii'))
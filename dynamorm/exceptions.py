@@ -59,3 +59,11 @@ class ConditionFailed(DynamoTableException):
 
 class TableNotActive(DynamoTableException):
     """The table is not ACTIVE, and you do not want to wait"""
+
+
+class InvalidCursor(DynamoTableException):
+    """A pagination cursor could not be decoded, failed verification, or belongs to a different read"""
+
+
+class StreamNotEnabled(DynamoTableException):
+    """The table does not have a stream"""
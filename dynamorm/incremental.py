@@ -0,0 +1,203 @@
+"""Incremental reads decode the items of each page of a query or scan one at a time, as they are iterated over.
+
+Normally each page of results (up to 1MB) is parsed into nested dicts by botocore, then deserialized by boto3, and the
+whole page is kept until its last item has been consumed, so the memory used by a page is several times its size on
+the wire.  An incremental read keeps only the body of the response instead, and decodes & deserializes each item as it
+is reached, releasing it as soon as the next item is read.  The results aren't kept by the iterator either:
+
+.. code-block:: python
+
+    for order in Order.scan().incremental().recursive():
+        process(order)
+
+botocore reads the whole body of each response before it is parsed, so the items are decoded from the received body
+rather than from the network, but the first item is available as soon as the rest of the response (such as the count
+and the last evaluated key) has been parsed, which is a small fraction of the page.  Reads that prefetch relationships
+or hydrate partial items still need their whole page, which is then decoded all at once.
+"""
+
+import base64
+import contextlib
+import json
+import re
+import threading
+
+import six
+
+from boto3.dynamodb.types import TypeDeserializer
+
+# The key of the array of items in the body of a response, which must be followed by an array
+ITEMS_KEY = re.compile(r'"Items"\s*:\s*')
+
+# The delimiter before each item in the array of items, which is None before the first item and ']' after the last
+DELIMITER = re.compile(r'\s*([,\]])?\s*')
+
+# How many possible ends of the array of items are tried, before a response is parsed as usual
+MAX_ATTEMPTS = 16
+
+DECODER = json.JSONDecoder()
+
+_local = threading.local()
+
+
+def register(client):
+    """Register the handlers that defer the decoding of the items of queries & scans on a client; this does nothing
+    if they're already registered
+    """
+    for operation in ('Query', 'Scan'):
+        client.meta.events.register(
+            'before-parse.dynamodb.{0}'.format(operation),
+            defer_items,
+            unique_id='dynamorm-incremental-{0}'.format(operation.lower())
+        )
+
+
+def capturing():
+    """Return True if the current thread is capturing the bodies of its responses"""
+    return getattr(_local, 'capture', None) is not None
+
+
+@contextlib.contextmanager
+def capture(client, number_parser=None):
+    """Capture the body of the query or scan response that the current thread receives, deferring the decoding of its
+    items, and yield the :class:`Capture`
+
+    :param client: The boto3 client that sends the request
+    :param number_parser: The :class:`dynamorm.numbers.NumberParser` of the table, if it uses native numbers
+    """
+    register(client)
+    captured = _local.capture = Capture(number_parser)
+    try:
+        yield captured
+    finally:
+        _local.capture = None
+
+
+def defer_items(response_dict, **kwargs):
+    """Remove the array of items from the body of a response before it's parsed, keeping the body for the capture"""
+    captured = getattr(_local, 'capture', None)
+    if captured is None or response_dict['status_code'] >= 300:
+        return
+
+    text = response_dict['body'].decode('utf-8')
+    span = find_items(text)
+    if span is None:
+        return
+
+    start, end = span
+    response_dict['body'] = (text[:start] + '[]' + text[end:]).encode('utf-8')
+    captured.text = text
+    captured.start = start
+
+
+def find_items(text):
+    """Return the start & end of the array of items in the body of a response, or None if it can't be found
+
+    The start is found by searching for the ``Items`` key, and the end by searching back from the end of the body for
+    the closing bracket.  They are confirmed by parsing the rest of the body (which is small) without the array.
+    """
+    attempts = 0
+    for match in ITEMS_KEY.finditer(text):
+        start = match.end()
+        if not text.startswith('[', start):
+            continue
+
+        end = len(text)
+        while attempts < MAX_ATTEMPTS:
+            end = text.rfind(']', start, end)
+            if end < 0:
+                break
+            attempts += 1
+
+            try:
+                rest = json.loads(text[:start] + '[]' + text[end + 1:])
+            except ValueError:
+                continue
+            if isinstance(rest, dict) and rest.get('Items') == []:
+                return start, end + 1
+    return None
+
+
+def decode_binary(value):
+    """Return a value in the wire format with its binary values decoded from base64, as botocore does"""
+    if 'B' in value:
+        return {'B': base64.b64decode(value['B'])}
+    if 'BS' in value:
+        return {'BS': [base64.b64decode(member) for member in value['BS']]}
+    if 'M' in value:
+        return {'M': dict((name, decode_binary(member)) for name, member in six.iteritems(value['M']))}
+    if 'L' in value:
+        return {'L': [decode_binary(member) for member in value['L']]}
+    return value
+
+
+class Capture(object):
+    """The body of a response whose items are deferred
+
+    :param number_parser: The :class:`dynamorm.numbers.NumberParser` of the table, if it uses native numbers
+    """
+    def __init__(self, number_parser=None):
+        self.number_parser = number_parser
+        self.text = None
+        self.start = None
+
+    def apply(self, resp):
+        """Return the parsed response with its ``Items`` replaced by the :class:`IncrementalItems` of the body"""
+        if self.text is not None:
+            resp['Items'] = IncrementalItems(self.text, self.start, self.number_parser)
+            self.text = None
+        return resp
+
+
+class IncrementalItems(object):
+    """The raw items of a page, which are decoded from the body of the response as they're read in order
+
+    Only the current item is kept, and the body is released once the last item has been decoded.  Items can be read by
+    index (the current item, or the next one) or iterated over once.
+
+    :param str text: The body of the response
+    :param int start: The position of the array of items in the body
+    :param number_parser: The :class:`dynamorm.numbers.NumberParser` of the table, if it uses native numbers
+    """
+    deserializer = TypeDeserializer()
+
+    def __init__(self, text, start, number_parser=None):
+        self.text = text
+        self.position = start + 1
+        self.index = -1
+        self.item = None
+        self.number_parser = number_parser
+        self.release(self.position)
+
+    def __getitem__(self, index):
+        if index < self.index or index > self.index + 1:
+            raise ValueError("Incremental items can only be read in order")
+        if index > self.index:
+            self.item = self.decode()
+            self.index += 1
+        return self.item
+
+    def __iter__(self):
+        if self.index >= 0:
+            raise ValueError("Incremental items can only be iterated over once")
+        while self.text is not None:
+            yield self[self.index + 1]
+
+    def decode(self):
+        """Decode & deserialize the next item"""
+        if self.text is None:
+            raise IndexError("There are no more items")
+
+        item, end = DECODER.raw_decode(self.text, DELIMITER.match(self.text, self.position).end())
+        self.position = end
+        self.release(end)
+
+        item = dict((name, decode_binary(value)) for name, value in six.iteritems(item))
+        if self.number_parser is not None:
+            return self.number_parser.deserialize(item)
+        return dict((name, self.deserializer.deserialize(value)) for name, value in six.iteritems(item))
+
+    def release(self, position):
+        """Release the body if there are no items after the position"""
+        if DELIMITER.match(self.text, position).group(1) == ']':
+            self.text = None
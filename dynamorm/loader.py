@@ -0,0 +1,168 @@
+"""Loaders collect individual lookups by primary key and resolve them together through ``BatchGetItem`` requests.
+
+This is the "DataLoader" pattern, which is useful when many independent pieces of code (GraphQL resolvers, for
+example) each need to fetch a single item.  Rather than each of them doing a ``get`` they ask a shared loader for the
+item and receive a future, and the loader fetches all of the items that were asked for with as few requests as
+possible.
+
+.. code-block:: python
+
+    loader = Thing.loader()
+
+    futures = [loader.load(id=thing_id) for thing_id in thing_ids]
+    things = [future.result() for future in futures]
+
+The pending lookups are dispatched when the result of any of the futures is requested, when ``max_batch_size`` keys
+are pending, when ``window`` seconds have passed since the first pending lookup (if a window is set), or when you call
+:meth:`Loader.dispatch` yourself.
+
+Loaded items are cached by their key for the lifetime of the loader, so you should create a new loader for each
+request (or other unit of work) to avoid serving stale items.  Lookups that fail are not cached, so the next lookup of
+the same key fetches it again.
+"""
+
+import logging
+import threading
+
+from boto3.dynamodb.types import TypeSerializer
+from concurrent.futures import Future
+
+from .concurrency import freeze
+
+log = logging.getLogger(__name__)
+
+SERIALIZER = TypeSerializer()
+
+
+class LoaderFuture(Future):
+    """A future that dispatches the pending lookups of its loader when its result is requested"""
+    def __init__(self, loader):
+        super(LoaderFuture, self).__init__()
+        self.loader = loader
+
+    def result(self, timeout=None):
+        if not self.done():
+            self.loader.dispatch()
+        return super(LoaderFuture, self).result(timeout=timeout)
+
+    def exception(self, timeout=None):
+        if not self.done():
+            self.loader.dispatch()
+        return super(LoaderFuture, self).exception(timeout=timeout)
+
+
+class Loader(object):
+    """Batch and cache individual lookups by primary key for a model
+
+    :param model: The model class to load instances of
+    :param float window: If set, pending lookups are dispatched this many seconds after the first one was issued
+    :param int max_batch_size: The maximum number of keys to send in a single ``BatchGetItem`` request
+    :param bool consistent: If set to True the batch gets will be consistent reads
+    :param bool cache: If set to False every call to ``load`` will fetch the item, even if it was already loaded
+    """
+    def __init__(self, model, window=None, max_batch_size=100, consistent=False, cache=True):
+        self.model = model
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.consistent = consistent
+        self.cache = cache
+
+        self.lock = threading.Lock()
+        self.futures = {}
+        self.pending = []
+        self.timer = None
+
+    def load(self, **kwargs):
+        """Schedule the item with the given key to be loaded, returning a future that resolves to the model instance
+        (or ``None`` if no such item exists)
+
+        :param \*\*kwargs: You must supply your hash key, and range key if used
+        """
+        kwargs = self.model._normalize_keys_in_kwargs(kwargs)
+        key = self.key_for(kwargs)
+
+        with self.lock:
+            if self.cache and key in self.futures:
+                return self.futures[key]
+
+            future = LoaderFuture(self)
+            if self.cache:
+                self.futures[key] = future
+            self.pending.append((key, kwargs, future))
+
+            if self.window is not None and self.timer is None:
+                self.timer = threading.Timer(self.window, self.dispatch)
+                self.timer.daemon = True
+                self.timer.start()
+
+            dispatch_now = len(self.pending) >= self.max_batch_size
+
+        if dispatch_now:
+            self.dispatch()
+
+        return future
+
+    def load_many(self, keys):
+        """Schedule many items to be loaded, returning a list of futures in the same order as the keys
+
+        :param keys: One or more dicts containing the hash key, and range key if used
+        """
+        return [self.load(**key) for key in keys]
+
+    def get(self, **kwargs):
+        """Load a single item and wait for it, dispatching any other pending lookups along with it"""
+        return self.load(**kwargs).result()
+
+    def dispatch(self):
+        """Resolve all of the pending lookups through as few batch gets as possible"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+        for start in range(0, len(pending), self.max_batch_size):
+            self._resolve(pending[start:start + self.max_batch_size])
+
+    def clear(self):
+        """Forget all of the cached items, so that they will be fetched again the next time they are loaded"""
+        with self.lock:
+            self.futures = {}
+
+    def key_for(self, item):
+        """Return the hashable key of an item or key dict, which is frozen from its key values as they are sent to
+        DynamoDB (so ``1`` & ``Decimal(1)`` are the same key, but ``'1'`` is not)
+        """
+        return freeze(tuple(
+            None if value is None else SERIALIZER.serialize(value)
+            for value in self.model.Table.key_values(item)
+        ))
+
+    def _resolve(self, batch):
+        """Fetch a single batch of keys and resolve the futures waiting on them"""
+        # the same key may be pending more than once when caching is disabled, so only ask for it once
+        keys = dict((key, kwargs) for key, kwargs, _ in batch)
+
+        log.debug("Loading %d %s items in a batch get", len(keys), self.model.__name__)
+        try:
+            items = dict(
+                (self.key_for(item), item)
+                for item in self.model.Table.get_batch(list(keys.values()), consistent=self.consistent)
+            )
+        except Exception as exc:
+            for key, _, future in batch:
+                self._fail(key, future, exc)
+            return
+
+        for key, _, future in batch:
+            try:
+                future.set_result(self.model.new_from_raw(items.get(key)))
+            except Exception as exc:
+                self._fail(key, future, exc)
+
+    def _fail(self, key, future, exc):
+        """Fail a future, forgetting it so that its key is fetched again the next time it's loaded"""
+        with self.lock:
+            if self.futures.get(key) is future:
+                del self.futures[key]
+        future.set_exception(exc)
@@ -0,0 +1,436 @@
+"""Migrations rewrite every item of a model's table through a transform function, for backfills & schema changes.
+
+The table is read with a parallel scan.  Each item (as the raw dict stored in the table, since items written before a
+schema change may not be valid for the new schema) is passed to your transform, which returns the new item, or None to
+leave the item as it is.  Transformed items are validated through the model's schema and written back:
+
+.. code-block:: python
+
+    def add_slug(item):
+        if 'slug' in item:
+            return None
+        item['slug'] = slugify(item['title'])
+        return item
+
+    result = Book.migrate(add_slug, name='add-slug', max_capacity=50)
+    print("Migrated {0} of {1} items".format(result.migrated, result.scanned))
+
+By default each item is written with a conditional put, which requires that the item still has every value that was
+read (so that items deleted or changed during the migration aren't overwritten, they're counted as conflicts instead).
+DynamoDB limits the length of conditions, so this only works for items with up to about 250 attributes, and a
+``ValueError`` is raised for wider items.  You can pass a ``condition`` function to use a cheaper condition in its
+place, for example to check that a version attribute hasn't changed since the item was read; the item must still exist
+either way.  With ``write='batch'`` the
+items are written with unconditional batch writes instead, which is faster.
+
+The ``LastEvaluatedKey`` of each segment is checkpointed (to ``<table>.<name>.migration.json`` by default) once the
+items of each page have been written, and running the migration again resumes from there.
+
+``max_capacity`` is a budget of capacity units per second, shared by every segment, which the migration stays within
+(on average) so that it doesn't starve the rest of your traffic.  The capacity of scans & conditional puts is what
+DynamoDB reports as consumed, and batch writes are estimated from the size of the items.
+
+Rather than rewriting a whole table up front, items can also be upgraded lazily, as they are read.  The table declares
+the attribute that holds the schema version of each item, and the functions that upgrade an item from each version to
+the next.  Items are upgraded as instances are created from them (items without a version are version 0), and with
+``write_back`` enabled the upgraded items are written back to the table in the background by a
+:class:`WriteBackQueue`, so that the cost of the migration is spread over your normal traffic:
+
+.. code-block:: python
+
+    def split_name(item):
+        item['first_name'], _, item['last_name'] = item.pop('name', '').partition(' ')
+        return item
+
+    class Author(DynaModel):
+        class Table:
+            name = 'authors'
+            hash_key = 'id'
+            version_attribute = 'schema_version'
+            upgrades = [split_name]
+            write_back = True
+
+        class Schema:
+            id = String(required=True)
+            first_name = String()
+            last_name = String()
+            schema_version = Integer()
+
+Each item is written back with a conditional put, which requires that the item still exists and that its version hasn't
+changed since it was read.  Items read through projections are not upgraded, and items read from streams are upgraded
+but never written back.
+"""
+
+import collections
+import copy
+import json
+import logging
+import math
+import threading
+import time
+
+import botocore
+import six
+
+from boto3.dynamodb.conditions import Attr
+
+from .concurrency import concurrent_map
+from .cursors import decode_cursor, encode_cursor
+from .exceptions import ValidationError
+from .streams import FileCheckpointStore
+from .table import remove_nones
+
+log = logging.getLogger(__name__)
+
+# The longest condition expression that DynamoDB accepts, in bytes
+MAX_CONDITION_LENGTH = 4096
+
+
+class MigrationResult(collections.namedtuple('MigrationResult', ['scanned', 'migrated', 'unchanged', 'invalid',
+                                                                 'conflicts', 'elapsed'])):
+    """The result of a migration; every count covers the items that were handled by this run
+
+    ``invalid`` counts the transformed items that failed validation, and ``conflicts`` counts the items whose
+    conditional put failed (because they were deleted, or changed, since they were read).  Neither are written.
+    """
+    __slots__ = ()
+
+    @property
+    def rate(self):
+        """The number of items scanned per second"""
+        return self.scanned / self.elapsed if self.elapsed else 0.0
+
+
+class WriteBackResult(collections.namedtuple('WriteBackResult', ['written', 'conflicts', 'invalid', 'dropped'])):
+    """The counts of the items handled by a :class:`WriteBackQueue`
+
+    ``conflicts`` counts the items that were deleted, or changed, between being read and written back, and ``dropped``
+    counts the items that weren't queued because the queue was full.  Neither are written.
+    """
+    __slots__ = ()
+
+
+class CapacityBudget(object):
+    """A budget of capacity units per second, shared by many threads
+
+    Requests are made while the budget has capacity left, and the capacity they consume is taken from it afterwards (as
+    it isn't known in advance), which can leave the budget in debt.  Threads then wait until the budget has recovered.
+
+    :param float units_per_second: The capacity units that can be consumed per second
+    """
+    def __init__(self, units_per_second):
+        self.units_per_second = float(units_per_second)
+        self.lock = threading.Lock()
+        self.available = self.units_per_second
+        self.updated = time.time()
+
+    def wait(self):
+        """Wait until the budget has capacity available"""
+        while True:
+            with self.lock:
+                self.refill()
+                if self.available >= 0:
+                    return
+                delay = -self.available / self.units_per_second
+            time.sleep(max(delay, 0.001))
+
+    def consume(self, units):
+        """Take the capacity consumed by a request from the budget"""
+        with self.lock:
+            self.refill()
+            self.available -= units
+
+    def refill(self):
+        now = time.time()
+        self.available = min(self.units_per_second, self.available + (now - self.updated) * self.units_per_second)
+        self.updated = now
+
+
+class Migration(object):
+    """Rewrite every item of a model's table through a transform function
+
+    :param model: The model class whose table is migrated
+    :param transform: A function that is called with each raw item, and returns the new item or None; new items
+                      without a version (see ``version_attribute``) are written at the current schema version
+    :param str name: The name of the migration, used to name its checkpoint file
+    :param store: The :class:`dynamorm.streams.CheckpointStore` for the migration's progress, defaults to a
+                  :class:`~dynamorm.streams.FileCheckpointStore` named after the table & migration
+    :param int segments: The number of segments to scan the table in, in parallel; defaults to ``max_workers`` of the
+                         table
+    :param str write: Either ``put`` (conditional puts, the default) or ``batch`` (unconditional batch writes)
+    :param condition: A function that is called with the raw item as it was read, and returns a condition (see
+                      :func:`dynamorm.table.Q`) that must be true for the transformed item to be written; defaults to
+                      :func:`unchanged`
+    :param float max_capacity: The capacity units per second the migration may consume, by default it is unlimited
+    :param int page_size: The ``Limit`` of each page of the scan
+    :param progress: A function that is called with a :class:`MigrationResult` after each page is migrated
+    """
+    def __init__(self, model, transform, name='migration', store=None, segments=None, write='put', condition=None,
+                 max_capacity=None, page_size=None, progress=None):
+        if write not in ('put', 'batch'):
+            raise ValueError("Unknown write mode: {0}".format(write))
+        if write == 'batch' and condition is not None:
+            raise ValueError("Conditions can only be used with conditional puts")
+
+        self.model = model
+        self.transform = transform
+        self.store = store or FileCheckpointStore('{0}.{1}.migration.json'.format(model.Table.name, name))
+        self.segments = segments or model.Table.max_workers
+        self.write = write
+        self.condition = condition
+        self.budget = CapacityBudget(max_capacity) if max_capacity else None
+        self.page_size = page_size
+        self.progress = progress
+
+        self.lock = threading.Lock()
+        self.started = None
+        self.counts = None
+
+    def run(self):
+        """Migrate the table, returning the :class:`MigrationResult`
+
+        :raises ValueError: If resuming a migration that was started with a different number of segments
+        """
+        previous = self.store.get('segments')
+        if previous is None:
+            self.store.set('segments', self.segments)
+        elif previous != self.segments:
+            raise ValueError("The migration was started with {0} segments".format(previous))
+
+        self.started = time.time()
+        self.counts = collections.Counter()
+        concurrent_map(self.migrate_segment, range(self.segments), self.segments)
+
+        result = self.result()
+        log.info("Migrated %d of %d items of %s in %.1fs (%d unchanged, %d invalid, %d conflicts)", result.migrated,
+                 result.scanned, self.model.Table.name, result.elapsed, result.unchanged, result.invalid,
+                 result.conflicts)
+        return result
+
+    def migrate_segment(self, segment):
+        """Scan a single segment of the table, migrating each page of items"""
+        state = self.store.get(str(segment)) or {'last': None, 'done': False}
+        if state['done']:
+            return
+
+        scan_kwargs = {'Segment': segment, 'TotalSegments': self.segments, 'ReturnConsumedCapacity': 'TOTAL'}
+        if self.page_size:
+            scan_kwargs['Limit'] = self.page_size
+        if state['last']:
+            scan_kwargs['ExclusiveStartKey'] = decode_cursor(state['last']).last
+
+        while True:
+            self.throttle()
+            response = self.model.Table.scan(scan_kwargs=dict(scan_kwargs))
+            self.consumed(response.get('ConsumedCapacity'))
+
+            counts = self.migrate_page(response['Items'])
+
+            last = response.get('LastEvaluatedKey')
+            self.store.set(str(segment), {'last': encode_cursor(last) if last else None, 'done': last is None})
+            with self.lock:
+                self.counts.update(counts)
+                result = self.result()
+            if self.progress is not None:
+                self.progress(result)
+
+            if last is None:
+                return
+            scan_kwargs['ExclusiveStartKey'] = last
+
+    def migrate_page(self, items):
+        """Transform & write a page of items, returning the counts of what happened to them"""
+        counts = collections.Counter(scanned=len(items))
+        writes = []
+        for original in items:
+            # the transform may change nested values in place, which must not change the original
+            item = self.transform(copy.deepcopy(original))
+            if item is None or item == original:
+                counts['unchanged'] += 1
+                continue
+
+            if self.model.Table.key_values(item) != self.model.Table.key_values(original):
+                raise ValueError("Migrations must not change the keys of items: {0}".format(
+                    self.model.Table.key_values(original)
+                ))
+
+            try:
+                writes.append((original, self.model.Schema.dynamorm_validate(self.model._versioned(item))))
+            except ValidationError as exc:
+                log.warning("The migrated item %s is not valid: %s", self.model.Table.key_values(original), exc)
+                counts['invalid'] += 1
+
+        if self.write == 'batch':
+            self.write_batch([item for _, item in writes])
+            counts['migrated'] += len(writes)
+            return counts
+
+        for original, item in writes:
+            if self.put(original, item):
+                counts['migrated'] += 1
+            else:
+                counts['conflicts'] += 1
+        return counts
+
+    def put(self, original, item):
+        """Write an item with a conditional put, returning False if the condition failed"""
+        if self.condition is None:
+            condition_kwargs = unchanged(original)
+        else:
+            condition_kwargs = {
+                'ConditionExpression': Attr(self.model.Table.hash_key).exists() & self.condition(original)
+            }
+
+        self.throttle()
+        try:
+            response = self.model.Table.put(item, ReturnConsumedCapacity='TOTAL', **condition_kwargs)
+        except botocore.exceptions.ClientError as exc:
+            if exc.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            # failed conditions still consume capacity, at least one unit
+            self.consumed({'CapacityUnits': 1})
+            return False
+
+        self.consumed(response.get('ConsumedCapacity'))
+        return True
+
+    def write_batch(self, items):
+        """Write items with batch writes, taking their estimated capacity from the budget"""
+        if not items:
+            return
+        self.throttle()
+        self.model.Table.put_batch(*items)
+        if self.budget is not None:
+            self.budget.consume(sum(write_units(item) for item in items))
+
+    def throttle(self):
+        if self.budget is not None:
+            self.budget.wait()
+
+    def consumed(self, consumed_capacity):
+        if self.budget is not None and consumed_capacity:
+            self.budget.consume(consumed_capacity.get('CapacityUnits', 0))
+
+    def result(self):
+        return MigrationResult(
+            self.counts['scanned'], self.counts['migrated'], self.counts['unchanged'], self.counts['invalid'],
+            self.counts['conflicts'], time.time() - self.started
+        )
+
+
+def unchanged(item):
+    """Return the arguments of a put that is conditional on the item in the table still having every attribute value of
+    a raw item
+
+    The attributes are named through placeholders (rather than :class:`boto3.dynamodb.conditions.Attr`, which reads
+    dots as paths into maps), so names with dots are compared as the top level attributes that they are.
+
+    :raises ValueError: If the condition is longer than DynamoDB allows, because the item has too many attributes
+    """
+    names, values, clauses = {}, {}, []
+    for position, name in enumerate(sorted(item)):
+        names['#u{0}'.format(position)] = name
+        values[':u{0}'.format(position)] = item[name]
+        clauses.append('#u{0} = :u{0}'.format(position))
+
+    expression = ' AND '.join(clauses)
+    if len(expression) > MAX_CONDITION_LENGTH:
+        raise ValueError("An item with {0} attributes has too many for a put that is conditional on all of them, pass "
+                         "a condition to the migration instead".format(len(item)))
+    return {'ConditionExpression': expression, 'ExpressionAttributeNames': names, 'ExpressionAttributeValues': values}
+
+
+class WriteBackQueue(object):
+    """Write items that were upgraded as they were read back to a model's table, from background threads
+
+    Queueing an item never blocks; if the queue is full the item is dropped, and it will be upgraded again the next time
+    it's read.  Items that are already queued are not queued again.
+
+    :param model: The model class whose items are written
+    :param int max_size: The maximum number of items waiting to be written
+    :param int max_workers: The number of threads that write items
+    """
+    def __init__(self, model, max_size=1000, max_workers=1):
+        self.model = model
+        self.max_workers = max_workers
+        self.queue = six.moves.queue.Queue(max_size)
+
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.threads = []
+        self.counts = collections.Counter()
+
+    def put(self, item, version):
+        """Queue an upgraded raw item to be written, if the item in the table is still at ``version``"""
+        key = self.model.Table.key_values(item)
+        with self.lock:
+            if key in self.pending:
+                return
+            if not self.threads:
+                self.start()
+
+            try:
+                self.queue.put_nowait((key, item, version))
+            except six.moves.queue.Full:
+                self.counts['dropped'] += 1
+                return
+            self.pending.add(key)
+
+    def start(self):
+        for _ in range(self.max_workers):
+            thread = threading.Thread(target=self.work, name='{0}-write-back'.format(self.model.Table.name))
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def join(self):
+        """Wait until every queued item has been written"""
+        self.queue.join()
+
+    def work(self):
+        while True:
+            key, item, version = self.queue.get()
+            try:
+                outcome = self.write(item, version)
+            except Exception:
+                log.exception("Failed to write back the upgraded item %s", key)
+                outcome = None
+
+            with self.lock:
+                self.pending.discard(key)
+                if outcome:
+                    self.counts[outcome] += 1
+            self.queue.task_done()
+
+    def write(self, item, version):
+        """Write an upgraded item with a conditional put, returning what happened to it"""
+        try:
+            item = self.model.Schema.dynamorm_validate(item)
+        except ValidationError as exc:
+            log.warning("The upgraded item %s is not valid: %s", self.model.Table.key_values(item), exc)
+            return 'invalid'
+
+        version_attribute = Attr(self.model.Table.version_attribute)
+        condition = Attr(self.model.Table.hash_key).exists() & (
+            version_attribute.not_exists() | version_attribute.eq(version)
+            if version == 0 else version_attribute.eq(version)
+        )
+        try:
+            self.model.Table.put(item, ConditionExpression=condition)
+        except botocore.exceptions.ClientError as exc:
+            if exc.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return 'conflicts'
+        return 'written'
+
+    def result(self):
+        """Return the :class:`WriteBackResult` of the items handled so far"""
+        with self.lock:
+            return WriteBackResult(self.counts['written'], self.counts['conflicts'], self.counts['invalid'],
+                                   self.counts['dropped'])
+
+
+def write_units(item):
+    """Estimate the write capacity units needed to write an item, one per KB"""
+    size = len(json.dumps(remove_nones(item), default=str))
+    return max(1, int(math.ceil(size / 1024.0)))
@@ -5,12 +5,18 @@ or Schematics schema that is used for validating and marshalling your data.
 import inspect
 import logging
 import sys
+import threading
 
 import six
 
-from .exceptions import DynaModelException
+from .bulk import Exporter, Importer
+from .concurrency import concurrent_chain
+from .exceptions import DynaModelException, InvalidKey
 from .indexes import Index
+from .loader import Loader
+from .migrations import Migration, WriteBackQueue
 from .relationships import Relationship
+from .streams import StreamProcessor
 from .signals import (
     model_prepared,
     pre_init, post_init,
@@ -18,10 +24,13 @@ from .signals import (
     pre_update, post_update,
     pre_delete, post_delete
 )
-from .table import DynamoTable3, QueryIterator, ScanIterator
+from .table import DynamoTable3, GetKeysIterator, QueryIterator, ScanIterator, merge_reads
 
 log = logging.getLogger(__name__)
 
+# Guards the creation of the write back queues of models
+_write_back_lock = threading.Lock()
+
 
 class DynaModelMeta(type):
     """DynaModelMeta is a metaclass for the DynaModel class that transforms our Table and Schema classes
@@ -230,14 +239,18 @@ class DynaModel(object):
         """
         def normalize(key):
             try:
-                validated = cls.Schema.dynamorm_validate({key: kwargs[key]}, partial=True)
-                kwargs[key] = validated[key]
+                kwargs[key] = cls._normalize_key(key, kwargs[key])
             except KeyError:
                 pass
         normalize(cls.Table.hash_key)
         normalize(cls.Table.range_key)
         return kwargs
 
+    @classmethod
+    def _normalize_key(cls, name, value):
+        """Return the value of a key attribute as it is validated by the Schema"""
+        return cls.Schema.dynamorm_validate({name: value}, partial=True)[name]
+
     @classmethod
     def put(cls, item, **kwargs):
         """Put a single item into the table for this model
@@ -247,7 +260,7 @@ class DynaModel(object):
         :param dict item: The item to put into the table
         :param \*\*kwargs: All other kwargs are passed through to the put method on the table
         """
-        return cls.Table.put(cls.Schema.dynamorm_validate(item), **kwargs)
+        return cls.Table.put(cls.Schema.dynamorm_validate(cls._versioned(item)), **kwargs)
 
     @classmethod
     def put_unique(cls, item, **kwargs):
@@ -256,7 +269,7 @@ class DynaModel(object):
         :param dict item: The item to put into the table
         :param \*\*kwargs: All other kwargs are passed through to the put_unique method on the table
         """
-        return cls.Table.put_unique(cls.Schema.dynamorm_validate(item), **kwargs)
+        return cls.Table.put_unique(cls.Schema.dynamorm_validate(cls._versioned(item)), **kwargs)
 
     @classmethod
     def put_batch(cls, *items, **batch_kwargs):
@@ -274,9 +287,19 @@ class DynaModel(object):
             )
         """
         return cls.Table.put_batch(*[
-            cls.Schema.dynamorm_validate(item) for item in items
+            cls.Schema.dynamorm_validate(cls._versioned(item)) for item in items
         ], **batch_kwargs)
 
+    @classmethod
+    def _versioned(cls, item):
+        """Return the item with its version attribute set to the current schema version, if the table has one and the
+        item doesn't have a version already
+        """
+        version_attribute = cls.Table.version_attribute
+        if version_attribute is None or item.get(version_attribute) is not None:
+            return item
+        return dict(item, **{version_attribute: cls.Table.schema_version})
+
     @classmethod
     def update_item(cls, conditions=None, update_item_kwargs=None, **kwargs):
         """Update a item in the table
@@ -294,14 +317,41 @@ class DynaModel(object):
         return cls.Table.update(conditions=conditions, update_item_kwargs=update_item_kwargs, **kwargs)
 
     @classmethod
-    def new_from_raw(cls, raw, partial=False):
+    def new_from_raw(cls, raw, partial=False, write_back=True):
         """Return a new instance of this model from a raw (dict) of data that is loaded by our Schema
 
+        If the table has ``upgrades`` then raw data from an older schema version is upgraded first (unless it's
+        partial), and when the table has ``write_back`` enabled the upgraded item is queued to be written back to the
+        table.
+
         :param dict raw: The attributes to use when creating the instance
+        :param bool write_back: Set to False if the raw data may not be the current item, such as an old stream image
         """
         if raw is None:
             return None
-        return cls(partial=partial, **raw)
+
+        if not cls.Table.upgrades or partial:
+            return cls(partial=partial, **raw)
+
+        version = cls.Table.item_version(raw)
+        upgraded = cls.Table.upgrade(raw)
+        instance = cls(partial=partial, **upgraded)
+        if write_back and cls.Table.write_back and upgraded is not raw:
+            cls.write_back_queue().put(upgraded, version)
+        return instance
+
+    @classmethod
+    def write_back_queue(cls):
+        """Return the :class:`dynamorm.migrations.WriteBackQueue` that writes upgraded items back to this model's
+        table
+        """
+        queue = getattr(cls.Table, '_write_back_queue', None)
+        if queue is None:
+            with _write_back_lock:
+                queue = getattr(cls.Table, '_write_back_queue', None)
+                if queue is None:
+                    queue = cls.Table._write_back_queue = WriteBackQueue(cls)
+        return queue
 
     @classmethod
     def get(cls, consistent=False, **kwargs):
@@ -334,6 +384,119 @@ class DynaModel(object):
         for item in items:
             yield cls.new_from_raw(item, partial=attrs is not None)
 
+    @classmethod
+    def prefetch(cls, instances, *names):
+        """Load the named relationships for many instances of this model at once
+
+        Rather than sending a request for every instance when its relationship is first accessed (the "N+1" problem),
+        ``ManyToOne`` & ``OneToOne`` relationships whose query specifies the primary key of the other model are loaded
+        through batched gets and all other relationships by running their queries concurrently.  The results are
+        attached to each instance, so accessing the relationships afterwards does not send any further requests.
+        Instances that share the same related item also share the same related instance.
+
+        Example::
+
+            threads = list(Thread.query(forum_name="general"))
+            Thread.prefetch(threads, "user", "replies")
+
+        Queries & scans also support prefetching each page of results as they are loaded::
+
+            threads = Thread.query(forum_name="general").prefetch("user", "replies")
+
+        :param instances: The instances of this model to load the relationships for
+        :param \*names: The names of the relationships to load
+        """
+        instances = [instance for instance in instances if instance is not None]
+        if not instances:
+            return
+
+        for name in names:
+            try:
+                relationship = cls.relationships[name]
+            except KeyError:
+                raise DynaModelException("{0} does not have a relationship named '{1}'".format(cls.__name__, name))
+            relationship.prefetch(instances)
+
+    @classmethod
+    def loader(cls, **kwargs):
+        """Return a new :class:`dynamorm.loader.Loader` that batches individual gets on this model
+
+        Example::
+
+            loader = Thing.loader()
+            one, two = loader.load(hash_key="one"), loader.load(hash_key="two")
+            assert one.result().hash_key == "one"
+
+        :param \*\*kwargs: Passed through to the :class:`~dynamorm.loader.Loader`
+        """
+        return Loader(cls, **kwargs)
+
+    @classmethod
+    def stream_processor(cls, handler, **kwargs):
+        """Return a new :class:`dynamorm.streams.StreamProcessor` that passes the changes to this model's table to a
+        handler
+
+        Example::
+
+            def handle(records):
+                for record in records:
+                    print(record.event_name, record.new)
+
+            Thing.stream_processor(handle, store=MemoryCheckpointStore()).process()
+
+        :param handler: A function that is called with lists of :class:`~dynamorm.streams.StreamRecord` objects
+        :param \*\*kwargs: Passed through to the :class:`~dynamorm.streams.StreamProcessor`
+        """
+        return StreamProcessor(cls, handler, **kwargs)
+
+    @classmethod
+    def export(cls, path, format='ndjson', **kwargs):
+        """Export every item of the table to files in a directory, through a parallel scan
+
+        Example::
+
+            progress = Thing.export('/data/things', format='csv', segments=8)
+
+        :param str path: The directory to write the files to, one per segment of the scan
+        :param str format: One of ``ndjson``, ``csv`` or ``parquet``
+        :param \*\*kwargs: Passed through to the :class:`~dynamorm.bulk.Exporter`
+        :returns: The final :class:`~dynamorm.bulk.ExportProgress`
+        """
+        return Exporter(cls, path, format=format, **kwargs).run()
+
+    @classmethod
+    def import_file(cls, path, **kwargs):
+        """Import the records of an NDJSON or CSV file into the table, validating them in parallel and writing them
+        with concurrent batch writes
+
+        Example::
+
+            result = Thing.import_file('/data/things.ndjson')
+
+        :param str path: The file to import
+        :param \*\*kwargs: Passed through to the :class:`~dynamorm.bulk.Importer`
+        :returns: The :class:`~dynamorm.bulk.ImportResult`
+        """
+        return Importer(cls, path, **kwargs).run()
+
+    @classmethod
+    def migrate(cls, transform, **kwargs):
+        """Rewrite every item of the table through a transform function, with a resumable parallel scan
+
+        Example::
+
+            def add_slug(item):
+                item['slug'] = slugify(item['title'])
+                return item
+
+            Book.migrate(add_slug, name='add-slug', max_capacity=50)
+
+        :param transform: A function that is called with each raw item, and returns the new item or None
+        :param \*\*kwargs: Passed through to the :class:`~dynamorm.migrations.Migration`
+        :returns: The :class:`~dynamorm.migrations.MigrationResult`
+        """
+        return Migration(cls, transform, **kwargs).run()
+
     @classmethod
     def query(cls, *args, **kwargs):
         """Execute a query on our table based on our keys
@@ -349,12 +512,107 @@ class DynaModel(object):
 
         .. _valid conditions for keys: http://boto3.readthedocs.io/en/latest/reference/customizations/dynamodb.html#boto3.dynamodb.conditions.Key
 
+        DynamoDB can't query for a list of keys, so when ``get_keys`` is True a query that gives every attribute of the
+        primary key with equality or ``in`` conditions is read through batched gets instead, with any other conditions
+        applied to the items that are returned (see :class:`dynamorm.table.GetKeysIterator`)::
+
+            Thing.query(foo__in=["Mr. Foo", "Mrs. Foo"], bar="baz", get_keys=True)
+
         :param dict query_kwargs: Extra parameters that should be passed through to the Table query function
+        :param bool get_keys: If True, read the fully specified keys through batched gets
         :param \*\*kwargs: The key(s) and value(s) to query based on
         """  # noqa
+        get_keys = kwargs.pop('get_keys', False)
         kwargs = cls._normalize_keys_in_kwargs(kwargs)
+        if get_keys:
+            return cls._get_keys(args, kwargs, 'query_kwargs')
         return QueryIterator(cls, *args, **kwargs)
 
+    @classmethod
+    def query_many(cls, hash_keys, *args, **kwargs):
+        """Query many hash keys at once, returning a generator of their results merged in order of the range key
+
+        A query is run for each of the hash keys, with the same range conditions & filters, and their first pages are
+        loaded concurrently.  The results are then merged so that they are produced in order of the range key (of the
+        table, or of the index the queries are run on), loading further pages of each query only as they are needed.
+        For example, to get the 50 latest posts by the users someone follows::
+
+            posts = Post.query_many(followed_user_ids, reverse=True, max_items=50)
+
+        :param hash_keys: The values of the hash key to query
+        :param bool reverse: If True the results are produced in descending order of the range key
+        :param int max_items: If set, stop once this many results have been produced.  Each query reads no more than
+                              this many items, and no further requests are sent once it has been reached.
+        :param \*args: Q objects, passed through to each query
+        :param \*\*kwargs: The range key conditions & filters, passed through to each query
+        """
+        reverse = kwargs.pop('reverse', False)
+        max_items = kwargs.pop('max_items', None)
+
+        reads = []
+        seen = set()
+        for hash_key in hash_keys:
+            if hash_key in seen:
+                continue
+            seen.add(hash_key)
+
+            query_kwargs = dict(kwargs)
+            query_kwargs[cls.Table.hash_key] = hash_key
+            read = cls.query(*args, **query_kwargs)
+            if reverse:
+                read = read.reverse()
+            reads.append(read.max_items(max_items) if max_items is not None else read.recursive())
+
+        if not reads:
+            return iter(())
+
+        index_name = reads[0].explain().index_name
+        range_key = (cls.Table.indexes[index_name] if index_name else cls.Table).range_key
+        if not range_key:
+            raise DynaModelException("{0} has no range key to merge the results of many queries by".format(
+                cls.__name__
+            ))
+
+        return merge_reads(
+            reads,
+            key=lambda item: getattr(item, range_key),
+            reverse=reverse,
+            max_items=max_items,
+            max_workers=cls.Table.max_workers
+        )
+
+    @classmethod
+    def query_union(cls, branches, *args, **kwargs):
+        """Run a query for each of the branches of an OR condition concurrently, returning a generator of their
+        combined results without any duplicates
+
+        Each branch is a dict of the keyword arguments for its query, so it can use the keys of the table or of any
+        index (see :meth:`query`), which is much cheaper than scanning the table with an OR filter.  The results are
+        yielded as they arrive, and results that match more than one branch are only yielded once.  For example, to
+        find the tasks that someone either owns or is assigned to::
+
+            tasks = Task.query_union([dict(owner=user_id), dict(assignee=user_id)], status='open')
+
+        :param branches: A list of dicts of the key(s) and value(s) for each query
+        :param \*args: Q objects, passed through to every query
+        :param \*\*kwargs: Conditions, passed through to every query
+        """
+        reads = []
+        for branch in branches:
+            query_kwargs = dict(kwargs)
+            query_kwargs.update(branch)
+            reads.append(cls.query(*args, **query_kwargs).recursive())
+
+        def unique(results):
+            seen = set()
+            for result in results:
+                key = tuple(getattr(result, name) for name in cls.Table.key_schema_names)
+                if key not in seen:
+                    seen.add(key)
+                    yield result
+
+        return unique(concurrent_chain(reads, cls.Table.max_workers, ordered=False))
+
     @classmethod
     def scan(cls, *args, **kwargs):
         """Execute a scan on our table
@@ -399,16 +657,66 @@ class DynaModel(object):
 
         The above would scan for all things with an address.state of (CA OR NY) AND address.zip does not contain 5.
 
+        Scans that give every attribute of the primary key with equality or ``in`` conditions don't need to read the
+        whole table, so when ``get_keys`` is True they're read through batched gets instead (see :meth:`query`).
+
         This returns a generator, which will continue to yield items until all matching the scan are produced,
         abstracting away pagination. More information on scan pagination: http://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Scan.html#Scan.Pagination
 
         :param dict scan_kwargs: Extra parameters that should be passed through to the Table scan function
+        :param bool get_keys: If True, read the fully specified keys through batched gets
         :param \*args: An optional list of Q objects that can be combined with or superseded the \*\*kwargs values
         :param \*\*kwargs: The key(s) and value(s) to filter based on
         """  # noqa
+        get_keys = kwargs.pop('get_keys', False)
         kwargs = cls._normalize_keys_in_kwargs(kwargs)
+        if get_keys:
+            return cls._get_keys(args, kwargs, 'scan_kwargs')
         return ScanIterator(cls, *args, **kwargs)
 
+    @classmethod
+    def _get_keys(cls, args, kwargs, read_kwargs_key):
+        """Return a :class:`GetKeysIterator` for a query or scan that fully specifies the keys it reads
+
+        :raises InvalidKey: If the kwargs don't fully specify the primary keys, or the read names an index
+        """
+        read_kwargs = kwargs.get(read_kwargs_key) or {}
+        if 'IndexName' in read_kwargs or 'Segment' in read_kwargs:
+            raise InvalidKey("Reads of an index, or of a segment, can't be read through batched gets")
+        if cls.Table.lookup_keys(kwargs) is None:
+            raise InvalidKey("Every attribute of the primary key ({0}) must be given with an equality or in "
+                             "condition".format(', '.join(cls.Table.key_schema_names)))
+
+        # the keys are sent as they are, so they must be normalized like the keys of get
+        kwargs = dict(kwargs)
+        for name in cls.Table.key_schema_names:
+            eq_key, in_key = '__'.join([name, 'eq']), '__'.join([name, 'in'])
+            if eq_key in kwargs:
+                kwargs[eq_key] = cls._normalize_key(name, kwargs[eq_key])
+            if in_key in kwargs:
+                kwargs[in_key] = [cls._normalize_key(name, value) for value in kwargs[in_key]]
+
+        kwargs['get_keys_kwargs'] = kwargs.pop(read_kwargs_key, None) or {}
+        return GetKeysIterator(cls, *args, **kwargs)
+
+    def refresh_relationships(self, *names):
+        """Forget the loaded values of the named relationships on this instance (or all of them if no names are given),
+        so that they are loaded again the next time they are accessed
+
+        Relationship values are cached on each instance once they have been loaded (or prefetched), so use this when
+        you know the related items have changed.
+
+        :param \*names: The names of the relationships to refresh
+        """
+        for name in (names or self.relationships):
+            try:
+                relationship = self.relationships[name]
+            except KeyError:
+                raise DynaModelException("{0} does not have a relationship named '{1}'".format(
+                    self.__class__.__name__, name
+                ))
+            relationship.invalidate(self)
+
     def to_dict(self, native=False):
         obj = {}
         for k in self.Schema.dynamorm_fields():
@@ -446,7 +754,9 @@ class DynaModel(object):
         """
         if not partial:
             pre_save.send(self.__class__, instance=self, put_kwargs=kwargs)
-            as_dict = self.to_dict(native=True)
+            as_dict = self._versioned(self.to_dict(native=True))
+            if self.Table.version_attribute:
+                setattr(self, self.Table.version_attribute, as_dict[self.Table.version_attribute])
             if unique:
                 resp = self.put_unique(as_dict, **kwargs)
             else:
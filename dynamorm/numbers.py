@@ -0,0 +1,117 @@
+"""Native numbers parse the numbers of items straight into ints or floats, according to the types of their fields.
+
+By default boto3 turns every number it reads into a ``Decimal``, which your schema's fields then convert into ints or
+floats, and on tables with many numbers this is a noticeable share of the time spent reading.  When the table sets
+``native_numbers`` the numbers of integer fields are parsed with ``int`` and those of float fields with ``float``
+instead, as the response is deserialized:
+
+.. code-block:: python
+
+    class Reading(DynaModel):
+        class Table:
+            name = 'readings'
+            hash_key = 'sensor'
+            range_key = 'at'
+            native_numbers = True
+
+        class Schema:
+            sensor = String(required=True)
+            at = Integer(required=True)
+            value = Float()
+            total = Decimal()
+
+This applies to every read of the table (gets, batch gets, queries, scans and the attributes returned by updates) and
+to the images of its stream records.  Decimal fields, numbers nested in maps & lists, and attributes that aren't in the
+schema are still read as ``Decimal`` objects, as are numbers that can't be parsed by their field's type.
+"""
+
+import six
+
+from boto3.dynamodb.transform import TransformationInjector
+from boto3.dynamodb.types import TypeDeserializer
+
+# The unique id of boto3's handler that deserializes responses, which native numbers replace
+DESERIALIZER_ID = 'dynamodb-attr-value-output'
+
+
+class NumberDeserializer(TypeDeserializer):
+    """A deserializer that leaves numbers that have already been parsed as they are"""
+    def _deserialize_n(self, value):
+        if isinstance(value, six.string_types):
+            return super(NumberDeserializer, self)._deserialize_n(value)
+        return value
+
+
+class NumberParser(object):
+    """Parse the numbers of the fields of a schema in items that are still in the DynamoDB wire format
+
+    :param schema: The schema whose fields give the type of each number
+    """
+    def __init__(self, schema):
+        fields = schema.dynamorm_fields()
+        self.parsers = dict(
+            (name, parser)
+            for name, parser in (
+                (name, schema.field_to_number_parser(field))
+                for name, field in six.iteritems(fields)
+            )
+            if parser is not None
+        )
+        self.deserializer = NumberDeserializer()
+
+    def parse(self, item):
+        """Parse the numbers of an item in place"""
+        for name in self.parsers:
+            if name in item:
+                item[name] = self.parse_value(name, item[name])
+
+    def parse_value(self, name, value):
+        """Return a wire format value of the named attribute, with its number parsed if its field has a parser"""
+        parser = self.parsers.get(name)
+        if parser is None or not isinstance(value.get('N'), six.string_types):
+            return value
+        try:
+            return {'N': parser(value['N'])}
+        except ValueError:
+            return value
+
+    def deserialize(self, item):
+        """Return a plain dict of an item in the wire format, with its numbers parsed"""
+        return dict(
+            (name, self.deserializer.deserialize(self.parse_value(name, value)))
+            for name, value in six.iteritems(item)
+        )
+
+
+class NumberInjector(TransformationInjector):
+    """Deserialize the responses of a table's reads, parsing the numbers of its items first
+
+    :param str table_name: The name of the table, whose items are parsed
+    :param NumberParser parser: The parser of the table's numbers
+    """
+    def __init__(self, table_name, parser):
+        super(NumberInjector, self).__init__(deserializer=NumberDeserializer())
+        self.table_name = table_name
+        self.parser = parser
+
+    def register(self, client):
+        """Replace boto3's deserialization of responses on a client; this does nothing if it's already replaced"""
+        events = client.meta.events
+        events.unregister('after-call.dynamodb', unique_id=DESERIALIZER_ID)
+        events.register('after-call.dynamodb', self.inject_attribute_value_output, unique_id='dynamorm-numbers')
+
+    def inject_attribute_value_output(self, parsed, model, **kwargs):
+        for item in self.items(parsed):
+            self.parser.parse(item)
+        return super(NumberInjector, self).inject_attribute_value_output(parsed, model, **kwargs)
+
+    def items(self, parsed):
+        """Return the items of the table in a response"""
+        items = list(parsed.get('Items', []))
+        for name in ('Item', 'Attributes'):
+            if parsed.get(name):
+                items.append(parsed[name])
+        responses = parsed.get('Responses')
+        if isinstance(responses, dict):
+            items.extend(responses.get(self.table_name, []))
+        return items
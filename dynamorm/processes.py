@@ -0,0 +1,73 @@
+"""Helpers for spreading CPU heavy work over worker processes, so that it isn't limited by the GIL.
+
+Everything that is sent to a worker process must be picklable, which models only are when they're defined at the top
+level of a module.  When something can't be pickled the work is done by threads instead (see
+:mod:`dynamorm.concurrency`).
+"""
+
+import logging
+import multiprocessing
+import os
+import pickle
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .concurrency import concurrent_map
+
+log = logging.getLogger(__name__)
+
+
+def process_count(processes=None):
+    """Return the number of worker processes to use, which defaults to the number of CPUs"""
+    return multiprocessing.cpu_count() if processes is None else processes
+
+
+def picklable(*objects):
+    """Return True if the objects can be pickled, and so sent to a worker process"""
+    try:
+        pickle.dumps(objects)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def map_reduce(reads, map_fn, reduce_fn, processes, max_workers):
+    """Map & reduce the instances of each read in a pool of ``processes`` worker processes, returning a list of
+    ``(found, result)`` for the reads, in order
+
+    If ``processes`` is 0, or the reads or functions can't be pickled, the reads are done by ``max_workers`` threads.
+    """
+    if processes and not picklable(reads[0], map_fn, reduce_fn):
+        log.warning("The scan of %s or its functions can't be pickled, so it will be mapped in threads",
+                    reads[0].model.__name__)
+        processes = 0
+
+    if not processes:
+        return concurrent_map(lambda read: map_reduce_read(read, map_fn, reduce_fn), reads, max_workers)
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_map_reduce_process, reads, [map_fn] * len(reads), [reduce_fn] * len(reads)))
+
+
+def map_reduce_read(read, map_fn, reduce_fn):
+    """Map & reduce the instances of a single read, returning whether it had any and their result"""
+    found, result = False, None
+    for instance in read:
+        value = map_fn(instance)
+        result = reduce_fn(result, value) if found else value
+        found = True
+    return found, result
+
+
+def _map_reduce_process(read, map_fn, reduce_fn):
+    """Map & reduce a read in a worker process
+
+    Forked processes inherit the boto3 table of their parent, but boto3 sessions can't be shared between processes, so
+    the first read done by each process creates a new one.
+    """
+    table_class = type(read.model.Table)
+    if table_class.__dict__.get('_table_pid') != os.getpid():
+        table_class._table_pid = os.getpid()
+        if '_table' in table_class.__dict__:
+            del table_class._table
+    return map_reduce_read(read, map_fn, reduce_fn)
@@ -113,11 +113,40 @@ Here's an example of how you could model the `Forum Application`_ from the Dynam
             query=lambda forum: dict(forum_name=forum.name),
             back_query=lambda thread: dict(name=thread.forum_name)
         )
+
+
+Caching
+-------
+
+Once a relationship has been loaded its value is cached on the instance, so accessing it again does not send any
+further requests.  Assigning a new value to a relationship replaces the cached value, and you can call
+:meth:`dynamorm.model.DynaModel.refresh_relationships` to have relationships loaded again on their next access:
+
+.. code-block:: python
+
+    thread.refresh_relationships('replies')
+
+
+Prefetching
+-----------
+
+Accessing a relationship sends a request to load the related items, so touching a relationship on every instance of a
+large query result sends one request per instance.  You can instead ask for relationships to be loaded for all the
+items of each page of results at once, through batched gets and concurrent queries:
+
+.. code-block:: python
+
+    for thread in Thread.query(forum_name='general').prefetch('user', 'replies'):
+        print(thread.user.name, len(thread.replies))
+
+See :meth:`dynamorm.model.DynaModel.prefetch` for details.
 """
 
 import six
 
+from .concurrency import concurrent_map, freeze
 from .signals import pre_save, post_save, pre_update, post_update
+from .table import BATCH_GET_LIMIT
 
 
 @six.python_2_unicode_compatible
@@ -184,6 +213,7 @@ class Relationship(object):
             back_reference=None
         )
         self.back_reference_relationship.set_this_model(self.other)
+        self.back_reference_relationship.back_reference_relationship = self
 
         ref_name = self.BackReferenceTemplate.format(back_reference=self.back_reference)
         setattr(self.other, ref_name, self.back_reference_relationship)
@@ -193,6 +223,42 @@ class Relationship(object):
         """ """
         pass
 
+    def prefetch(self, instances):
+        """Load this relationship for many instances of this model at once, see :meth:`dynamorm.model.DynaModel.prefetch`
+
+        Subclasses load the relationship for all of the instances through as few requests as possible.  By default it's
+        loaded for each of the instances separately, by accessing it from a pool of threads.
+        """
+        concurrent_map(lambda obj: self.__get__(obj, type(obj)), instances, self.other.Table.max_workers)
+
+    def query_many(self, queries, func):
+        """Call ``func`` concurrently with each distinct query, returning a dict of the results keyed by the frozen query
+        """
+        unique = dict((freeze(query), query) for query in queries)
+        results = concurrent_map(
+            lambda frozen: func(unique[frozen]),
+            unique,
+            self.other.Table.max_workers
+        )
+        return dict(zip(unique, results))
+
+    @staticmethod
+    def cache_for(obj):
+        """Return the dict of loaded relationship values for an instance, keyed by relationship
+
+        Relationship values are cached on each instance (rather than on the relationship, which is shared by all of the
+        instances of the model) so that repeatedly accessing a relationship does not send any further requests.
+        """
+        try:
+            return obj._relationship_cache
+        except AttributeError:
+            obj._relationship_cache = {}
+            return obj._relationship_cache
+
+    def invalidate(self, obj):
+        """Forget the cached value of this relationship on an instance, so it is loaded again on the next access"""
+        self.cache_for(obj).pop(self, None)
+
 
 class OneToOne(Relationship):
     """A One-to-One relationship is where two models (tables) have items that have a relation to exactly one instance in
@@ -210,13 +276,16 @@ class OneToOne(Relationship):
                  auto_create=True):
         super(OneToOne, self).__init__(other=other, query=query, index=index, back_query=back_query,
                                        back_index=back_index, back_reference=back_reference)
-        self.other_inst = None
         self.auto_create = auto_create
 
     def __get__(self, obj, owner):
-        if self.other_inst is None:
-            self.get_other_inst(obj, create_missing=self.auto_create)
-        return self.other_inst
+        if obj is None:
+            return self
+
+        cache = self.cache_for(obj)
+        if self not in cache:
+            cache[self] = self.get_other_inst(obj, create_missing=self.auto_create)
+        return cache[self]
 
     def __set__(self, obj, new_instance):
         if not isinstance(new_instance, self.other):
@@ -226,17 +295,26 @@ class OneToOne(Relationship):
         for key, val in six.iteritems(query):
             setattr(new_instance, key, val)
 
-        self.other_inst = new_instance
+        old_instance = self.cache_for(obj).get(self)
+        self.cache_for(obj)[self] = new_instance
+
+        # the other side of the relationship may have cached values that are no longer right, on both the new instance
+        # and the one it replaces (which still refers to this instance)
+        if self.back_reference_relationship is not None:
+            self.back_reference_relationship.invalidate(new_instance)
+            if old_instance is not None and old_instance is not new_instance:
+                self.back_reference_relationship.invalidate(old_instance)
 
     def __delete__(self, obj):
-        if self.other_inst is None:
-            self.get_other_inst(obj, create_missing=False)
+        other_inst = self.cache_for(obj).get(self)
+        if other_inst is None:
+            other_inst = self.get_other_inst(obj, create_missing=False)
 
-        if not self.other_inst:
+        if not other_inst:
             raise AttributeError("No other instance to delete")
 
-        self.other_inst.delete()
-        self.other_inst = None
+        other_inst.delete()
+        self.invalidate(obj)
 
     def set_this_model(self, model):
         super(OneToOne, self).set_this_model(model)
@@ -248,34 +326,71 @@ class OneToOne(Relationship):
             post_update.connect(self.post_update, sender=model)
 
     def get_other_inst(self, obj, create_missing=False):
+        """Load and return the other instance for an instance, or None if it does not exist and create_missing is False
+        """
         query = self.query(obj)
         results = self.accessor.query(**query)
 
         try:
-            self.other_inst = next(results)
+            return next(results)
         except StopIteration:
             if create_missing:
                 query['partial'] = True
-                self.other_inst = self.other(**query)
+                return self.other(**query)
 
     def assign(self, value):
         return self.back_query(value)
 
+    def prefetch(self, instances):
+        """Load the other instance for each of the given instances
+
+        When the query specifies the full primary key of the other model (and no index is used) the other instances are
+        loaded through batched gets, otherwise each distinct query is run concurrently.
+        """
+        queries = [self.query(obj) for obj in instances]
+
+        other_table = self.other.Table
+        if self.index is None and all(set(query) == other_table.table_attribute_fields for query in queries):
+            keys = [self.other._normalize_keys_in_kwargs(dict(query)) for query in queries]
+            unique = list(dict((other_table.key_values(key), key) for key in keys).values())
+            chunks = [unique[start:start + BATCH_GET_LIMIT] for start in range(0, len(unique), BATCH_GET_LIMIT)]
+
+            found = {}
+            for items in concurrent_map(lambda chunk: list(other_table.get_batch(chunk)), chunks,
+                                        other_table.max_workers):
+                for item in items:
+                    found[other_table.key_values(item)] = self.other.new_from_raw(item)
+
+            other_insts = [found.get(other_table.key_values(key)) for key in keys]
+        else:
+            results = self.query_many(queries, lambda query: next(self.accessor.query(**query), None))
+            other_insts = [results[freeze(query)] for query in queries]
+
+        for obj, query, other_inst in zip(instances, queries, other_insts):
+            if other_inst is None and self.auto_create:
+                query['partial'] = True
+                other_inst = self.other(**query)
+            self.cache_for(obj)[self] = other_inst
+
     def pre_save(self, sender, instance, put_kwargs):
-        if self.other_inst:
-            self.other_inst.validate()
+        other_inst = self.cache_for(instance).get(self)
+        if other_inst:
+            other_inst.validate()
 
     def post_save(self, sender, instance, put_kwargs):
-        if self.other_inst:
-            self.other_inst.save(partial=False)
+        other_inst = self.cache_for(instance).get(self)
+        if other_inst:
+            other_inst.save(partial=False)
 
     def pre_update(self, sender, instance, conditions, update_item_kwargs, updates):
-        if self.other_inst:
-            self.other_inst.validate()
+        other_inst = self.cache_for(instance).get(self)
+        if other_inst:
+            other_inst.validate()
 
     def post_update(self, sender, instance, conditions, update_item_kwargs, updates):
-        if self.other_inst:
-            self.other_inst.save(partial=True)
+        other_inst = self.cache_for(instance).get(self)
+        if other_inst:
+            other_inst.save(partial=True)
 
 
 class OneToMany(Relationship):
@@ -286,7 +401,22 @@ class OneToMany(Relationship):
     BackReferenceTemplate = '{back_reference}'
 
     def __get__(self, obj, owner):
-        return QuerySet(self.other, self.query(obj), self.accessor if self.index else None)
+        if obj is None:
+            return self
+
+        cache = self.cache_for(obj)
+        if self not in cache:
+            cache[self] = QuerySet(self.other, self.query(obj), self.accessor if self.index else None)
+        return cache[self]
+
+    def prefetch(self, instances):
+        """Run the query for each of the given instances concurrently, and attach the results to them"""
+        queries = [self.query(obj) for obj in instances]
+        results = self.query_many(queries, lambda query: list(self.accessor.query(**query).recursive()))
+
+        index = self.accessor if self.index else None
+        for obj, query in zip(instances, queries):
+            self.cache_for(obj)[self] = QuerySet(self.other, query, index, results=results[freeze(query)])
 
 
 class ManyToOne(OneToOne):
@@ -298,29 +428,61 @@ class ManyToOne(OneToOne):
 # XXX TODO: ManyToMany
 
 class QuerySet(object):
-    # XXX TODO: QuerySet should be moved to it's own namespace and should also be leveraged by the model classes so that
-    # when you query on a Table or Index you get back one of these.  This will allow you to call .count() and .filter()
-    # on existing queries to further refine them.
-    def __init__(self, model, query, index=None):
+    """The collection of related instances on the "many" side of a relationship
+
+    The query is only sent when the collection is first iterated (or its length is taken), after which all of the
+    related instances are kept so that accessing the collection again does not send any further requests.  Call
+    ``refresh`` to load them again.
+    """
+    def __init__(self, model, query, index=None, results=None):
         self.model = model
         self.query = query
         self.index = index
+        self.results = results
 
     def __iter__(self):
+        return iter(self.all())
+
+    def __len__(self):
+        return len(self.all())
+
+    def read(self):
+        """Return the query (see :class:`dynamorm.table.ReadIterator`) for the related instances"""
         if self.index:
             return self.index.query(**self.query)
         return self.model.query(**self.query)
 
-    def __len__(self):
-        return self.count()
+    def all(self):
+        """Return a list of all of the related instances, loading them if they have not been already"""
+        if self.results is None:
+            self.results = list(self.read().recursive())
+        return self.results
+
+    def first(self):
+        """Return the first related instance, or None if there are none"""
+        if self.results is not None:
+            return self.results[0] if self.results else None
+        return self.read().first()
+
+    def exists(self):
+        """Return True if there are any related instances"""
+        if self.results is not None:
+            return len(self.results) > 0
+        return self.read().exists()
+
+    def refresh(self):
+        """Forget the loaded instances, so that they are loaded again the next time they are accessed"""
+        self.results = None
+        return self
 
     def count(self):
-        query = self.query.copy()
-        query['query_kwargs'] = dict(Select='COUNT')
-        if self.index:
-            query['query_kwargs']['IndexName'] = self.index.name
-        resp = self.model.Table.query(**query)
-        return resp['Count']
+        """Return the number of related instances
+
+        If the instances have not been loaded this sends a query that only counts them, rather than loading them.
+        """
+        if self.results is not None:
+            return len(self.results)
+        return self.read().count()
 
     def filter(self, **kwargs):
         new_query = self.query.copy()
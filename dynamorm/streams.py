@@ -0,0 +1,320 @@
+"""Stream processors read the changes to a table from its `DynamoDB Stream`_ and pass them to your code as instances of
+your model.
+
+The table must have a stream (see the ``stream`` attribute of the table).  Your handler is called with lists of
+:class:`StreamRecord` objects, each of which holds the old and/or new image of the item (depending on the view type of
+the stream) as instances of the model:
+
+.. code-block:: python
+
+    def handle(records):
+        for record in records:
+            if record.event_name == 'REMOVE':
+                search.delete(record.old.id)
+            else:
+                search.index(record.new.to_dict())
+
+    processor = Thing.stream_processor(handle, store=FileCheckpointStore('/var/lib/things/stream.json'))
+    processor.process()  # process every record that is available, then return
+    processor.run()      # or keep polling for new records
+
+The shards of the stream are read in parallel, one thread per shard, but a shard is only read once its parent shard has
+been read to its end, so the changes to each item are always handled in order.  After the handler returns the sequence
+number of the last record it was given is saved to the checkpoint store, and processing resumes from there the next
+time.  If the handler raises an exception nothing is saved, so its records will be handed to it again.
+
+A record whose images can't be loaded into the model (because they fail validation) would otherwise block its shard
+forever, so it is left out of the batch and passed to the ``on_error`` function of the processor along with the
+exception, or logged if there isn't one, and the checkpoint moves past it.
+
+.. _DynamoDB Stream: https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Streams.html
+"""
+
+import abc
+import collections
+import json
+import logging
+import os
+import tempfile
+import threading
+
+import botocore
+import six
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from .concurrency import concurrent_map
+from .exceptions import StreamNotEnabled, ValidationError
+
+log = logging.getLogger(__name__)
+
+# The checkpoint of a shard that has been read to its end
+SHARD_END = 'SHARD_END'
+
+StreamRecord = collections.namedtuple('StreamRecord', [
+    'event_name', 'keys', 'new', 'old', 'sequence_number', 'shard_id', 'raw'
+])
+StreamRecord.__doc__ = """A change to an item, read from a stream
+
+``event_name`` is one of ``INSERT``, ``MODIFY`` or ``REMOVE``, ``keys`` is a dict of the key of the item, and ``new`` &
+``old`` are instances of the model built from the new & old images of the item (or None, if the stream doesn't include
+them).  ``raw`` is the record as it was returned by DynamoDB.
+"""
+
+
+@six.add_metaclass(abc.ABCMeta)
+class CheckpointStore(object):
+    """The base class of the stores that keep the sequence number of the last record processed from each shard
+
+    Subclasses must implement :meth:`get` & :meth:`set`, which may be called from several threads at once.
+    """
+    @abc.abstractmethod
+    def get(self, shard_id):
+        """Return the checkpoint of a shard, or None if nothing has been processed from it"""
+
+    @abc.abstractmethod
+    def set(self, shard_id, sequence_number):
+        """Save the checkpoint of a shard; this is the sequence number of a record, or ``SHARD_END``"""
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Keep the checkpoints in memory, so that they only last as long as the store"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkpoints = {}
+
+    def get(self, shard_id):
+        with self.lock:
+            return self.checkpoints.get(shard_id)
+
+    def set(self, shard_id, sequence_number):
+        with self.lock:
+            self.checkpoints[shard_id] = sequence_number
+
+
+class FileCheckpointStore(MemoryCheckpointStore):
+    """Keep the checkpoints in a JSON file, which is replaced every time a checkpoint is saved
+
+    :param str path: The path of the file, which is created if it doesn't exist
+    """
+    def __init__(self, path):
+        super(FileCheckpointStore, self).__init__()
+        self.path = path
+
+        try:
+            with open(path) as checkpoints:
+                self.checkpoints = json.load(checkpoints)
+        except (IOError, OSError):
+            if os.path.exists(path):
+                raise
+
+    def set(self, shard_id, sequence_number):
+        with self.lock:
+            self.checkpoints[shard_id] = sequence_number
+
+            # write a new file and move it into place, so that the file is never left half written
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+            try:
+                with os.fdopen(fd, 'w') as checkpoints:
+                    json.dump(self.checkpoints, checkpoints, sort_keys=True)
+                getattr(os, 'replace', os.rename)(temp_path, self.path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+
+
+class StreamProcessor(object):
+    """Read the stream of a model's table, passing the records of each shard to a handler in batches
+
+    :param model: The model class whose table's stream is read
+    :param handler: A function that is called with a list of :class:`StreamRecord` objects from a single shard, in order
+    :param store: The :class:`CheckpointStore` that keeps track of progress, defaults to a :class:`FileCheckpointStore`
+                  named after the table, in the current directory
+    :param int batch_size: The maximum number of records passed to the handler at once (up to 1000)
+    :param str start: Where to start reading shards that have no checkpoint, either ``TRIM_HORIZON`` (the oldest
+                      record) or ``LATEST`` (only new records)
+    :param int max_workers: The maximum number of shards that are read at once, defaults to ``max_workers`` of the table
+    :param float poll_interval: How long :meth:`run` waits after finding no new records, in seconds
+    :param int max_empty_polls: How many empty batches in a row an open shard may return before it is considered to
+                                be caught up with (DynamoDB can return empty batches before the newest records)
+    :param on_error: A function that is called with the raw record and the exception when a record's images can't be
+                     loaded into the model, defaults to logging the error
+    """
+    def __init__(self, model, handler, store=None, batch_size=100, start='TRIM_HORIZON', max_workers=None,
+                 poll_interval=1.0, max_empty_polls=3, on_error=None):
+        self.model = model
+        self.handler = handler
+        self.store = store or FileCheckpointStore('{0}.checkpoints.json'.format(model.Table.name))
+        self.batch_size = batch_size
+        self.start = start
+        self.max_workers = max_workers or model.Table.max_workers
+        self.poll_interval = poll_interval
+        self.max_empty_polls = max_empty_polls
+        self.on_error = on_error
+
+        self.deserializer = TypeDeserializer()
+        self._client = None
+        self._stream_arn = None
+        self._closed = set()
+
+    @property
+    def client(self):
+        """Return the boto3 DynamoDB Streams client"""
+        if self._client is None:
+            self._client = self.model.Table.get_streams_client()
+        return self._client
+
+    @property
+    def stream_arn(self):
+        """Return the ARN of the latest stream of the table"""
+        description = self.model.Table.resource.meta.client.describe_table(TableName=self.model.Table.name)
+        try:
+            return description['Table']['LatestStreamArn']
+        except KeyError:
+            raise StreamNotEnabled("The table {0} does not have a stream".format(self.model.Table.name))
+
+    def shards(self):
+        """Return the descriptions of all of the shards of the stream"""
+        self._stream_arn = self.stream_arn
+        shards = []
+        describe_kwargs = {'StreamArn': self._stream_arn}
+        while True:
+            description = self.client.describe_stream(**describe_kwargs)['StreamDescription']
+            shards.extend(description['Shards'])
+            if not description.get('LastEvaluatedShardId'):
+                # closed shards have an ending sequence number, and are always read to their end
+                self._closed.update(
+                    shard['ShardId'] for shard in shards
+                    if shard.get('SequenceNumberRange', {}).get('EndingSequenceNumber')
+                )
+                return shards
+            describe_kwargs['ExclusiveStartShardId'] = description['LastEvaluatedShardId']
+
+    def process(self):
+        """Process every record that is currently available in the stream, returning the number of records processed
+
+        The shards whose parents have been read to their end are read concurrently, and once they have been read the
+        children of any that were closed are read, until there are no more shards that can be read.
+        """
+        shards = self.shards()
+        shard_ids = set(shard['ShardId'] for shard in shards)
+
+        def ready(shard):
+            if self.store.get(shard['ShardId']) == SHARD_END:
+                return False
+            # parents that are no longer in the stream have expired, along with their records
+            parent = shard.get('ParentShardId')
+            return parent is None or parent not in shard_ids or self.store.get(parent) == SHARD_END
+
+        processed = 0
+        read = set()
+        while True:
+            to_read = [shard['ShardId'] for shard in shards if shard['ShardId'] not in read and ready(shard)]
+            if not to_read:
+                return processed
+
+            log.debug("Reading %d shards of the %s stream", len(to_read), self.model.Table.name)
+            processed += sum(concurrent_map(self.process_shard, to_read, self.max_workers))
+            read.update(to_read)
+
+    def run(self, stop=None):
+        """Process the records of the stream as they arrive, until the ``stop`` event is set
+
+        :param threading.Event stop: An event that ends processing when it is set, if not given this runs forever
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if not self.process():
+                stop.wait(self.poll_interval)
+
+    def process_shard(self, shard_id):
+        """Process the available records of a single shard, returning the number of records processed
+
+        Reading stops when an open shard has returned ``max_empty_polls`` empty batches in a row, or when a closed shard
+        has been read to its end (which is saved as a ``SHARD_END`` checkpoint).
+        """
+        iterator = self._shard_iterator(shard_id)
+        processed = 0
+        empty_polls = 0
+        while iterator:
+            response = self.client.get_records(ShardIterator=iterator, Limit=self.batch_size)
+            raw_records = response['Records']
+            if raw_records:
+                records = [record for record in (self.record(shard_id, raw, True) for raw in raw_records) if record]
+                if records:
+                    self.handler(records)
+                self.store.set(shard_id, raw_records[-1]['dynamodb']['SequenceNumber'])
+                processed += len(raw_records)
+                empty_polls = 0
+            else:
+                empty_polls += 1
+
+            iterator = response.get('NextShardIterator')
+            if iterator and empty_polls >= self.max_empty_polls and shard_id not in self._closed:
+                # we've caught up with an open shard
+                return processed
+
+        log.debug("Reached the end of shard %s of the %s stream", shard_id, self.model.Table.name)
+        self.store.set(shard_id, SHARD_END)
+        return processed
+
+    def _shard_iterator(self, shard_id):
+        """Return an iterator for a shard, starting after its checkpoint"""
+        if self._stream_arn is None:
+            self._stream_arn = self.stream_arn
+
+        iterator_kwargs = {'StreamArn': self._stream_arn, 'ShardId': shard_id, 'ShardIteratorType': self.start}
+
+        checkpoint = self.store.get(shard_id)
+        if checkpoint:
+            iterator_kwargs.update(ShardIteratorType='AFTER_SEQUENCE_NUMBER', SequenceNumber=checkpoint)
+
+        try:
+            return self.client.get_shard_iterator(**iterator_kwargs)['ShardIterator']
+        except botocore.exceptions.ClientError as exc:
+            if exc.response['Error']['Code'] != 'TrimmedDataAccessException':
+                raise
+
+        log.warning("The checkpoint of shard %s of the %s stream has expired, records have been lost",
+                    shard_id, self.model.Table.name)
+        iterator_kwargs.pop('SequenceNumber')
+        iterator_kwargs['ShardIteratorType'] = 'TRIM_HORIZON'
+        return self.client.get_shard_iterator(**iterator_kwargs)['ShardIterator']
+
+    def record(self, shard_id, raw, skip_invalid=False):
+        """Return a :class:`StreamRecord` for a raw record
+
+        :param bool skip_invalid: If True a record whose images fail validation is passed to ``on_error`` (or logged)
+                                  and None is returned, rather than raising a
+                                  :class:`~dynamorm.exceptions.ValidationError`
+        """
+        data = raw['dynamodb']
+        new, old = data.get('NewImage'), data.get('OldImage')
+        try:
+            return StreamRecord(
+                raw['eventName'],
+                self.deserialize(data.get('Keys')),
+                self.model.new_from_raw(self.deserialize(new), write_back=False) if new is not None else None,
+                self.model.new_from_raw(self.deserialize(old), write_back=False) if old is not None else None,
+                data['SequenceNumber'],
+                shard_id,
+                raw
+            )
+        except ValidationError as exc:
+            if not skip_invalid:
+                raise
+            if self.on_error is not None:
+                self.on_error(raw, exc)
+            else:
+                log.error("Skipping record %s of shard %s of the %s stream, which failed validation: %s",
+                          data['SequenceNumber'], shard_id, self.model.Table.name, exc)
+            return None
+
+    def deserialize(self, image):
+        """Convert an image in the DynamoDB wire format into a plain dict"""
+        if self.model.Table.number_parser is not None:
+            return self.model.Table.number_parser.deserialize(image or {})
+        return dict(
+            (name, self.deserializer.deserialize(value))
+            for name, value in six.iteritems(image or {})
+        )
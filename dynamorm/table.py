@@ -4,25 +4,47 @@
 The attributes you define on your inner ``Table`` class map to underlying boto data structures.  This mapping is
 expressed through the following data model:
 
-=========  ========  ====  ===========
-Attribute  Required  Type  Description
-=========  ========  ====  ===========
-name       True      str   The name of the table, as stored in Dynamo.
+=================  ========  ====  ===========
+Attribute          Required  Type  Description
+=================  ========  ====  ===========
+name               True      str   The name of the table, as stored in Dynamo.
 
-hash_key   True      str   The name of the field to use as the hash key.
-                           It must exist in the schema.
+hash_key           True      str   The name of the field to use as the hash key.
+                                   It must exist in the schema.
 
-range_key  False     str   The name of the field to use as the range_key, if one is used.
-                           It must exist in the schema.
+range_key          False     str   The name of the field to use as the range_key, if one is used.
+                                   It must exist in the schema.
 
-read       True      int   The provisioned read throughput.
+read               True      int   The provisioned read throughput.
 
-write      True      int   The provisioned write throughput.
+write              True      int   The provisioned write throughput.
 
-stream     False     str   The stream view type, either None or one of:
-                           'NEW_IMAGE'|'OLD_IMAGE'|'NEW_AND_OLD_IMAGES'|'KEYS_ONLY'
+stream             False     str   The stream view type, either None or one of:
+                                   'NEW_IMAGE'|'OLD_IMAGE'|'NEW_AND_OLD_IMAGES'|'KEYS_ONLY'
 
-=========  ========  ====  ===========
+coalesce_reads     False     bool  When True, identical eventually consistent gets & queries that are issued
+                                   concurrently from multiple threads share a single request.  Defaults to False.
+                                   See :class:`dynamorm.concurrency.SingleFlight`.
+
+max_workers        False     int   The maximum number of threads used when DynamORM issues requests concurrently on
+                                   your behalf, such as when prefetching relationships.  Defaults to 8.
+
+cursor_secret      False     str   When set, pagination cursors are signed with this secret.
+                                   See :mod:`dynamorm.cursors`.
+
+version_attribute  False     str   The name of the field that holds the schema version of each item.
+                                   It must exist in the schema.  Required if ``upgrades`` are used.
+
+upgrades           False     list  The functions that upgrade items to each schema version, in order.
+                                   See :mod:`dynamorm.migrations`.
+
+write_back         False     bool  When True, items that are upgraded as they are read are written back to the
+                                   table in the background.  Defaults to False.
+
+native_numbers     False     bool  When True, the numbers of integer & float fields are read as ints & floats,
+                                   rather than ``Decimal`` objects.  See :mod:`dynamorm.numbers`.
+
+=================  ========  ====  ===========
 
 
 Indexes
@@ -42,7 +64,12 @@ projection  True      object  An instance of of :class:`dynamorm.model.ProjectAl
 """
 
 import collections
+import copy
+import decimal
+import heapq
+import itertools
 import logging
+import math
 import time
 import warnings
 
@@ -50,14 +77,26 @@ import boto3
 import botocore
 import six
 
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.conditions import Attr, AttributeBase, ConditionBase, Key
+from six.moves import collections_abc
+from dynamorm.aggregates import Aggregation
+from dynamorm.columns import ColumnBuilder
+from dynamorm.concurrency import SingleFlight, concurrent_chain, concurrent_map, freeze
+from dynamorm.conditions import evaluate
+from dynamorm.cursors import decode_cursor, encode_cursor
+from dynamorm.incremental import capture, capturing
+from dynamorm.numbers import NumberInjector, NumberParser
+from dynamorm.processes import map_reduce, process_count
 from dynamorm.exceptions import (
     MissingTableAttribute, TableNotActive,
-    InvalidSchemaField, HashKeyExists, ConditionFailed,
+    InvalidSchemaField, HashKeyExists, ConditionFailed, InvalidCursor, InvalidKey,
 )
 
 log = logging.getLogger(__name__)
 
+# The maximum number of keys that can be requested in a single BatchGetItem request
+BATCH_GET_LIMIT = 100
+
 
 class DynamoCommon3(object):
     """Common properties & functions of Boto3 DynamORM objects -- i.e. Tables & Indexes"""
@@ -178,9 +217,21 @@ class DynamoTable3(DynamoCommon3):
     resource_kwargs = None
 
     stream = None
+    INDEX_TYPE = None
+
+    coalesce_reads = False
+    max_workers = 8
+    cursor_secret = None
+
+    version_attribute = None
+    upgrades = ()
+    write_back = False
+
+    native_numbers = False
 
     def __init__(self, schema, indexes=None):
         self.schema = schema
+        self.single_flight = SingleFlight()
 
         super(DynamoTable3, self).__init__()
 
@@ -205,9 +256,25 @@ class DynamoTable3(DynamoCommon3):
         if self.stream and self.stream not in ['NEW_IMAGE', 'OLD_IMAGE', 'NEW_AND_OLD_IMAGES', 'KEYS_ONLY']:
             raise ConditionFailed("Stream parameter '{0}' is invalid".format(self.stream))
 
+        self.number_parser = self.number_injector = None
+        if self.native_numbers:
+            self.number_parser = NumberParser(schema)
+            self.number_injector = NumberInjector(self.name, self.number_parser)
+
+        if self.upgrades and self.version_attribute is None:
+            raise MissingTableAttribute("Tables with upgrades must have a version_attribute")
+
+        if self.version_attribute and self.version_attribute not in self.schema.dynamorm_fields():
+            raise InvalidSchemaField("The version attribute '{0}' does not exist in the schema".format(
+                self.version_attribute
+            ))
+
     @property
     def resource(self):
-        return self.get_resource()
+        resource = self.get_resource()
+        if self.number_injector is not None:
+            self.number_injector.register(resource.meta.client)
+        return resource
 
     @classmethod
     def get_resource(cls, **kwargs):
@@ -223,6 +290,18 @@ class DynamoTable3(DynamoCommon3):
         if kwargs and not cls.resource_kwargs:
             cls.resource_kwargs = kwargs
 
+        boto3_session, kwargs = cls._boto3_config(kwargs)
+        return boto3_session.resource('dynamodb', **kwargs)
+
+    @classmethod
+    def get_streams_client(cls):
+        """Return a boto3 DynamoDB Streams client, configured in the same way as the resource"""
+        boto3_session, kwargs = cls._boto3_config({})
+        return boto3_session.client('dynamodbstreams', **kwargs)
+
+    @classmethod
+    def _boto3_config(cls, kwargs):
+        """Return the boto3 session, and the kwargs for its resources & clients"""
         boto3_session = boto3.Session(**(cls.session_kwargs or {}))
 
         for key, val in six.iteritems(cls.resource_kwargs or {}):
@@ -239,7 +318,7 @@ class DynamoTable3(DynamoCommon3):
             if isinstance(resource_config, dict):
                 kwargs['config'] = botocore.config.Config(**resource_config)
 
-        return boto3_session.resource('dynamodb', **kwargs)
+        return boto3_session, kwargs
 
     @classmethod
     def get_table(cls, name):
@@ -258,7 +337,10 @@ class DynamoTable3(DynamoCommon3):
     @property
     def table(self):
         """Return the boto3 table"""
-        return self.get_table(self.name)
+        table = self.get_table(self.name)
+        if self.number_injector is not None:
+            self.number_injector.register(table.meta.client)
+        return table
 
     @property
     def exists(self):
@@ -576,9 +658,9 @@ class DynamoTable3(DynamoCommon3):
         update_item_kwargs['ExpressionAttributeNames'] = expr_names
         update_item_kwargs['ExpressionAttributeValues'] = expr_vals
 
-        if isinstance(conditions, collections.Mapping):
+        if isinstance(conditions, collections_abc.Mapping):
             condition_expression = Q(**conditions)
-        elif isinstance(conditions, collections.Iterable):
+        elif isinstance(conditions, collections_abc.Iterable):
             condition_expression = None
             for condition in conditions:
                 try:
@@ -599,36 +681,96 @@ class DynamoTable3(DynamoCommon3):
             raise
 
     def get_batch(self, keys, consistent=False, attrs=None, batch_get_kwargs=None):
+        """Generator to get many items from the table through ``BatchGetItem`` requests
+
+        Duplicate keys are dropped and the remaining keys are sent in chunks of up to ``BATCH_GET_LIMIT`` keys, the most
+        that DynamoDB accepts in a single request.
+        """
         batch_get_kwargs = batch_get_kwargs or {}
 
-        batch_get_kwargs['Keys'] = []
+        if consistent:
+            batch_get_kwargs['ConsistentRead'] = True
+
+        if attrs:
+            batch_get_kwargs['ProjectionExpression'] = attrs
+
+        seen = set()
+        chunk = []
         for kwargs in keys:
             for k, v in six.iteritems(kwargs):
                 if k not in self.schema.dynamorm_fields():
                     raise InvalidSchemaField("{0} does not exist in the schema fields".format(k))
 
-            batch_get_kwargs['Keys'].append(kwargs)
+            frozen = freeze(kwargs)
+            if frozen in seen:
+                continue
+            seen.add(frozen)
 
-        if consistent:
-            batch_get_kwargs['ConsistentRead'] = True
+            chunk.append(kwargs)
+            if len(chunk) == BATCH_GET_LIMIT:
+                for item in self._get_batch_chunk(chunk, batch_get_kwargs):
+                    yield item
+                chunk = []
 
-        if attrs:
-            batch_get_kwargs['ProjectionExpression'] = attrs
+        if chunk:
+            for item in self._get_batch_chunk(chunk, batch_get_kwargs):
+                yield item
+
+    def _get_batch_chunk(self, keys, batch_get_kwargs):
+        """Generator to get a single chunk of keys, following any UnprocessedKeys until they have all been fetched"""
+        resource = self.resource
+        request = dict(batch_get_kwargs, Keys=keys)
 
         while True:
-            response = self.resource.batch_get_item(RequestItems={
-                self.name: batch_get_kwargs
+            response = resource.batch_get_item(RequestItems={
+                self.name: request
             })
 
             for item in response['Responses'][self.name]:
                 yield item
 
             try:
-                batch_get_kwargs = response['UnprocessedKeys'][self.name]
+                request = response['UnprocessedKeys'][self.name]
             except KeyError:
                 # once our table is no longer listed in UnprocessedKeys we're done our while True loop
                 break
 
+    @property
+    def key_schema_names(self):
+        """Return a tuple of the names of the hash key, and range key (if used)"""
+        if self.range_key:
+            return (self.hash_key, self.range_key)
+        return (self.hash_key,)
+
+    def key_values(self, item):
+        """Return a tuple of the hash key value, and range key value (or None), from an item or key dict"""
+        return (item.get(self.hash_key), item.get(self.range_key) if self.range_key else None)
+
+    @property
+    def schema_version(self):
+        """Return the current schema version of items, which is the number of upgrades"""
+        return len(self.upgrades)
+
+    def item_version(self, item):
+        """Return the schema version of a raw item; items without a version are version 0"""
+        return int(item.get(self.version_attribute) or 0)
+
+    def upgrade(self, item):
+        """Return a raw item upgraded to the current schema version, by applying each of the upgrades it needs in order
+
+        Each upgrade is called with the item at the previous version and returns the new item, which has its version
+        attribute set afterwards.  Items that are already at the current version are returned as they are.
+        """
+        version = self.item_version(item)
+        if version >= self.schema_version:
+            return item
+
+        item = dict(item)
+        for number in range(version, self.schema_version):
+            item = self.upgrades[number](item)
+            item[self.version_attribute] = number + 1
+        return item
+
     def get(self, consistent=False, get_item_kwargs=None, **kwargs):
         get_item_kwargs = get_item_kwargs or {}
 
@@ -640,15 +782,256 @@ class DynamoTable3(DynamoCommon3):
         if consistent:
             get_item_kwargs['ConsistentRead'] = True
 
-        response = self.table.get_item(**get_item_kwargs)
+        response = self._read('get_item', get_item_kwargs)
 
         if 'Item' in response:
             return response['Item']
 
+    def lookup_keys(self, kwargs):
+        """Return a :class:`KeyLookup` of the primary keys that equality & ``in`` conditions in the kwargs fully
+        specify, or None if they don't specify every attribute of the primary key
+
+        Every combination of the values given for the hash key and the range key is a key.
+
+        :param dict kwargs: The key(s) and value(s) of a query or scan
+        """
+        values = []
+        conditions = []
+        for name in self.key_schema_names:
+            in_key = '__'.join([name, 'in'])
+            found = [full_key for full_key in (name, '__'.join([name, 'eq']), in_key) if full_key in kwargs]
+            if len(found) != 1:
+                return None
+
+            full_key = found[0]
+            if full_key == in_key:
+                seen = set()
+                values.append([value for value in kwargs[full_key] if not (value in seen or seen.add(value))])
+            else:
+                values.append([kwargs[full_key]])
+            conditions.append(full_key)
+
+        keys = [dict(zip(self.key_schema_names, combination)) for combination in itertools.product(*values)]
+        return KeyLookup(keys, conditions)
+
+    def get_keys(self, *args, **kwargs):
+        """Read the items whose primary keys are fully specified by equality & ``in`` conditions in the kwargs through
+        ``BatchGetItem`` requests, returning a response in the same form as a query or scan
+
+        The other conditions in the kwargs, and the Q objects in args, are applied to the items on the client (see
+        :func:`dynamorm.conditions.evaluate`).  The items are returned in the order of their keys, and the ``Limit`` &
+        ``ExclusiveStartKey`` in ``get_keys_kwargs`` page through the keys, just like they page through the items of a
+        query or scan.  The keys of a page are fetched in chunks of up to ``BATCH_GET_LIMIT``, which are sent
+        concurrently by up to ``max_workers`` threads.
+
+        :param \*args: Q objects to filter the items with
+        :param \*\*kwargs: The key(s) and value(s) to get, and any other conditions to filter the items with
+        :raises InvalidKey: If the kwargs don't fully specify the primary keys, or the start key isn't one of them
+        """
+        read_kwargs = kwargs.pop('get_keys_kwargs', None) or {}
+
+        lookup = self.lookup_keys(kwargs)
+        if lookup is None:
+            raise InvalidKey("Every attribute of the primary key ({0}) must be given with an equality or in "
+                             "condition".format(', '.join(self.key_schema_names)))
+        for full_key in lookup.conditions:
+            del kwargs[full_key]
+
+        filter_expression = Q(**kwargs)
+        for arg in args:
+            try:
+                filter_expression = filter_expression & arg
+            except TypeError:
+                filter_expression = arg
+
+        keys = lookup.keys
+        if read_kwargs.get('ExclusiveStartKey'):
+            positions = [self.key_values(key) for key in keys]
+            try:
+                keys = keys[positions.index(self.key_values(read_kwargs['ExclusiveStartKey'])) + 1:]
+            except ValueError:
+                raise InvalidKey("The start key is not one of the keys being read")
+
+        if read_kwargs.get('Limit'):
+            page, keys = keys[:read_kwargs['Limit']], keys[read_kwargs['Limit']:]
+        else:
+            page, keys = keys, []
+
+        # the whole item is needed to evaluate a filter, otherwise only what was asked for (along with the keys, to put
+        # the items in order) is fetched
+        batch_get_kwargs = {}
+        counting = read_kwargs.get('Select') == 'COUNT'
+        if filter_expression is None and (read_kwargs.get('ProjectionExpression') or counting):
+            names, projection = {}, []
+            if not counting:
+                names.update(read_kwargs.get('ExpressionAttributeNames', {}))
+                projection.append(read_kwargs['ProjectionExpression'])
+            for position, name in enumerate(self.key_schema_names):
+                names['#gk{0}'.format(position)] = name
+                projection.append('#gk{0}'.format(position))
+            batch_get_kwargs['ProjectionExpression'] = ', '.join(projection)
+            batch_get_kwargs['ExpressionAttributeNames'] = names
+
+        def get_chunk(chunk):
+            return list(self.get_batch(
+                chunk,
+                consistent=read_kwargs.get('ConsistentRead', False),
+                batch_get_kwargs=dict(batch_get_kwargs)
+            ))
+
+        chunks = [page[start:start + BATCH_GET_LIMIT] for start in range(0, len(page), BATCH_GET_LIMIT)]
+        log.debug("Getting %d keys of %s in %d batch gets", len(page), self.name, len(chunks))
+
+        fetched = {}
+        for items in concurrent_map(get_chunk, chunks, self.max_workers):
+            fetched.update((self.key_values(item), item) for item in items)
+
+        found = [fetched[self.key_values(key)] for key in page if self.key_values(key) in fetched]
+        items = [item for item in found if filter_expression is None or evaluate(filter_expression, item)]
+        if filter_expression is not None and read_kwargs.get('ProjectionExpression') and not counting:
+            # the whole items were fetched to evaluate the filter, so only keep the attributes that were asked for
+            items = [project(item, read_kwargs, self.key_schema_names) for item in items]
+
+        response = {'Items': [] if counting else items, 'Count': len(items), 'ScannedCount': len(found)}
+        if keys:
+            response['LastEvaluatedKey'] = page[-1]
+        return response
+
+    def plan_query(self, *args, **kwargs):
+        """Choose the table or index that a query should be run on, returning a :class:`QueryPlan`
+
+        Queries that name an index (through ``IndexName`` in ``query_kwargs``) always use that index.  Otherwise the
+        table and every index whose hash key has an equality condition in the kwargs are considered, and the one that
+        can also use a condition on its range key is preferred.  Ties go to a source that contains every item (an index
+        whose range key is optional in the schema leaves out the items without one), then to one that doesn't need to
+        fetch attributes from the table, then to a "covering" index, then to the table, then to local indexes.
+
+        An index is covering when the query asks for specific attributes (with a ``ProjectionExpression``) and the index
+        projects all of them, along with the attributes being filtered on, but not every attribute of the table.  Its
+        items are smaller than those of the table, so reading them consumes less capacity.
+
+        Global indexes are never chosen for consistent reads.  A warning is logged when an index is chosen for a query
+        that the table could also run, since the results come from the index.  Indexes that don't project all attributes are skipped if they
+        don't project the attributes that are filtered on (or asked for with a ``ProjectionExpression``), except for
+        local indexes which can fetch the missing attributes from the table (using a ``Select`` of ``ALL_ATTRIBUTES``).
+
+        :param \*args: Q objects, as passed to query
+        :param \*\*kwargs: The key(s) and value(s) to query based on, as passed to query
+        :raises InvalidSchemaField: If neither the table nor any index can be queried
+        """
+        query_kwargs = kwargs.pop('query_kwargs', None) or {}
+
+        conditions = {}
+        for full_key in kwargs:
+            parts = full_key.split('__')
+            op = parts[1] if len(parts) == 2 else 'eq' if len(parts) == 1 else None
+            conditions.setdefault(parts[0], set()).add(op)
+
+        filter_fields = set()
+        for arg in args:
+            filter_fields.update(condition_fields(arg))
+
+        wanted = projection_fields(query_kwargs)
+
+        def plan_for(name, source):
+            key_fields = [source.hash_key]
+            if source.range_key and conditions.get(source.range_key, set()) & KEY_OPERATORS:
+                key_fields.append(source.range_key)
+
+            filters = filter_fields.union(field for field in conditions if field not in key_fields)
+            projected = self.projected_fields(name)
+            covering = projected is not None and wanted is not None and wanted.union(filters) <= projected
+            if projected is None or covering:
+                partial, select = wanted is not None, None
+            elif source.INDEX_TYPE == 'LocalIndex' and wanted is None and 'Select' not in query_kwargs:
+                partial, select = False, 'ALL_ATTRIBUTES'
+            else:
+                return None
+
+            # items without a value for the range key of an index are left out of it, which only matters if the query
+            # doesn't already require a value
+            complete = (
+                name is None or not source.range_key or source.range_key in key_fields or
+                self.field_is_required(source.range_key)
+            )
+
+            return QueryPlan(name, source.INDEX_TYPE, key_fields, sorted(filters), partial, select, covering, complete)
+
+        if query_kwargs.get('IndexName'):
+            index = self.indexes[query_kwargs['IndexName']]
+            plan = plan_for(index.name, index)
+            if plan is None:
+                # explicitly chosen indexes return whatever they have projected
+                plan = QueryPlan(index.name, index.INDEX_TYPE, [index.hash_key], [], True, None, False, True)
+            return plan
+
+        candidates = [(None, self)] + [(name, self.indexes[name]) for name in sorted(self.indexes)]
+        plans = []
+        for order, (name, source) in enumerate(candidates):
+            if 'eq' not in conditions.get(source.hash_key, ()):
+                continue
+            if source.INDEX_TYPE == 'GlobalIndex' and query_kwargs.get('ConsistentRead'):
+                continue
+
+            plan = plan_for(name, source)
+            if plan is not None:
+                rank = (
+                    len(plan.key_fields), plan.complete, plan.select is None, plan.covering, name is None,
+                    plan.index_type == 'LocalIndex'
+                )
+                plans.append((rank, -order, plan))
+
+        if not plans:
+            raise InvalidSchemaField(
+                "Primary key must be specified for queries.  To query on {0} the hash key of the table, or of an index "
+                "that projects the attributes you need, must be given with an equality condition".format(
+                    ', '.join(sorted(conditions)) or 'nothing'
+                )
+            )
+
+        plan = max(plans)[2]
+        if plan.index_name and any(candidate.index_name is None for _, _, candidate in plans):
+            log.warning(
+                "A query of the table '%s' was routed to the %s '%s'%s: %s",
+                self.name, plan.index_type, plan.index_name,
+                ", which only supports eventually consistent reads" if plan.index_type == 'GlobalIndex' else "",
+                plan
+            )
+        return plan
+
+    def field_is_required(self, name):
+        """Return True if the schema requires a value for the named field"""
+        return bool(getattr(self.schema.dynamorm_fields().get(name), 'required', False))
+
+    def projected_fields(self, index_name=None):
+        """Return the set of attribute names that are projected into an index, or None if all attributes are"""
+        if index_name is None:
+            return None
+
+        index = self.indexes[index_name]
+        projection = index.projection.__class__.__name__
+        if projection == 'ProjectAll':
+            return None
+
+        fields = self.table_attribute_fields.union(self.index_attribute_fields(index_name=index_name))
+        if projection == 'ProjectInclude':
+            fields.update(index.projection.include)
+        return fields
+
     def query(self, *args, **kwargs):
         query_kwargs = kwargs.pop('query_kwargs', {})
+        plan = kwargs.pop('plan', None)
         filter_kwargs = {}
 
+        if 'IndexName' not in query_kwargs:
+            if plan is None:
+                plan = self.plan_query(*args, query_kwargs=query_kwargs, **kwargs)
+            log.debug("Query plan: %s", plan)
+            if plan.index_name:
+                query_kwargs['IndexName'] = plan.index_name
+            if plan.select and 'Select' not in query_kwargs:
+                query_kwargs['Select'] = plan.select
+
         if 'IndexName' in query_kwargs:
             attr_fields = self.index_attribute_fields(index_name=query_kwargs['IndexName'])
         else:
@@ -689,7 +1072,7 @@ class DynamoTable3(DynamoCommon3):
             query_kwargs['FilterExpression'] = filter_expression
 
         log.debug("Query: %s", query_kwargs)
-        return self.table.query(**query_kwargs)
+        return self._read('query', query_kwargs)
 
     def scan(self, *args, **kwargs):
         scan_kwargs = kwargs.pop('scan_kwargs', None) or {}
@@ -709,6 +1092,163 @@ class DynamoTable3(DynamoCommon3):
     def delete_item(self, **kwargs):
         return self.table.delete_item(Key=kwargs)
 
+    def _read(self, method_name, read_kwargs):
+        """Call a read method on the boto3 table, coalescing identical eventually consistent reads that are in flight
+
+        The number of requests saved by coalescing is available as ``single_flight.saved``.
+        """
+        method = getattr(self.table, method_name)
+        if not self.coalesce_reads or read_kwargs.get('ConsistentRead') or capturing():
+            return method(**read_kwargs)
+        return self.single_flight.do((method_name, freeze(read_kwargs)), method, **read_kwargs)
+
+
+# The operators that can be used in a key condition on a range key
+KEY_OPERATORS = frozenset(['eq', 'lt', 'lte', 'gt', 'gte', 'between', 'begins_with'])
+
+
+# The keys that a query or scan fully specifies, and the names of the conditions that specify them
+KeyLookup = collections.namedtuple('KeyLookup', ['keys', 'conditions'])
+
+
+@six.python_2_unicode_compatible
+class QueryPlan(collections.namedtuple('QueryPlan', [
+    'index_name', 'index_type', 'key_fields', 'filter_fields', 'partial', 'select', 'covering', 'complete'
+])):
+    """The access path chosen for a query by :meth:`DynamoTable3.plan_query`
+
+    ``index_name`` & ``index_type`` are None when the table itself is queried.  ``key_fields`` are the attributes used
+    in the key condition, and ``filter_fields`` those that are left to the filter expression.  ``partial`` is True if
+    the results will not contain every attribute, and ``select`` is the ``Select`` parameter needed (if any).
+    ``covering`` is True if the index was chosen because it projects every attribute the query needs, and
+    ``complete`` is False if the index can leave out items that match the query.
+    """
+    def __str__(self):
+        if self.index_name:
+            source = "{0} '{1}'".format(self.index_type, self.index_name)
+        else:
+            source = "table"
+
+        description = "Query the {0} with a key condition on {1}".format(source, ', '.join(self.key_fields))
+        if self.filter_fields:
+            description += ", filtering on {0}".format(', '.join(self.filter_fields))
+        if self.select == 'ALL_ATTRIBUTES':
+            description += ", fetching the attributes that are not projected from the table"
+        if self.covering:
+            description += ", which covers every requested attribute"
+        if not self.complete:
+            description += ", which leaves out items without a range key value"
+        if self.partial:
+            description += " (partial results)"
+        return description
+
+
+def condition_fields(condition):
+    """Return the set of top level attribute names used in a condition (i.e. a Q object)"""
+    if isinstance(condition, AttributeBase):
+        return set([condition.name.split('.')[0]])
+
+    fields = set()
+    if isinstance(condition, ConditionBase):
+        for value in condition.get_expression()['values']:
+            fields.update(condition_fields(value))
+    return fields
+
+
+def projection_fields(read_kwargs):
+    """Return the set of top level attribute names in the ``ProjectionExpression`` of a read, or None if it has none"""
+    if 'ProjectionExpression' not in read_kwargs:
+        return None
+
+    names = read_kwargs.get('ExpressionAttributeNames', {})
+    return set(
+        names.get(path.strip().split('.')[0], path.strip().split('.')[0])
+        for path in read_kwargs['ProjectionExpression'].split(',')
+    )
+
+
+def project(item, read_kwargs, key_names):
+    """Return the attributes of an item that the ``ProjectionExpression`` of a read asks for, along with its keys
+
+    Attributes that are asked for by a path (such as ``address.city``) are kept whole.
+    """
+    wanted = projection_fields(read_kwargs).union(key_names)
+    return dict((name, value) for name, value in six.iteritems(item) if name in wanted)
+
+
+def uniform_boundaries(low, high, segments):
+    """Split the interval from ``low`` to ``high`` into ``segments`` sub-ranges of equal width, returning the sorted list
+    of their boundaries (including ``low`` & ``high``)
+
+    This is the default sampler for :meth:`QueryIterator.split`, and supports numbers, dates & datetimes.
+    """
+    boundaries = [low]
+    for segment in range(1, segments):
+        if isinstance(low, (float, decimal.Decimal)):
+            boundary = low + (high - low) * segment / segments
+        else:
+            boundary = low + (high - low) * segment // segments
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+    if high > boundaries[-1]:
+        boundaries.append(high)
+    return boundaries
+
+
+def merge_reads(reads, key, reverse=False, max_items=None, max_workers=8):
+    """Merge the results of many reads, each of which is already sorted, into a single sorted stream of results
+
+    The first page of every read is loaded concurrently, after which the results are merged with a heap.  Later pages
+    are only loaded when the merge needs the next result of a read, so once ``max_items`` results have been produced no
+    further requests are sent.
+
+    :param reads: The reads (i.e. :class:`QueryIterator` objects) to merge
+    :param key: A function that returns the value each result is sorted by
+    :param bool reverse: True if the reads are sorted in descending order
+    :param int max_items: If set, stop after producing this many results
+    :param int max_workers: The maximum number of threads used to load the first pages
+    """
+    iterators = [iter(read) for read in reads]
+    sort_key = _Descending if reverse else _Ascending
+
+    heap = []
+    for position, item in enumerate(concurrent_map(lambda iterator: next(iterator, None), iterators, max_workers)):
+        if item is not None:
+            heap.append((sort_key(key(item)), position, item))
+    heapq.heapify(heap)
+
+    produced = 0
+    while heap:
+        _, position, item = heapq.heappop(heap)
+        yield item
+
+        produced += 1
+        if max_items is not None and produced >= max_items:
+            return
+
+        item = next(iterators[position], None)
+        if item is not None:
+            heapq.heappush(heap, (sort_key(key(item)), position, item))
+
+
+class _Ascending(object):
+    """A sort key for merging reads that are sorted in ascending order"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+
+class _Descending(_Ascending):
+    """A sort key for merging reads that are sorted in descending order"""
+    __slots__ = ()
+
+    def __lt__(self, other):
+        return other.value < self.value
+
 
 def remove_nones(in_dict):
     """
@@ -735,7 +1275,7 @@ def get_expression(attr, op, value):
         # otherwise we bubble it up.
         if value is True:
             return op()
-        elif isinstance(value, collections.Iterable):
+        elif isinstance(value, collections_abc.Iterable):
             return op(*value)
         else:
             raise
@@ -789,18 +1329,36 @@ class ReadIterator(six.Iterator):
 
         # The next time you call scan (or query) pass the .last attribute of your previous results
         # in as the last argument
-        results = MyModel.scan().start(results.last).limit(1)
+        results = MyModel.scan().start(results.last)
         for model in results:
             print model.id
 
         # ...
 
+    Nothing is sent to the table until you start iterating over the results.  The chained methods (``limit``,
+    ``filter``, ``only``, etc.) each return a new iterator, leaving the one they were called on unchanged, so you can
+    build a base query and refine it in different ways:
+
+    .. code-block:: python
+
+        books = Book.query(author="Dr. Seuss")
+        fish = books.filter(title__contains="Fish")
+        newest = books.reverse().first()
+
+    Once all of the results of a bounded read (a single page, or a maximum number of items) have been loaded they are
+    kept, and iterating over the same object again does not send any further requests.  The results of recursive reads
+    are not kept, so that reading a whole table or partition doesn't keep every instance in memory.
+
     :param model: The Model class to wrap
     :param \*args: Q objects, passed through to scan or query
     :param \*\*kwargs: filters, passed through to scan or query
     """
     METHOD_NAME = None
 
+    # The Limit of the first page of reads with a maximum number of items, and how much the Limit can grow by per page
+    FIRST_PAGE_SIZE = 10
+    PAGE_GROWTH = 4
+
     def __init__(self, model, *args, **kwargs):
         assert self.METHOD_NAME, "Improper use of ReadIterator, please use a subclass with a method name set"
 
@@ -810,74 +1368,346 @@ class ReadIterator(six.Iterator):
 
         self._partial = False
         self._recursive = False
-        self.last = None
-        self.resp = None
-        self.index = -1
+        self._prefetch = ()
+        self._max_items = None
+        self._hydrate = False
+        self._incremental = False
 
         self.dynamo_kwargs_key = '_'.join([self.METHOD_NAME, 'kwargs'])
         if self.dynamo_kwargs_key not in self.kwargs:
             self.kwargs[self.dynamo_kwargs_key] = {}
         self.dynamo_kwargs = self.kwargs[self.dynamo_kwargs_key]
 
+        self._reset()
+
+    def _reset(self):
+        """Reset the state of the iteration, forgetting any results that were loaded"""
+        self.last = None
+        self.resp = None
+        self.items = None
+        self.index = -1
+        self._results = []
+        self._result_cache = None
+        self._returned = 0
+        self._page_size = None
+        self._matched_count = 0
+        self._scanned_count = 0
+
+    def _clone(self):
+        """Return a copy of this iterator, with its own copy of the read parameters and none of the results"""
+        clone = copy.copy(self)
+        clone.kwargs = dict(self.kwargs)
+        clone.dynamo_kwargs = clone.kwargs[self.dynamo_kwargs_key] = dict(self.dynamo_kwargs)
+        clone._reset()
+        return clone
+
     def __iter__(self):
-        """We're the iterator"""
+        """We're the iterator, unless all of the results have already been loaded"""
+        if self._result_cache is not None:
+            return iter(self._result_cache)
         return self
 
     def _get_resp(self):
         """Helper to get the response object from scan or query"""
         method = getattr(self.model.Table, self.METHOD_NAME)
-        return method(*self.args, **self.kwargs)
+
+        kwargs = self._read_kwargs()
+        if self._max_items is not None and kwargs[self.dynamo_kwargs_key].get('Select') != 'COUNT':
+            self._page_size = kwargs[self.dynamo_kwargs_key]['Limit'] = self._page_limit()
+
+        if not self._incremental:
+            return method(*self.args, **kwargs)
+
+        table = self.model.Table
+        with capture(table.table.meta.client, table.number_parser) as captured:
+            return captured.apply(method(*self.args, **kwargs))
+
+    def _read_kwargs(self):
+        """Return the kwargs for the table's read method
+
+        The table adds the key & filter expressions to the read kwargs, so it's given a copy to keep ours as they are.
+        """
+        kwargs = dict(self.kwargs)
+        kwargs[self.dynamo_kwargs_key] = dict(self.dynamo_kwargs)
+        return kwargs
 
     def __next__(self):
         """Called for each iteration of this object"""
+        if self._result_cache is not None:
+            raise StopIteration
+
+        if self._max_items is not None and self._returned >= self._max_items:
+            # We've produced as many items as were asked for, so the read resumes after the last one of them
+            if self.resp is not None and self.index + 1 < self.resp['Count']:
+                self.last = self._key_of(self.resp['Items'][self.index])
+            self._result_cache = self._results
+            raise StopIteration
+
         # If we don't have a resp object, go get it
         if self.resp is None:
+            # If a Limit is specified we must not operate in recursive mode
+            if self._recursive and 'Limit' in self.dynamo_kwargs and self._max_items is None:
+                log.warning(
+                    "%s was invoked with both a limit and the recursive flag set. "
+                    "The recursive flag will be ignored",
+                    self.__class__.__name__
+                )
+                self._recursive = False
+
             self.resp = self._get_resp()
 
             # Store the last key from query
             self.last = self.resp.get('LastEvaluatedKey', None)
 
-        # If a Limit is specified we must not operate in recursive mode
-        if 'Limit' in self.dynamo_kwargs:
-            log.warning(
-                "%s was invoked with both a limit and the recursive flag set. "
-                "The recursive flag will be ignored",
-                self.__class__.__name__
-            )
-            self._recursive = False
+            # Keep track of how selective the read is, to size the next page
+            self._matched_count += self.resp['Count']
+            self._scanned_count += self.resp.get('ScannedCount', self.resp['Count'])
+
+            # When hydrating or prefetching relationships we need to load the whole page up front
+            if self._hydrate and self._partial:
+                # the items of incremental reads can only be iterated over once
+                self.items = self._hydrate_page(list(self.resp['Items']))
+            elif self._prefetch:
+                self.items = [
+                    self.model.new_from_raw(raw, partial=self._partial)
+                    for raw in self.resp['Items']
+                ]
+            if self._prefetch:
+                self.model.prefetch(self.items, *self._prefetch)
 
         # Increment which record we're going to pull from the items
         self.index += 1
 
         if self.index == self.resp['Count']:
-            # If we have no more items them we're done as long as we're not in recursive mode
+            # If we have no more items them we're done as long as we're not in recursive mode (reading up to a maximum
+            # number of items is always recursive)
             # And if we are in recursive mode we're done if the resp didn't contain a last key
-            if not self._recursive or self.last is None:
+            recursive = self._recursive or self._max_items is not None
+            if not recursive or self.last is None:
+                self._result_cache = self._results
                 raise StopIteration
 
             # Our last marker is not None and we are in recursive mode
             # Reset our response state and re-call next
-            self.again()
+            self._next_page()
             return self.__next__()
 
-        # Grab the raw item from the response and return it as a new instance of our model
-        raw = self.resp['Items'][self.index]
-        return self.model.new_from_raw(raw, partial=self._partial)
+        if self.items is not None:
+            item = self.items[self.index]
+            if item is None:
+                # the item was deleted from the table after the index was read
+                return self.__next__()
+        else:
+            # Grab the raw item from the response and return it as a new instance of our model
+            item = self.model.new_from_raw(self.resp['Items'][self.index], partial=self._partial)
+
+        self._returned += 1
+        if self._keeps_results():
+            self._results.append(item)
+        return item
+
+    def _keeps_results(self):
+        """Return True if the results are kept as they are loaded
+
+        Only bounded reads (a single page, or up to a maximum number of items) keep their results, and incremental reads
+        never do.
+        """
+        return not self._incremental and (not self._recursive or self._max_items is not None)
+
+    def _page_limit(self):
+        """Return the ``Limit`` for the next page of a read with a maximum number of items
+
+        The first page is small, so that the first items arrive quickly.  After that the limit is the number of items
+        that are still needed divided by the fraction of items the filters have matched so far, growing by at most
+        ``PAGE_GROWTH`` times from one page to the next.
+        """
+        remaining = self._max_items - self._returned
+        if self._page_size is None:
+            return max(1, min(remaining, self.FIRST_PAGE_SIZE))
+
+        if self._matched_count:
+            wanted = int(math.ceil(remaining * float(self._scanned_count) / self._matched_count))
+        else:
+            wanted = self._page_size * self.PAGE_GROWTH
+        return max(1, min(wanted, self._page_size * self.PAGE_GROWTH))
+
+    def _hydrate_page(self, raw_items):
+        """Fetch the full items for a page of partial items from the table, returning them as instances in the same
+        order (with None for any that no longer exist)
+        """
+        table = self.model.Table
+        keys = [dict(zip(table.key_schema_names, table.key_values(raw))) for raw in raw_items]
+        chunks = [keys[start:start + BATCH_GET_LIMIT] for start in range(0, len(keys), BATCH_GET_LIMIT)]
+        consistent = self.dynamo_kwargs.get('ConsistentRead', False)
+
+        fetched = {}
+        for items in concurrent_map(lambda chunk: list(table.get_batch(chunk, consistent=consistent)), chunks,
+                                    table.max_workers):
+            fetched.update((table.key_values(item), item) for item in items)
+
+        return [self.model.new_from_raw(fetched.get(table.key_values(raw))) for raw in raw_items]
+
+    def _index_name(self):
+        """Return the name of the index this read uses, or None if it reads the table"""
+        return self.dynamo_kwargs.get('IndexName')
+
+    def _key_of(self, raw):
+        """Return the key of a raw item, suitable for use as an ``ExclusiveStartKey``"""
+        key_fields = [self.model.Table.hash_key, self.model.Table.range_key]
+        index_name = self._index_name()
+        if index_name:
+            index = self.model.Table.indexes[index_name]
+            key_fields.extend([index.hash_key, index.range_key])
+        return dict((field, raw[field]) for field in key_fields if field and field in raw)
+
+    def __getitem__(self, key):
+        """Return a single result, or a list of results for a slice
+
+        Slices read up to their stop value (see :meth:`max_items`), so only the items that are needed are read.  The
+        start of a slice can also be the ``last`` key of a previous read, which is used as the ``ExclusiveStartKey``:
+
+        .. code-block:: python
+
+            first_ten = Book.scan()[:10]
+            next_ten = Book.scan()[first_ten.last:10]
+
+        Negative indexes and steps are not supported.
+        """
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("Slices of a {0} do not support steps".format(self.__class__.__name__))
+
+            clone = self
+            start = key.start
+            if isinstance(start, dict):
+                clone = clone.start(start)
+                start = None
+            start = start or 0
+
+            if start < 0 or (key.stop is not None and key.stop < 0):
+                raise ValueError("Negative indexing is not supported")
+
+            if clone._complete():
+                return clone._result_cache[start:key.stop]
+
+            if key.stop is None:
+                return list(itertools.islice(clone.recursive(), start, None))
+
+            results = clone._take(key.stop)
+            return SliceResults(results[start:], last=results.last)
+
+        if not isinstance(key, six.integer_types):
+            raise TypeError("{0} indices must be integers or slices".format(self.__class__.__name__))
+        if key < 0:
+            raise ValueError("Negative indexing is not supported")
+
+        results = self[key:key + 1]
+        if not results:
+            raise IndexError("{0} index out of range".format(self.__class__.__name__))
+        return results[0]
+
+    def _complete(self):
+        """Return True if all of the results have been loaded and kept"""
+        if not self._keeps_results() or self._result_cache is None:
+            return False
+        return self.last is None and 'ExclusiveStartKey' not in self.dynamo_kwargs
+
+    def _take(self, count):
+        """Load up to ``count`` items, see :meth:`max_items`"""
+        clone = self.max_items(count)
+        return SliceResults(list(clone), last=clone.last)
+
+    def first(self):
+        """Return the first result, or None if there are no results
+
+        Only a single item is read from the table (unless a filter causes items to be skipped).
+        """
+        try:
+            return self[0]
+        except IndexError:
+            return None
+
+    def exists(self):
+        """Return True if there are any results
+
+        Only the keys of a single item are read from the table (unless a filter causes items to be skipped).
+        """
+        if self._complete():
+            return len(self._result_cache) > 0
+
+        key_fields = [self.model.Table.hash_key, self.model.Table.range_key]
+        index_name = self._index_name()
+        if index_name:
+            index = self.model.Table.indexes[index_name]
+            key_fields.extend([index.hash_key, index.range_key])
+
+        keys_only = self.specific_attributes(sorted(set(field for field in key_fields if field)))
+        keys_only._prefetch = ()
+        keys_only._hydrate = False
+        return len(keys_only._take(1)) > 0
 
     def limit(self, limit):
         """Set the limit value"""
-        self.dynamo_kwargs['Limit'] = limit
-        return self
+        clone = self._clone()
+        clone.dynamo_kwargs['Limit'] = limit
+        return clone
 
     def start(self, last):
         """Set the last value"""
-        self.dynamo_kwargs['ExclusiveStartKey'] = last
-        return self
+        clone = self._clone()
+        clone.dynamo_kwargs['ExclusiveStartKey'] = last
+        return clone
+
+    def cursor(self, secret=None):
+        """Return a cursor for the ``last`` key of this read, or None if there are no more results
+
+        See :mod:`dynamorm.cursors` for details.
+
+        :param secret: The secret to sign the cursor with, defaults to the ``cursor_secret`` of the table
+        """
+        if self.last is None:
+            return None
+        return encode_cursor(
+            self.last,
+            index_name=self._index_name(),
+            reverse=self.dynamo_kwargs.get('ScanIndexForward') is False,
+            secret=secret if secret is not None else self.model.Table.cursor_secret
+        )
+
+    def start_cursor(self, token, secret=None):
+        """Resume this read from a cursor returned by :meth:`cursor`
+
+        :param str token: The cursor
+        :param secret: The secret the cursor was signed with, defaults to the ``cursor_secret`` of the table
+        :raises InvalidCursor: If the cursor is not valid, or was not created from the same kind of read
+        """
+        cursor = decode_cursor(token, secret=secret if secret is not None else self.model.Table.cursor_secret)
+        self._check_cursor(cursor)
+        return self.start(cursor.last)
+
+    def _check_cursor(self, cursor):
+        """Raise InvalidCursor if the cursor was not created from the same kind of read as this one"""
+        if cursor.index_name != self._index_name():
+            raise InvalidCursor("The cursor was created for a different index")
+        if cursor.reverse != (self.dynamo_kwargs.get('ScanIndexForward') is False):
+            raise InvalidCursor("The cursor was created for a read in the other direction")
 
     def consistent(self):
         """Make this read a consistent one"""
-        self.dynamo_kwargs['ConsistentRead'] = True
-        return self
+        clone = self._clone()
+        clone.dynamo_kwargs['ConsistentRead'] = True
+        return clone
+
+    def filter(self, *args, **kwargs):
+        """Further refine the results with Q objects and/or keyword arguments, which are combined with the existing
+        ones using AND
+
+        The keyword arguments use the same syntax as :meth:`dynamorm.model.DynaModel.scan`.
+        """
+        clone = self._clone()
+        clone.args = self.args + args
+        clone.kwargs.update(kwargs)
+        return clone
 
     def specific_attributes(self, attrs):
         """Return only specific attributes in the documents through a ProjectionExpression
@@ -885,8 +1715,14 @@ class ReadIterator(six.Iterator):
         This is a list of attribute names. See the documentation for more info:
         https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Expressions.ProjectionExpressions.html
         """
-        if 'ExpressionAttributeNames' not in self.dynamo_kwargs:
-            self.dynamo_kwargs['ExpressionAttributeNames'] = {}
+        clone = self._clone()
+
+        # drop the names of any previous projection, since unused names are rejected
+        names = dict(
+            (name, value)
+            for name, value in six.iteritems(clone.dynamo_kwargs.get('ExpressionAttributeNames', {}))
+            if not name.startswith('#pe')
+        )
 
         pe = []
         for attri, attr in enumerate(attrs):
@@ -895,34 +1731,193 @@ class ReadIterator(six.Iterator):
                 # replace the attrs with expression attributes so we can use reserved names (like count)
                 # convert names like child.sub -> to #pe1_1.#pe1_2
                 pename = '#pe{}'.format('_'.join([str(attri), str(parti)]))
-                self.dynamo_kwargs['ExpressionAttributeNames'][pename] = part
+                names[pename] = part
                 name_parts.append(pename)
             pe.append('.'.join(name_parts))
 
-        self.dynamo_kwargs['ProjectionExpression'] = ', '.join(pe)
-        self._partial = True
-        return self
+        clone.dynamo_kwargs['ExpressionAttributeNames'] = names
+        clone.dynamo_kwargs['ProjectionExpression'] = ', '.join(pe)
+        clone._partial = True
+        return clone
+
+    def only(self, *attrs):
+        """Return only the named attributes, see :meth:`specific_attributes`"""
+        return self.specific_attributes(attrs)
+
+    def max_items(self, max_items):
+        """Stop reading once ``max_items`` items have been produced
+
+        Unlike ``limit``, which sets the number of items DynamoDB evaluates for a single page (before any filters are
+        applied), this follows ``LastEvaluatedKey`` until enough items have matched.  The ``Limit`` of each page is
+        chosen for you: the first page reads ``FIRST_PAGE_SIZE`` items, and later pages are sized based on how many
+        items are still needed and how many of the items read so far matched your filters.  Any ``limit`` you set is
+        ignored.
+
+        The ``last`` attribute is the key of the last item produced, so you can resume from there.
+        """
+        clone = self._clone()
+        clone._max_items = max_items
+        return clone
+
+    def hydrate(self):
+        """Load the full items from the table for reads that return partial items, such as those on indexes that use
+        ``ProjectKeys`` or ``ProjectInclude``
+
+        As each page of results is read the full items are fetched through batched gets (which are sent concurrently
+        for pages of more than 100 items), and the results keep the order of the index.  Items that have been deleted
+        from the table since the index was read are skipped.
+
+        Reads that already return full items are not affected.
+        """
+        clone = self._clone()
+        clone._hydrate = True
+        return clone
+
+    def incremental(self):
+        """Decode the items of each page one at a time as they are iterated over, rather than all at once when the page
+        is loaded, and don't keep the results
+
+        Once an incremental read is complete, iterating over it again returns nothing.  See :mod:`dynamorm.incremental`.
+        """
+        clone = self._clone()
+        clone._incremental = True
+        return clone
 
     def recursive(self):
         """Set the recursive value to True for this iterator"""
-        self._recursive = True
-        return self
+        clone = self._clone()
+        clone._recursive = True
+        return clone
+
+    def prefetch(self, *names):
+        """Load the named relationships for all of the items in each page of results as the page is loaded
+
+        See :meth:`dynamorm.model.DynaModel.prefetch` for details.
+        """
+        clone = self._clone()
+        clone._prefetch = self._prefetch + names
+        return clone
 
     def partial(self, partial):
         """Set the partial value for this iterator, which is used when creating new items from the response.
 
         This is used by indexes"""
-        self._partial = bool(partial)
-        return self
+        clone = self._clone()
+        clone._partial = bool(partial)
+        return clone
 
     def count(self):
         """Return the count matching the current read
 
-        This triggers a new request to the table when it is invoked.
+        This triggers new requests to the table when it is invoked, unless all of the results have been loaded.  See
+        :meth:`counts`.
+        """
+        if self._complete():
+            return len(self._result_cache)
+        return self.counts().count
+
+    def counts(self):
+        """Return a :class:`ReadCount` of the number of items matching the current read, and the number of items that
+        were read to find them (which is higher when a filter is used)
+
+        The requests use a ``Select`` of ``COUNT``, so no items are returned, and ``LastEvaluatedKey`` is followed until
+        the whole read has been counted.  If a limit has been set only the first page is counted, just like when
+        iterating.
         """
+        return self._clone()._count_pages()
+
+    def _count_pages(self):
+        """Count the pages of this read, from its start until it is exhausted"""
         self.dynamo_kwargs['Select'] = 'COUNT'
-        resp = self._get_resp()
-        return resp['Count']
+        count = scanned_count = 0
+        while True:
+            resp = self._get_resp()
+            count += resp['Count']
+            scanned_count += resp.get('ScannedCount', resp['Count'])
+
+            last = resp.get('LastEvaluatedKey', None)
+            if last is None or 'Limit' in self.dynamo_kwargs:
+                return ReadCount(count, scanned_count)
+            self.dynamo_kwargs['ExclusiveStartKey'] = last
+
+    def aggregate(self, by=None, **aggregates):
+        """Return aggregates of the items matching the current read, computed in a single pass without creating
+        instances
+
+        Only the attributes needed by the aggregates are requested, and ``LastEvaluatedKey`` is followed until the whole
+        read has been aggregated (if a limit has been set only the first page is, just like when iterating).  See
+        :mod:`dynamorm.aggregates`.
+
+        :param by: The name of the attribute to group the items by, or a list of names
+        :param \*\*aggregates: The :class:`~dynamorm.aggregates.Aggregate` objects, by the names of their results
+        :returns: A dict of the results by name, or when grouping a dict of those by group
+        """
+        aggregation = Aggregation(by, aggregates)
+        return self._aggregation_read(aggregation)._aggregate_pages(aggregation).results()
+
+    def _aggregation_read(self, aggregation):
+        """Return a copy of this read that requests only the attributes needed by an aggregation"""
+        return self.specific_attributes(aggregation.attributes or [self.model.Table.hash_key])
+
+    def _aggregate_pages(self, aggregation):
+        """Aggregate the pages of this read, from its start until it is exhausted"""
+        for items in self._raw_pages():
+            aggregation.add(items)
+        return aggregation
+
+    def to_columns(self, *attrs):
+        """Return the items matching the current read as a dict of columns, by attribute name, without creating
+        instances
+
+        Numbers are held in ``array.array`` objects and everything else in lists.  ``LastEvaluatedKey`` is followed
+        until the whole read has been loaded (if a limit has been set only the first page is, just like when iterating).
+        See :mod:`dynamorm.columns`.
+
+        :param \*attrs: The names of the attributes to return, by default all of the fields of the schema
+        """
+        return self._build_columns(attrs).to_python()
+
+    def to_numpy(self, *attrs):
+        """Return the items matching the current read as a dict of numpy arrays, by attribute name; see
+        :meth:`to_columns`
+        """
+        return self._build_columns(attrs).to_numpy()
+
+    def to_arrow(self, *attrs):
+        """Return the items matching the current read as a ``pyarrow.Table``; see :meth:`to_columns`"""
+        return self._build_columns(attrs).to_arrow()
+
+    def _build_columns(self, attrs):
+        """Read the pages of this read into the columns of the named attributes"""
+        if attrs:
+            read = self.specific_attributes(attrs)
+        else:
+            read = self._clone()
+            attrs = list(self.model.Schema.dynamorm_fields())
+
+        builder = ColumnBuilder(self.model.Schema, attrs)
+        for items in read._raw_pages():
+            builder.add(items)
+        return builder
+
+    def _raw_pages(self):
+        """Yield the raw items of each page of this read, from its start until it is exhausted"""
+        while True:
+            resp = self._get_resp()
+            yield resp['Items']
+
+            last = resp.get('LastEvaluatedKey', None)
+            if last is None or 'Limit' in self.dynamo_kwargs:
+                return
+            self.dynamo_kwargs['ExclusiveStartKey'] = last
+
+    def _next_page(self):
+        """Reset the response state so that the next page of results is loaded, resuming from the last key"""
+        self.resp = None
+        self.items = None
+        self.index = -1
+        if self.last:
+            self.dynamo_kwargs['ExclusiveStartKey'] = self.last
 
     def again(self):
         """Call this to reset the iterator so that you can iterate over it again.
@@ -930,21 +1925,238 @@ class ReadIterator(six.Iterator):
         If the previous invocation has a LastEvaluatedKey then this will resume from the next item.  Otherwise it will
         re-do the previous invocation.
         """
-        self.resp = None
-        self.index = -1
-        if self.last:
-            return self.start(self.last)
+        self._next_page()
+        self._results = []
+        self._result_cache = None
+        self._returned = 0
         return self
 
 
+class SliceResults(list):
+    """The list of results from slicing a query or scan
+
+    The ``last`` attribute holds the ``LastEvaluatedKey`` of the final request, so that you can continue from the end
+    of the slice.
+    """
+    def __init__(self, items, last=None):
+        super(SliceResults, self).__init__(items)
+        self.last = last
+
+
+ReadCount = collections.namedtuple('ReadCount', ['count', 'scanned_count'])
+
+
 class ScanIterator(ReadIterator):
     METHOD_NAME = 'scan'
 
+    def count(self, segments=None):
+        """Return the count matching the current scan
+
+        :param int segments: If set the table is split into this many segments that are counted in parallel, see
+                             :meth:`counts`
+        """
+        if self._complete():
+            return len(self._result_cache)
+        return self.counts(segments=segments).count
+
+    def counts(self, segments=None):
+        """Return a :class:`ReadCount` of the number of items matching the current scan, and the number of items that
+        were scanned to find them
+
+        :param int segments: If set the table is split into this many segments (using ``Segment`` &
+                             ``TotalSegments``), which are counted in parallel by up to ``max_workers`` threads (see
+                             the table attributes) and then added together
+        """
+        if not segments or segments < 2:
+            return super(ScanIterator, self).counts()
+
+        def count_segment(segment):
+            clone = self._clone()
+            clone.dynamo_kwargs['Segment'] = segment
+            clone.dynamo_kwargs['TotalSegments'] = segments
+            return clone._count_pages()
+
+        results = concurrent_map(count_segment, range(segments), self.model.Table.max_workers)
+        return ReadCount(
+            sum(result.count for result in results),
+            sum(result.scanned_count for result in results)
+        )
+
+    def aggregate(self, by=None, segments=None, **aggregates):
+        """Return aggregates of the items matching the current scan, see :meth:`ReadIterator.aggregate`
+
+        :param int segments: If set the table is split into this many segments, which are aggregated in parallel by up
+                             to ``max_workers`` threads (see the table attributes) and then merged together
+        """
+        if not segments or segments < 2:
+            return super(ScanIterator, self).aggregate(by=by, **aggregates)
+
+        def aggregate_segment(segment):
+            aggregation = Aggregation(by, aggregates)
+            read = self._aggregation_read(aggregation)
+            read.dynamo_kwargs['Segment'] = segment
+            read.dynamo_kwargs['TotalSegments'] = segments
+            return read._aggregate_pages(aggregation)
+
+        aggregations = concurrent_map(aggregate_segment, range(segments), self.model.Table.max_workers)
+        for aggregation in aggregations[1:]:
+            aggregations[0].merge(aggregation)
+        return aggregations[0].results()
+
+    def map_reduce(self, map_fn, reduce_fn, initial=None, processes=None, segments=None):
+        """Map every instance of the scan through ``map_fn`` and combine the results with ``reduce_fn``, in worker
+        processes so that CPU heavy work isn't limited by the GIL
+
+        The table is split into ``segments``, each of which is scanned by a worker process (with its own boto3 session)
+        that creates the instances, maps them & reduces their results.  The results of the segments are then reduced in
+        this process, so ``reduce_fn`` must be associative.
+
+        .. code-block:: python
+
+            def score(book):
+                return len(book.text.split())
+
+            longest = Book.scan(genre='fiction').map_reduce(score, max, processes=8)
+
+        The functions and their results are sent between processes, so they must be picklable, as must the model (by
+        being defined at the top level of a module).  If the model or functions can't be pickled, or ``processes`` is 0,
+        the segments are scanned by ``max_workers`` threads instead (see the table attributes).
+
+        :param map_fn: A function that is called with each instance, and returns a value
+        :param reduce_fn: A function that combines two values into one
+        :param initial: The value that the results are combined with first, which is returned if the scan is empty
+        :param int processes: The number of worker processes, defaults to the number of CPUs
+        :param int segments: The number of segments to scan the table in, defaults to the number of processes
+        """
+        processes = process_count(processes)
+        segments = segments or processes or self.model.Table.max_workers
+
+        reads = []
+        for segment in range(segments):
+            read = self._clone().recursive()
+            read.dynamo_kwargs['Segment'] = segment
+            read.dynamo_kwargs['TotalSegments'] = segments
+            reads.append(read)
+
+        result, started = initial, initial is not None
+        for found, value in map_reduce(reads, map_fn, reduce_fn, processes, self.model.Table.max_workers):
+            if found:
+                result = reduce_fn(result, value) if started else value
+                started = True
+        return result
+
+
+class GetKeysIterator(ReadIterator):
+    """Reads items by their primary keys through batched gets, for queries & scans that fully specify the keys of the
+    items they want with equality & ``in`` conditions, and pass ``get_keys=True``
+
+    It supports the chained methods of every read (``filter``, ``only``, ``limit``, ``max_items``, slicing, ``count``,
+    cursors, etc), but not those that are specific to queries or scans, such as ``reverse``, ``explain``, ``split`` or
+    segments.  The start key of a page must be one of the keys being read.  See
+    :meth:`dynamorm.table.DynamoTable3.get_keys`.
+    """
+    METHOD_NAME = 'get_keys'
+
 
 class QueryIterator(ReadIterator):
     METHOD_NAME = 'query'
 
+    def split(self, segments, ordered=False, sampler=uniform_boundaries):
+        """Split this query into ``segments`` queries over sub-ranges of its range key, and run them concurrently
+
+        The query must have a ``between`` condition on its range key (of the table, or of the index the query runs on)
+        and the sampler chooses the boundaries of the sub-ranges within it.  It is called as ``sampler(low, high,
+        segments)`` and returns the sorted boundaries, including ``low`` & ``high``.  The default sampler splits the
+        interval into equal widths, which suits numbers & timestamps that are evenly spread.
+
+        The queries are run on up to ``max_workers`` threads (see the table attributes), each reading all of its pages.
+        The results are returned as a generator, which yields them as soon as they arrive unless ``ordered`` is True, in
+        which case they are yielded in the order of the query (i.e. the sub-ranges are concatenated).
+
+        .. code-block:: python
+
+            readings = Reading.query(sensor=sensor_id, ts__between=[start, end]).split(8)
+
+        :param int segments: The number of sub-ranges to query
+        :param bool ordered: If True the results are yielded in order of the range key
+        :param sampler: A function that returns the boundaries of the sub-ranges
+        """
+        index_name = self._index_name()
+        range_key = (self.model.Table.indexes[index_name] if index_name else self.model.Table).range_key
+        between = '__'.join([str(range_key), 'between'])
+        if between not in self.kwargs:
+            raise InvalidKey("Splitting a query requires a between condition on the range key '{0}'".format(range_key))
+
+        low, high = self.kwargs[between]
+        try:
+            boundaries = sampler(low, high, segments)
+        except TypeError:
+            raise InvalidKey("The sampler can't split the range from {0!r} to {1!r}".format(low, high))
+
+        ranges = list(zip(boundaries, boundaries[1:])) or [(low, high)]
+        if self.dynamo_kwargs.get('ScanIndexForward') is False:
+            ranges.reverse()
+
+        def read_range(bounds):
+            start, end = bounds
+            clone = self.recursive()
+            clone.kwargs[between] = [start, end]
+            for item in clone:
+                # between is inclusive, so items on the boundary are left to the sub-range that starts with them
+                if end != high and getattr(item, range_key) == end:
+                    continue
+                yield item
+
+        return concurrent_chain(
+            [read_range(bounds) for bounds in ranges],
+            self.model.Table.max_workers,
+            ordered=ordered
+        )
+
+    def _reset(self):
+        super(QueryIterator, self)._reset()
+        self._plan = None
+
+    def explain(self):
+        """Return the :class:`QueryPlan` describing the table or index this query will read, and how
+
+        The plan is chosen once for each iterator, and used for every page that it reads.
+        """
+        if self._plan is None:
+            self._plan = self.model.Table.plan_query(*self.args, **self.kwargs)
+        return self._plan
+
+    def _read_kwargs(self):
+        """Queries pass their plan to the table, so that it isn't chosen again for each page"""
+        kwargs = super(QueryIterator, self)._read_kwargs()
+        if 'IndexName' not in self.dynamo_kwargs:
+            kwargs['plan'] = self.explain()
+        return kwargs
+
+    def _index_name(self):
+        return self.dynamo_kwargs.get('IndexName') or self.explain().index_name
+
+    def _get_resp(self):
+        """Queries that don't name an index have one chosen for them by the table, which may return partial results"""
+        if 'IndexName' not in self.dynamo_kwargs and self.explain().partial:
+            self._partial = True
+        return super(QueryIterator, self)._get_resp()
+
     def reverse(self):
         """Return results from the query in reverse"""
-        self.dynamo_kwargs['ScanIndexForward'] = False
-        return self
+        clone = self._clone()
+        clone.dynamo_kwargs['ScanIndexForward'] = False
+        return clone
+
+    def _check_cursor(self, cursor):
+        """Queries also require that the cursor is from the same partition"""
+        super(QueryIterator, self)._check_cursor(cursor)
+
+        if cursor.index_name:
+            hash_key = self.model.Table.indexes[cursor.index_name].hash_key
+        else:
+            hash_key = self.model.Table.hash_key
+
+        for name in (hash_key, '__'.join([hash_key, 'eq'])):
+            if name in self.kwargs and cursor.last.get(hash_key) != self.kwargs[name]:
+                raise InvalidCursor("The cursor was created for a different partition")
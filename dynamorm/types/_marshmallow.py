@@ -19,6 +19,28 @@ class Schema(MarshmallowSchema, DynamORMSchema):
             return 'N'
         return 'S'
 
+    @staticmethod
+    def field_to_column_type(field):
+        """Given a marshmallow field object return the type of column that holds its values"""
+        if isinstance(field, fields.Integer):
+            return 'int'
+        if isinstance(field, fields.Number):
+            return 'float'
+        if isinstance(field, fields.Boolean):
+            return 'bool'
+        if isinstance(field, fields.String):
+            return 'str'
+        return None
+
+    @staticmethod
+    def field_to_number_parser(field):
+        """Given a marshmallow field object return the function that parses its numbers"""
+        if isinstance(field, fields.Integer):
+            return int
+        if isinstance(field, fields.Number) and not isinstance(field, fields.Decimal):
+            return float
+        return None
+
     @classmethod
     def dynamorm_fields(cls):
         return cls().fields
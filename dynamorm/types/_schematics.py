@@ -17,6 +17,28 @@ class Schema(SchematicsModel, DynamORMSchema):
             return 'N'
         return 'S'
 
+    @staticmethod
+    def field_to_column_type(field):
+        """Given a schematics field object return the type of column that holds its values"""
+        if isinstance(field, types.IntType):
+            return 'int'
+        if isinstance(field, types.NumberType):
+            return 'float'
+        if isinstance(field, types.BooleanType):
+            return 'bool'
+        if isinstance(field, types.StringType):
+            return 'str'
+        return None
+
+    @staticmethod
+    def field_to_number_parser(field):
+        """Given a schematics field object return the function that parses its numbers"""
+        if isinstance(field, types.IntType):
+            return int
+        if isinstance(field, types.FloatType):
+            return float
+        return None
+
     @classmethod
     def dynamorm_fields(cls):
         return cls.fields
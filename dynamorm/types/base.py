@@ -10,6 +10,20 @@ class DynamORMSchema(object):
         """Returns the dynamo type character given the field."""
         raise NotImplementedError('Child class must implement field_to_dynamo_type')
 
+    @staticmethod
+    def field_to_column_type(field):
+        """Returns the type of column (``int``, ``float``, ``bool`` or ``str``) that holds the values of the field, or
+        None if the values are kept as they are.  See :mod:`dynamorm.columns`.
+        """
+        return None
+
+    @staticmethod
+    def field_to_number_parser(field):
+        """Returns the function (``int`` or ``float``) that parses the numbers of the field, or None if they are read as
+        ``Decimal`` objects.  See :mod:`dynamorm.numbers`.
+        """
+        return None
+
     @classmethod
     def dynamorm_fields(cls):
         """Returns a dictionary of key value pairs where keys are attributes and values are type classes"""
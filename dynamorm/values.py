@@ -0,0 +1,60 @@
+"""Conversions of the raw values read from DynamoDB into plain values, for the files written by :mod:`dynamorm.bulk`
+and the columns built by :mod:`dynamorm.columns`."""
+
+import base64
+import decimal
+import json
+
+import six
+
+from boto3.dynamodb.types import Binary
+
+
+def plain(value):
+    """Convert a value read from DynamoDB into one that can be encoded as JSON
+
+    Integral numbers become ints (others stay Decimals, see :func:`dumps`), sets become sorted lists and binary values
+    become base64 strings.
+    """
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else value
+    if isinstance(value, Binary):
+        value = value.value
+    if isinstance(value, (six.binary_type, bytearray)):
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if isinstance(value, dict):
+        return dict((key, plain(val)) for key, val in six.iteritems(value))
+    if isinstance(value, (set, frozenset)):
+        return sorted(plain(val) for val in value)
+    if isinstance(value, (list, tuple)):
+        return [plain(val) for val in value]
+    return value
+
+
+def dumps(value):
+    """Encode a plain value as compact JSON with sorted keys, writing Decimals as exact numbers"""
+    try:
+        return json.dumps(value, sort_keys=True, separators=(',', ':'))
+    except TypeError:
+        pass
+
+    # json can't encode Decimals, which are only kept for numbers with a fractional part
+    if isinstance(value, decimal.Decimal):
+        return six.text_type(value)
+    if isinstance(value, dict):
+        return u'{' + u','.join(json.dumps(key) + u':' + dumps(value[key]) for key in sorted(value)) + u'}'
+    if isinstance(value, list):
+        return u'[' + u','.join(dumps(member) for member in value) + u']'
+    raise TypeError("{0!r} can't be encoded as JSON".format(value))
+
+
+def arrow_value(value):
+    """Convert a value read from DynamoDB into one for an Arrow column whose type is inferred from its values; numbers
+    are doubles and lists, maps & sets are JSON strings"""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, Binary):
+        return bytes(value.value)
+    if isinstance(value, (dict, list, set, frozenset)):
+        return dumps(plain(value))
+    return value
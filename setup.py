@@ -5,7 +5,7 @@ with open('README.rst', 'r') as readme_fd:
 
 setup(
     name='dynamorm',
-    version='0.9.4',
+    version='0.10.0',
     description='DynamORM is a Python object & relation mapping library for Amazon\'s DynamoDB service.',
     long_description=long_description,
     author='Evan Borgstrom',
@@ -15,11 +15,15 @@ setup(
     install_requires=[
         'blinker>=1.4,<2.0',
         'boto3>=1.3,<2.0',
-        'six',
+        'futures>=3.0,<4.0;python_version<"3.0"',
+        'six>=1.13',
     ],
     extras_require={
         'marshmallow': ['marshmallow>=2.15.1,<3'],
         'schematics': ['schematics>=2.0.1,<3'],
+        'parquet': ['pyarrow'],
+        'arrow': ['pyarrow'],
+        'numpy': ['numpy'],
     },
     packages=['dynamorm', 'dynamorm.types'],
     classifiers=[
@@ -12,6 +12,41 @@ from dynamorm.table import DynamoTable3
 log = logging.getLogger(__name__)
 
 
+def wait_until(condition, timeout=5):
+    """Wait for a condition that other threads make true, failing rather than hanging if it never is"""
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "Timed out waiting for the other threads"
+        time.sleep(0.001)
+
+
+if os.environ.get('SERIALIZATION_PKG', '').startswith('marshmallow'):
+    from marshmallow.fields import String, Integer as Number
+else:
+    from schematics.types import StringType as String, IntType as Number
+
+
+class Gadget(DynaModel):
+    """A model defined at the top level of a module, so that it can be used in other processes (see
+    :mod:`dynamorm.processes`)"""
+    class Table:
+        name = 'gadgets'
+        hash_key = 'id'
+        read = 5
+        write = 5
+
+    class Schema:
+        id = String(required=True)
+        name = String()
+        size = Number()
+
+
+@pytest.fixture
+def Gadget_table(dynamo_local, request):
+    Gadget.Table.create_table()
+    request.addfinalizer(Gadget.Table.delete)
+
+
 @pytest.fixture(scope='session', autouse=True)
 def setup_logging():
     logging.basicConfig(level=logging.INFO)
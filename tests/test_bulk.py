@@ -0,0 +1,215 @@
+import csv
+import json
+import os
+
+from decimal import Decimal
+
+import pytest
+
+from dynamorm.bulk import EXPORT_CHECKPOINTS, ExportProgress, ImportResult
+from dynamorm.model import DynaModel
+
+from .conftest import Gadget
+
+if os.environ.get('SERIALIZATION_PKG', '').startswith('marshmallow'):
+    from marshmallow.fields import Decimal as DecimalNumber, String, Integer as Number
+else:
+    from schematics.types import DecimalType as DecimalNumber, StringType as String, IntType as Number
+
+
+def read_ndjson(path):
+    items = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith('.ndjson'):
+            with open(os.path.join(path, name)) as lines:
+                items.extend(json.loads(line) for line in lines)
+    return sorted(items, key=lambda item: item['bar'])
+
+
+def test_export_ndjson(TestModel, TestModel_entries, dynamo_local, tmpdir):
+    path = str(tmpdir.join('export'))
+    reports = []
+
+    progress = TestModel.export(path, segments=2, progress=reports.append)
+    assert isinstance(progress, ExportProgress)
+    assert (progress.items, progress.segments_done, progress.segments) == (3, 2, 2)
+    assert reports[-1].items == 3
+    assert sorted(name for name in os.listdir(path) if name != EXPORT_CHECKPOINTS) == [
+        'peanut-butter-00000.ndjson', 'peanut-butter-00001.ndjson'
+    ]
+
+    items = read_ndjson(path)
+    assert [item['count'] for item in items] == [111, 333, 222]
+    assert items[0] == {'foo': 'first', 'bar': 'one', 'baz': 'bbq', 'count': 111, 'child': {'sub': 'one'}}
+
+    # exporting again resumes the finished export, so nothing is scanned
+    assert TestModel.export(path, segments=2).items == 0
+    assert len(read_ndjson(path)) == 3
+
+    with pytest.raises(ValueError):
+        TestModel.export(path, segments=3)
+
+    assert TestModel.export(path, segments=3, resume=False).items == 3
+    assert len(read_ndjson(path)) == 3
+
+
+def test_export_resume(TestModel, TestModel_entries_xlarge, dynamo_local, tmpdir, mocker):
+    path = str(tmpdir.join('export'))
+    scan = TestModel.Table.scan
+
+    def failing_scan(*args, **kwargs):
+        if 'ExclusiveStartKey' in kwargs['scan_kwargs']:
+            raise RuntimeError('boom')
+        return scan(*args, **kwargs)
+
+    # the first page of the segment is written before the export fails
+    mocker.patch.object(TestModel.Table.__class__, 'scan', side_effect=failing_scan)
+    with pytest.raises(RuntimeError):
+        TestModel.export(path, segments=1)
+    with open(os.path.join(path, 'peanut-butter-00000.ndjson')) as lines:
+        written = len(lines.readlines())
+    assert 0 < written < 4000
+
+    mocker.stopall()
+    assert TestModel.export(path, segments=1).items == 4000 - written
+    with open(os.path.join(path, 'peanut-butter-00000.ndjson')) as lines:
+        foos = [json.loads(line)['foo'] for line in lines]
+    assert sorted(foos) == sorted(str(i) for i in range(4000))
+
+
+def test_export_csv(TestModel, TestModel_entries, dynamo_local, tmpdir):
+    path = str(tmpdir.join('export'))
+    TestModel.export(path, format='csv', segments=1)
+
+    with open(os.path.join(path, 'peanut-butter-00000.csv')) as rows:
+        reader = csv.DictReader(rows)
+        assert reader.fieldnames[:2] == ['foo', 'bar']
+        rows = sorted(reader, key=lambda row: row['bar'])
+
+    assert rows[0]['count'] == '111'
+    assert rows[0]['baz'] == 'bbq'
+    assert json.loads(rows[0]['child']) == {'sub': 'one'}
+    assert rows[0]['when'] == ''
+
+
+def test_export_parquet(TestModel, TestModel_entries, dynamo_local, tmpdir):
+    parquet = pytest.importorskip('pyarrow.parquet')
+
+    path = str(tmpdir.join('export'))
+    TestModel.export(path, format='parquet', segments=1, row_group_size=2)
+
+    table = parquet.read_table(os.path.join(path, 'peanut-butter-00000.parquet'))
+    assert sorted(table.column('count').to_pylist()) == [111, 222, 333]
+    assert str(table.schema.field('count').type) == 'int64'
+
+
+@pytest.fixture
+def Reading(dynamo_local, request):
+    class Reading(DynaModel):
+        class Table:
+            name = 'readings'
+            hash_key = 'id'
+            read = 5
+            write = 5
+
+        class Schema:
+            id = String(required=True)
+            label = String()
+            count = Number()
+            value = DecimalNumber()
+
+    Reading.Table.create_table()
+    request.addfinalizer(Reading.Table.delete)
+
+    Reading.put({'id': 'a', 'label': '[draft]'})
+    Reading.put({'id': 'b', 'label': '{x', 'count': 2 ** 60 + 1, 'value': Decimal('3.14159265358979323846264338')})
+    return Reading
+
+
+def test_export_exact(Reading, tmpdir):
+    path = str(tmpdir.join('export'))
+    Reading.export(path, segments=1)
+    with open(os.path.join(path, 'readings-00000.ndjson')) as lines:
+        items = sorted((json.loads(line, parse_float=Decimal) for line in lines), key=lambda item: item['id'])
+    assert items[1]['count'] == 2 ** 60 + 1
+    assert Decimal(items[1]['value']) == Decimal('3.14159265358979323846264338')
+
+    # strings of string fields that look like JSON are read back as they were written
+    path = str(tmpdir.join('csv'))
+    Reading.export(path, format='csv', segments=1)
+    for reading in Reading.scan():
+        reading.delete()
+    result = Reading.import_file(os.path.join(path, 'readings-00000.csv'), processes=0)
+    assert (result.imported, result.rejected) == (2, 0)
+    assert Reading.get(id='a').label == '[draft]'
+    b = Reading.get(id='b')
+    assert (b.label, b.count, b.value) == ('{x', 2 ** 60 + 1, Decimal('3.14159265358979323846264338'))
+
+
+def test_export_parquet_schema(Reading, tmpdir):
+    parquet = pytest.importorskip('pyarrow.parquet')
+
+    # the first row group has no counts, but the schema comes from the fields so the later ones can have them
+    path = str(tmpdir.join('export'))
+    Reading.export(path, format='parquet', segments=1, row_group_size=1)
+    table = parquet.read_table(os.path.join(path, 'readings-00000.parquet'))
+    rows = sorted(table.to_pylist(), key=lambda row: row['id'])
+    assert [row['count'] for row in rows] == [None, 2 ** 60 + 1]
+    assert Decimal(rows[1]['value']) == Decimal('3.14159265358979323846264338')
+    assert [str(table.schema.field(name).type) for name in ('count', 'label', 'value')] == ['int64', 'string', 'string']
+
+
+def test_import_ndjson(Gadget_table, tmpdir):
+    path = tmpdir.join('gadgets.ndjson')
+    path.write('\n'.join([
+        '{"id": "one", "name": "One", "size": 1}',
+        '{"id": "two", "size": "big"}',
+        'not json',
+        '',
+        '{"name": "no id"}',
+        '{"id": "three", "size": 3}',
+    ]) + '\n')
+
+    result = Gadget.import_file(str(path), chunk_size=2, processes=2)
+    assert isinstance(result, ImportResult)
+    assert (result.imported, result.rejected) == (2, 3)
+    assert result.offset == path.size()
+    assert sorted((gadget.id, gadget.size) for gadget in Gadget.scan()) == [('one', 1), ('three', 3)]
+
+    rejects = [json.loads(line) for line in tmpdir.join('gadgets.ndjson.rejects.ndjson').readlines()]
+    assert [reject['line'] for reject in rejects] == [2, 3, 5]
+    assert list(rejects[0]['errors']) == ['size']
+    assert rejects[1]['record'] == 'not json'
+    assert list(rejects[2]['errors']) == ['id']
+
+    # importing again resumes after the records that were already imported
+    assert Gadget.import_file(str(path)).imported == 0
+    path.write('{"id": "four", "size": 4}\n', mode='a')
+    result = Gadget.import_file(str(path), processes=0)
+    assert (result.imported, result.rejected) == (1, 0)
+    assert Gadget.get(id='four').size == 4
+    assert len(tmpdir.join('gadgets.ndjson.rejects.ndjson').readlines()) == 3
+
+
+def test_import_csv(TestModel, TestModel_entries, dynamo_local, tmpdir):
+    path = str(tmpdir.join('export'))
+    TestModel.export(path, format='csv', segments=1)
+    for item in TestModel.scan():
+        item.delete()
+
+    # the model is defined in a fixture, so it can't be pickled and is validated in threads
+    result = TestModel.import_file(os.path.join(path, 'peanut-butter-00000.csv'))
+    assert (result.imported, result.rejected) == (3, 0)
+
+    first = TestModel.get(foo='first', bar='one')
+    assert (first.baz, first.count, first.child) == ('bbq', 111, {'sub': 'one'})
+
+
+def test_import_csv_multiline(Gadget_table, tmpdir):
+    path = tmpdir.join('gadgets.csv')
+    path.write('id,name,size\none,"first\nline ""quoted""",1\ntwo,,2\n')
+
+    result = Gadget.import_file(str(path), processes=0)
+    assert (result.imported, result.rejected) == (2, 0)
+    assert Gadget.get(id='one').name == 'first\nline "quoted"'
+    assert Gadget.get(id='two').size == 2
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from decimal import Decimal
+
+import pytest
+
+from dynamorm import Q
+from dynamorm.concurrency import SingleFlight, concurrent_chain, freeze
+
+from .conftest import wait_until
+
+
+def test_single_flight_shares_in_flight_calls():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_get():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'foo': 'bar'}
+
+    results = []
+
+    def worker():
+        results.append(single_flight.do('key', slow_get))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    assert started.wait(5)
+
+    followers = [threading.Thread(target=worker) for _ in range(4)]
+    for follower in followers:
+        follower.start()
+
+    # wait until all of the followers are waiting on the leader before releasing it
+    wait_until(lambda: single_flight.saved == 4)
+    release.set()
+
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert single_flight.saved == 4
+    assert results == [{'foo': 'bar'}] * 5
+
+    # followers get their own copy of the result
+    assert len(set(id(result) for result in results)) == 5
+
+    # once the call is complete the key is forgotten
+    single_flight.do('key', slow_get)
+    assert len(calls) == 2
+
+
+def test_single_flight_exceptions():
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ValueError('nope')
+
+    with pytest.raises(ValueError):
+        single_flight.do('key', fail)
+
+    assert single_flight.calls == {}
+
+
+def test_freeze():
+    assert freeze({'b': [1, 2], 'a': {'c': set([3])}}) == freeze({'a': {'c': set([3])}, 'b': [1, 2]})
+    assert hash(freeze({'KeyConditionExpression': Q(foo='bar')}))
+    assert freeze(Q(foo='bar')) == freeze(Q(foo='bar'))
+    assert freeze(Q(foo='bar')) != freeze(Q(foo='baz'))
+    assert freeze(Q(foo='bar')) != freeze(Q(foo__ne='bar'))
+
+    # values that compare as equal but are sent differently are kept apart
+    assert freeze({'a': 1}) != freeze([('a', 1)])
+    assert freeze(1) != freeze(True)
+    assert freeze(1) != freeze(Decimal(1))
+    assert freeze([1]) != freeze((1,))
+
+
+def test_concurrent_chain():
+    iterables = [range(0, 3), range(3, 5), [], range(5, 10)]
+    assert list(concurrent_chain(iterables, 4)) == list(range(10))
+    assert sorted(concurrent_chain(iterables, 2, ordered=False)) == list(range(10))
+
+    def fail():
+        yield 1
+        raise ValueError('nope')
+
+    results = concurrent_chain([range(3), fail()], 2)
+    assert [next(results) for _ in range(4)] == [0, 1, 2, 1]
+    with pytest.raises(ValueError):
+        next(results)
+
+
+def test_concurrent_chain_buffers():
+    produced = [0, 0]
+
+    def count(position, items):
+        for item in items:
+            produced[position] += 1
+            yield item
+
+    # while the first iterable is read the second one only gets as far as its buffer allows
+    results = concurrent_chain([count(0, range(0, 5)), count(1, range(5, 100))], 2, buffer_size=2)
+    assert next(results) == 0
+    wait_until(lambda: produced[1] == 3)
+    time.sleep(0.2)
+    assert produced[1] == 3
+
+    assert list(results) == list(range(1, 100))
+    assert produced == [5, 95]
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import Binary
+
+from dynamorm.conditions import attribute_type, evaluate
+from dynamorm.table import Q
+
+ITEM = {
+    'name': 'alpha',
+    'count': Decimal(3),
+    'tags': set(['a', 'b']),
+    'data': Binary(b'\x00\x01'),
+    'address': {'state': 'CA', 'lines': ['1 Main St', 'Apt 2']},
+    'active': True,
+    'nothing': None,
+}
+
+
+@pytest.mark.parametrize('condition, expected', [
+    (Q(name='alpha'), True),
+    (Q(name__ne='alpha'), False),
+    (Q(missing__ne='alpha'), True),
+    (Q(missing='alpha'), False),
+    (Q(count__gt=2), True),
+    (Q(count__lte=2), False),
+    (Q(count__gt='2'), False),
+    (Q(count__between=[1, 3]), True),
+    (Q(count__in=[1, 2]), False),
+    (Q(name__begins_with='al'), True),
+    (Q(name__contains='ph'), True),
+    (Q(tags__contains='b'), True),
+    (Q(address__state='CA'), True),
+    (Attr('address.lines[1]').eq('Apt 2'), True),
+    (Attr('address.lines[2]').exists(), False),
+    (Q(missing__not_exists=True), True),
+    (Q(nothing__exists=True), True),
+    (Attr('tags').size().eq(2), True),
+    (Attr('data').size().gt(2), False),
+    (Q(count__gt=10) | Q(name__begins_with='a'), True),
+    (Q(count__gt=10) & Q(name__begins_with='a'), False),
+    (~Q(count__gt=10), True),
+])
+def test_evaluate(condition, expected):
+    assert evaluate(condition, ITEM) is expected
+
+
+def test_attribute_type():
+    assert [attribute_type(ITEM[name]) for name in ('name', 'count', 'tags', 'data', 'address', 'active', 'nothing')] \
+        == ['S', 'N', 'SS', 'B', 'M', 'BOOL', 'NULL']
+    assert attribute_type(ITEM['address']['lines']) == 'L'
+    assert evaluate(Attr('count').attribute_type('N'), ITEM)
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+import pytest
+
+from boto3.dynamodb.types import Binary
+
+from dynamorm.cursors import decode_cursor, encode_cursor
+from dynamorm.exceptions import InvalidCursor
+
+
+def test_cursor_round_trip():
+    last = {'foo': 'first', 'count': Decimal('12.5'), 'data': Binary(b'\x00\xff')}
+    token = encode_cursor(last, index_name='by-count', reverse=True)
+
+    # tokens are url safe
+    assert all(char.isalnum() or char in '-_' for char in token)
+
+    cursor = decode_cursor(token)
+    assert cursor.last == last
+    assert cursor.index_name == 'by-count'
+    assert cursor.reverse is True
+
+    cursor = decode_cursor(encode_cursor({'foo': 'first'}))
+    assert cursor == ({'foo': 'first'}, None, False)
+
+
+def test_cursor_signing():
+    token = encode_cursor({'foo': 'first', 'bar': 'one'}, secret='sekrit')
+    assert decode_cursor(token, secret='sekrit').last == {'foo': 'first', 'bar': 'one'}
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, secret='wrong')
+
+    # swapping in a different key invalidates the signature
+    forged = '.'.join([encode_cursor({'foo': 'second', 'bar': 'one'}), token.split('.')[1]])
+    with pytest.raises(InvalidCursor):
+        decode_cursor(forged, secret='sekrit')
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor({'foo': 'first'}), secret='sekrit')
+
+
+def test_cursor_garbage():
+    for token in ('', 'not a cursor', 'e30', '!!!'):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
+
+
+def test_read_cursors(TestModel, TestModel_entries, dynamo_local):
+    books = TestModel.query(foo="first").limit(2)
+    assert [result.count for result in books] == [111, 333]
+
+    token = books.cursor()
+    assert [result.count for result in TestModel.query(foo="first").limit(2).start_cursor(token)] == [222]
+
+    with pytest.raises(InvalidCursor):
+        TestModel.query(foo="second").start_cursor(token)
+
+    with pytest.raises(InvalidCursor):
+        TestModel.query(foo="first").reverse().start_cursor(token)
+
+    results = TestModel.query(foo="first")
+    list(results)
+    assert results.cursor() is None
+
+
+def test_read_cursors_signed(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.patch.object(TestModel.Table.__class__, 'cursor_secret', 'sekrit')
+
+    books = TestModel.scan().limit(1)
+    list(books)
+    token = books.cursor()
+    assert '.' in token
+
+    assert len(list(TestModel.scan().start_cursor(token))) == 2
+
+    with pytest.raises(InvalidCursor):
+        TestModel.scan().start_cursor(encode_cursor(books.last))
@@ -0,0 +1,88 @@
+import json
+
+from decimal import Decimal
+
+import pytest
+
+from boto3.dynamodb.types import Binary
+
+from dynamorm import Sum
+from dynamorm.incremental import IncrementalItems, find_items
+
+
+def body(items, **rest):
+    rest['Items'] = items
+    return json.dumps(rest, sort_keys=True)
+
+
+def test_find_items():
+    text = body([{'id': {'S': 'a]'}}], Count=1)
+    start, end = find_items(text)
+    assert json.loads(text[start:end]) == [{'id': {'S': 'a]'}}]
+
+    # attributes named Items, and brackets in strings after the array, aren't mistaken for it
+    text = body([{'Items': {'L': [{'S': ']'}]}}], Count=1, LastEvaluatedKey={'Items': {'S': '],"x":[]}'}},
+                ScannedCount=2)
+    start, end = find_items(text)
+    assert json.loads(text[start:end]) == [{'Items': {'L': [{'S': ']'}]}}]
+    assert json.loads(text[:start] + '[]' + text[end:])['LastEvaluatedKey'] == {'Items': {'S': '],"x":[]}'}}
+
+    assert find_items(json.dumps({'Count': 0})) is None
+    assert find_items('{"Items": [') is None
+
+
+def test_incremental_items():
+    text = body([
+        {'id': {'S': 'a'}, 'n': {'N': '1.5'}, 'data': {'B': 'AAE='}, 'tags': {'SS': ['x']}},
+        {'id': {'S': 'b'}, 'nested': {'M': {'list': {'L': [{'N': '2'}, {'B': 'AQ=='}]}}}, 'sets': {'BS': ['AQ==']}},
+    ], Count=2)
+    start, end = find_items(text)
+    items = IncrementalItems(text, start)
+
+    assert items[0] == {'id': 'a', 'n': Decimal('1.5'), 'data': Binary(b'\x00\x01'), 'tags': set(['x'])}
+    assert items[0]['id'] == 'a'
+    assert items.text is not None
+    assert items[1] == {'id': 'b', 'nested': {'list': [Decimal('2'), Binary(b'\x01')]}, 'sets': set([Binary(b'\x01')])}
+
+    # the body is released with the last item, and items can only be read in order
+    assert items.text is None
+    with pytest.raises(IndexError):
+        items[2]
+    with pytest.raises(ValueError):
+        items[0]
+
+    text = body([{'id': {'S': 'a'}}, {'id': {'S': 'b'}}])
+    assert [item['id'] for item in IncrementalItems(text, find_items(text)[0])] == ['a', 'b']
+
+    text = body([])
+    items = IncrementalItems(text, find_items(text)[0])
+    assert items.text is None
+    assert list(items) == []
+
+
+def test_incremental_read(TestModel, TestModel_entries, dynamo_local):
+    read = TestModel.query(foo='first').incremental()
+    assert [item.bar for item in read] == ['one', 'three', 'two']
+    assert isinstance(read.resp['Items'], IncrementalItems)
+    assert read.resp['Items'].text is None
+
+    # the results aren't kept
+    assert read._results == []
+    assert list(read) == []
+    assert read.count() == 3
+    assert [item.bar for item in TestModel.query(foo='first')] == ['one', 'three', 'two']
+
+    first_two = TestModel.query(foo='first').incremental()[:2]
+    assert [item.bar for item in first_two] == ['one', 'three']
+    assert [item.bar for item in TestModel.query(foo='first').incremental()[first_two.last:]] == ['two']
+    assert TestModel.query(foo='first').incremental().first().bar == 'one'
+
+    assert TestModel.scan().incremental().aggregate(by='baz', total=Sum('count')) == {
+        'bbq': {'total': 444}, 'wtf': {'total': 222}
+    }
+    assert sorted(TestModel.scan().incremental().to_columns('bar')['bar']) == ['one', 'three', 'two']
+
+
+def test_incremental_read_pages(TestModel, TestModel_entries_xlarge, dynamo_local):
+    read = TestModel.scan().incremental().recursive()
+    assert len(set(item.foo for item in read)) == 4000
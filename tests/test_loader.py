@@ -0,0 +1,102 @@
+import time
+
+from decimal import Decimal
+
+import pytest
+
+
+def fake_get_batch(items):
+    """Return a side effect for Table.get_batch that serves the given items"""
+    def get_batch(keys, consistent=False, attrs=None):
+        for key in keys:
+            for item in items:
+                if item['foo'] == key['foo'] and item['bar'] == key['bar']:
+                    yield item
+    return get_batch
+
+
+@pytest.fixture
+def mock_get_batch(TestModel, mocker):
+    get_batch = mocker.patch.object(TestModel.Table.__class__, 'get_batch')
+    get_batch.side_effect = fake_get_batch([
+        {'foo': 'first', 'bar': 'one', 'baz': 'bbq', 'count': 111},
+        {'foo': 'first', 'bar': 'two', 'baz': 'wtf', 'count': 222},
+    ])
+    return get_batch
+
+
+def test_loader_batches(TestModel, mock_get_batch):
+    loader = TestModel.loader()
+
+    one = loader.load(foo='first', bar='one')
+    two = loader.load(foo='first', bar='two')
+    missing = loader.load(foo='first', bar='nope')
+    assert mock_get_batch.call_count == 0
+
+    assert one.result().count == 111
+    assert mock_get_batch.call_count == 1
+    assert two.result().count == 222
+    assert missing.result() is None
+    assert mock_get_batch.call_count == 1
+
+    # loaded items are cached
+    assert loader.load(foo='first', bar='one') is one
+    assert loader.get(foo='first', bar='one') is one.result()
+    assert mock_get_batch.call_count == 1
+
+    loader.clear()
+    assert loader.get(foo='first', bar='one').count == 111
+    assert mock_get_batch.call_count == 2
+
+
+def test_loader_max_batch_size(TestModel, mock_get_batch):
+    loader = TestModel.loader(max_batch_size=2)
+
+    futures = loader.load_many([
+        {'foo': 'first', 'bar': 'one'},
+        {'foo': 'first', 'bar': 'two'},
+        {'foo': 'first', 'bar': 'three'},
+    ])
+
+    # the first two keys filled a batch, and were dispatched immediately
+    assert mock_get_batch.call_count == 1
+    assert futures[0].done() and futures[1].done()
+    assert not futures[2].done()
+
+    assert futures[2].result() is None
+    assert mock_get_batch.call_count == 2
+
+
+def test_loader_window(TestModel, mock_get_batch):
+    loader = TestModel.loader(window=0.01)
+    one = loader.load(foo='first', bar='one')
+
+    deadline = time.time() + 5
+    while not one.done() and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert one.done()
+    assert one.result().baz == 'bbq'
+
+
+def test_loader_errors(TestModel, mocker):
+    mocker.patch.object(TestModel.Table.__class__, 'get_batch').side_effect = RuntimeError('boom')
+
+    loader = TestModel.loader()
+    one = loader.load(foo='first', bar='one')
+    with pytest.raises(RuntimeError):
+        one.result()
+
+    # failed lookups aren't cached, so a transient error doesn't stick to the key
+    TestModel.Table.get_batch.side_effect = fake_get_batch([{'foo': 'first', 'bar': 'one', 'baz': 'bbq'}])
+    two = loader.load(foo='first', bar='one')
+    assert two is not one
+    assert two.result().baz == 'bbq'
+    assert loader.load(foo='first', bar='one') is two
+
+
+def test_loader_keys(TestModel):
+    loader = TestModel.loader()
+    assert loader.key_for({'foo': 'first', 'bar': 1}) == loader.key_for({'foo': 'first', 'bar': Decimal(1)})
+    assert loader.key_for({'foo': 'first', 'bar': 1}) != loader.key_for({'foo': 'first', 'bar': '1'})
+    assert loader.key_for({'foo': 'first', 'bar': 1}) != loader.key_for({'foo': 'first', 'bar': True})
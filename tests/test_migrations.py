@@ -0,0 +1,258 @@
+import os
+
+import pytest
+
+from dynamorm.exceptions import MissingTableAttribute
+from dynamorm.migrations import CapacityBudget, WriteBackResult
+from dynamorm.model import DynaModel
+from dynamorm.streams import MemoryCheckpointStore
+from dynamorm.table import Q
+
+if os.environ.get('SERIALIZATION_PKG', '').startswith('marshmallow'):
+    from marshmallow.fields import String, Integer as Number
+else:
+    from schematics.types import StringType as String, IntType as Number
+
+
+def add_suffix(item):
+    if item['bar'] == 'two':
+        return None
+    item['baz'] = item['baz'] + '-migrated'
+    return item
+
+
+def test_migrate(TestModel, TestModel_entries, dynamo_local):
+    store = MemoryCheckpointStore()
+    progress = []
+
+    result = TestModel.migrate(add_suffix, store=store, segments=2, progress=progress.append)
+    assert (result.scanned, result.migrated, result.unchanged, result.invalid, result.conflicts) == (3, 2, 1, 0, 0)
+    assert progress[-1].scanned == 3
+    assert sorted(item.baz for item in TestModel.scan()) == ['bbq-migrated', 'bbq-migrated', 'wtf']
+
+    # the migration is finished, so running it again doesn't scan anything
+    assert TestModel.migrate(add_suffix, store=store, segments=2).scanned == 0
+    with pytest.raises(ValueError):
+        TestModel.migrate(add_suffix, store=store, segments=3)
+
+
+def test_migrate_resume(TestModel, TestModel_entries, dynamo_local):
+    store = MemoryCheckpointStore()
+    seen = []
+
+    def fail_once(item):
+        seen.append(item['bar'])
+        if len(seen) == 2:
+            raise RuntimeError('boom')
+        return add_suffix(item)
+
+    with pytest.raises(RuntimeError):
+        TestModel.migrate(fail_once, store=store, segments=1, page_size=1)
+
+    # the page that was migrated before the failure isn't scanned again
+    result = TestModel.migrate(add_suffix, store=store, segments=1, page_size=1)
+    assert result.scanned == 2
+    assert sorted(item.baz for item in TestModel.scan()) == ['bbq-migrated', 'bbq-migrated', 'wtf']
+
+
+def test_migrate_conditions(TestModel, TestModel_entries, dynamo_local):
+    def bump(item):
+        item['count'] += 1
+        return item
+
+    # the condition doesn't match, so nothing is written
+    result = TestModel.migrate(bump, store=MemoryCheckpointStore(),
+                               condition=lambda original: Q(count=original['count'] + 1))
+    assert (result.migrated, result.conflicts) == (0, 3)
+
+    result = TestModel.migrate(lambda item: dict(item, count='lots'), store=MemoryCheckpointStore())
+    assert (result.migrated, result.invalid) == (0, 3)
+
+    result = TestModel.migrate(bump, store=MemoryCheckpointStore(), write='batch', max_capacity=1000)
+    assert result.migrated == 3
+    assert sorted(item.count for item in TestModel.scan()) == [112, 223, 334]
+
+    with pytest.raises(ValueError):
+        TestModel.migrate(lambda item: dict(item, bar='moved'), store=MemoryCheckpointStore())
+
+
+def test_migrate_unchanged(TestModel, TestModel_entries, dynamo_local):
+    def nest(item):
+        item['child']['sub'] += '-migrated'
+        return item
+
+    # nested values changed in place are still migrated
+    result = TestModel.migrate(nest, store=MemoryCheckpointStore())
+    assert (result.migrated, result.unchanged) == (3, 0)
+    assert sorted(item.child['sub'] for item in TestModel.scan()) == ['one-migrated', 'three-migrated', 'two-migrated']
+
+    def race(item):
+        # the item is changed by someone else after it was read
+        if item['bar'] == 'one':
+            TestModel.get(foo='first', bar='one').update(count=999)
+        item['baz'] = 'raced'
+        return item
+
+    # items that changed since they were read aren't overwritten
+    result = TestModel.migrate(race, store=MemoryCheckpointStore(), segments=1)
+    assert (result.migrated, result.conflicts) == (2, 1)
+    one = TestModel.get(foo='first', bar='one')
+    assert (one.baz, one.count) == ('bbq', 999)
+    assert TestModel.get(foo='first', bar='two').baz == 'raced'
+
+
+def test_migrate_unchanged_attributes(TestModel, TestModel_entries, dynamo_local):
+    # attribute names with dots are compared as top level attributes, rather than as paths into maps
+    TestModel.Table.put({'foo': 'first', 'bar': 'one', 'baz': 'bbq', 'count': 111, 'a.b': 'dotted'})
+    result = TestModel.migrate(add_suffix, store=MemoryCheckpointStore(), segments=1)
+    assert (result.migrated, result.conflicts) == (2, 0)
+
+    # wide items would go over the length limit of condition expressions, so they need a condition of their own
+    wide = dict(('attribute{0}'.format(number), number) for number in range(300))
+    TestModel.Table.put(dict(wide, foo='first', bar='one', baz='bbq', count=111))
+    with pytest.raises(ValueError):
+        TestModel.migrate(add_suffix, store=MemoryCheckpointStore(), segments=1)
+
+    result = TestModel.migrate(add_suffix, store=MemoryCheckpointStore(), segments=1,
+                               condition=lambda original: Q(count=original['count']))
+    assert (result.migrated, result.conflicts) == (2, 0)
+
+
+def test_capacity_budget(mocker):
+    now = [100.0]
+    mocker.patch('dynamorm.migrations.time.time', side_effect=lambda: now[0])
+    sleep = mocker.patch('dynamorm.migrations.time.sleep', side_effect=lambda delay: now.__setitem__(0, now[0] + delay))
+
+    budget = CapacityBudget(10)
+    budget.wait()
+    assert sleep.call_count == 0
+
+    # going into debt makes the next request wait until the budget recovers
+    budget.consume(15)
+    budget.wait()
+    assert sleep.call_count == 1
+    assert sleep.call_args[0][0] == pytest.approx(0.5)
+    assert now[0] == pytest.approx(100.5)
+
+
+def split_name(item):
+    item['first_name'], _, item['last_name'] = item.pop('name').partition(' ')
+    return item
+
+
+def add_initials(item):
+    item['initials'] = item['first_name'][:1] + item['last_name'][:1]
+    return item
+
+
+@pytest.fixture
+def Author(dynamo_local, request):
+    class Author(DynaModel):
+        class Table:
+            name = 'authors'
+            hash_key = 'id'
+            read = 5
+            write = 5
+            version_attribute = 'schema_version'
+            upgrades = [split_name, add_initials]
+            write_back = True
+
+        class Schema:
+            id = String(required=True)
+            first_name = String()
+            last_name = String()
+            initials = String()
+            schema_version = Number()
+
+    Author.Table.create_table()
+    request.addfinalizer(Author.Table.delete)
+    return Author
+
+
+def test_upgrade_on_read(Author):
+    Author.Table.put({'id': 'ada', 'name': 'Ada Lovelace'})
+    Author.Table.put({'id': 'grace', 'first_name': 'Grace', 'last_name': 'Hopper', 'schema_version': 1})
+    Author.Table.put({'id': 'alan', 'first_name': 'Alan', 'last_name': 'Turing', 'initials': 'AT',
+                      'schema_version': 2})
+
+    ada = Author.get(id='ada')
+    assert (ada.first_name, ada.last_name, ada.initials, ada.schema_version) == ('Ada', 'Lovelace', 'AL', 2)
+    Author.write_back_queue().join()
+    assert sorted(author.initials for author in Author.scan()) == ['AL', 'AT', 'GH']
+
+    # ada was written back before the scan, so only grace was upgraded by it
+    Author.write_back_queue().join()
+    assert Author.write_back_queue().result() == WriteBackResult(2, 0, 0, 0)
+    assert Author.Table.get(id='ada') == {
+        'id': 'ada', 'first_name': 'Ada', 'last_name': 'Lovelace', 'initials': 'AL', 'schema_version': 2
+    }
+    assert Author.Table.get(id='grace')['schema_version'] == 2
+
+    # partial items aren't upgraded, or written back
+    Author.Table.put({'id': 'charles', 'name': 'Charles Babbage'})
+    charles = next(Author.get_batch([{'id': 'charles'}], attrs='id'))
+    assert getattr(charles, 'first_name', None) is None
+    Author.write_back_queue().join()
+    assert Author.write_back_queue().result().written == 2
+
+
+def test_write_back_conflicts(Author):
+    Author.Table.put({'id': 'ada', 'name': 'Ada Lovelace'})
+    item = Author.Table.upgrade(Author.Table.get(id='ada'))
+
+    # the item was changed (by a newer client) after it was read, so it isn't written back
+    Author.Table.put({'id': 'ada', 'first_name': 'Ada', 'last_name': 'King', 'schema_version': 1})
+    assert Author.write_back_queue().write(item, 0) == 'conflicts'
+
+    # nor are items deleted after they were read
+    Author.Table.delete_item(id='ada')
+    assert Author.write_back_queue().write(item, 0) == 'conflicts'
+    assert Author.Table.get(id='ada') is None
+
+
+def test_save_sets_version(Author):
+    author = Author(id='mary', first_name='Mary', last_name='Shelley', initials='MS')
+    author.save()
+    assert author.schema_version == 2
+    assert Author.Table.get(id='mary')['schema_version'] == 2
+
+    Author.put({'id': 'jane', 'first_name': 'Jane', 'last_name': 'Austen'})
+    assert Author.get(id='jane').schema_version == 2
+    Author.write_back_queue().join()
+    assert Author.write_back_queue().result().written == 0
+
+
+def test_import_and_migrate_set_version(Author, tmpdir):
+    path = tmpdir.join('authors.ndjson')
+    path.write('{"id": "ada", "first_name": "Ada", "last_name": "Lovelace", "initials": "AL"}\n')
+    assert Author.import_file(str(path), processes=0).imported == 1
+    assert Author.Table.get(id='ada')['schema_version'] == 2
+
+    ada = Author.get(id='ada')
+    assert (ada.first_name, ada.last_name, ada.initials, ada.schema_version) == ('Ada', 'Lovelace', 'AL', 2)
+
+    def rename(item):
+        item.pop('schema_version')
+        item['last_name'] = 'King'
+        return item
+
+    for write in ('put', 'batch'):
+        Author.migrate(rename, store=MemoryCheckpointStore(), segments=1, write=write)
+        assert Author.Table.get(id='ada')['schema_version'] == 2
+        ada = Author.get(id='ada')
+        assert (ada.first_name, ada.last_name, ada.initials) == ('Ada', 'King', 'AL')
+
+    Author.write_back_queue().join()
+    assert Author.write_back_queue().result().written == 0
+
+
+def test_upgrades_require_version_attribute():
+    with pytest.raises(MissingTableAttribute):
+        class Unversioned(DynaModel):
+            class Table:
+                name = 'unversioned'
+                hash_key = 'id'
+                upgrades = [split_name]
+
+            class Schema:
+                id = String(required=True)
@@ -5,6 +5,7 @@ import pytest
 from dynamorm.exceptions import (
     DynaModelException,
     HashKeyExists,
+    InvalidKey,
     InvalidSchemaField,
     MissingTableAttribute,
     ValidationError,
@@ -428,6 +429,91 @@ def test_sparse_indexes(dynamo_local):
     assert items[0].foo == '2'
 
 
+def test_covering_indexes():
+    class Event(DynaModel):
+        class Table:
+            name = 'events'
+            hash_key = 'user'
+            range_key = 'when'
+            read = 10
+            write = 10
+
+        class ByKind(LocalIndex):
+            name = 'by-kind'
+            hash_key = 'user'
+            range_key = 'kind'
+            projection = ProjectInclude('title')
+
+        class ByTag(LocalIndex):
+            name = 'by-tag'
+            hash_key = 'user'
+            range_key = 'tag'
+            projection = ProjectInclude('title', 'body')
+
+        class Schema:
+            user = String(required=True)
+            when = Number(required=True)
+            kind = String(required=True)
+            tag = String()
+            title = String()
+            body = String()
+
+    assert Event.query(user='a').explain().index_name is None
+
+    # by-kind projects everything that is asked for & filtered on, so it's cheaper to read than the table
+    plan = Event.query(user='a', title__begins_with='x').only('user', 'title').explain()
+    assert plan.index_name == 'by-kind'
+    assert plan.covering
+    assert str(plan) == (
+        "Query the LocalIndex 'by-kind' with a key condition on user, filtering on title, "
+        "which covers every requested attribute (partial results)"
+    )
+
+    # by-tag leaves out items without a tag, so it's only used when the query needs one
+    assert Event.query(user='a').only('user', 'body').explain().index_name is None
+    assert Event.query(user='a', tag='b').only('user', 'body').explain().index_name == 'by-tag'
+
+
+def test_split_query(dynamo_local, request):
+    class Reading(DynaModel):
+        class Table:
+            name = 'readings'
+            hash_key = 'sensor'
+            range_key = 'ts'
+            read = 10
+            write = 10
+
+        class Schema:
+            sensor = String(required=True)
+            ts = Number(required=True)
+            value = Number()
+
+    Reading.Table.create_table()
+    request.addfinalizer(Reading.Table.delete)
+    Reading.put_batch(*[
+        {'sensor': 'a', 'ts': ts, 'value': ts * 2}
+        for ts in range(100)
+    ])
+
+    query = Reading.query(sensor='a', ts__between=[10, 89])
+
+    results = list(query.split(4, ordered=True))
+    assert [result.ts for result in results] == list(range(10, 90))
+
+    results = list(query.split(4))
+    assert sorted(result.ts for result in results) == list(range(10, 90))
+
+    results = list(query.reverse().split(3, ordered=True))
+    assert [result.ts for result in results] == list(reversed(range(10, 90)))
+
+    # samplers choose the boundaries
+    results = list(query.split(2, ordered=True, sampler=lambda low, high, segments: [low, 11, high]))
+    assert [result.ts for result in results] == list(range(10, 90))
+
+    with pytest.raises(InvalidKey):
+        list(Reading.query(sensor='a').split(4))
+
+
 def test_partial_save(TestModel, TestModel_entries, dynamo_local):
     def get_first():
         first = TestModel.get(foo='first', bar='one')
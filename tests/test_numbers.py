@@ -0,0 +1,87 @@
+import os
+
+from decimal import Decimal
+
+import pytest
+
+from dynamorm.model import DynaModel
+from dynamorm.numbers import NumberParser
+from dynamorm.streams import MemoryCheckpointStore
+
+if os.environ.get('SERIALIZATION_PKG', '').startswith('marshmallow'):
+    from marshmallow.fields import Decimal as DecimalField, Float, Integer, String
+else:
+    from schematics.types import (
+        DecimalType as DecimalField, FloatType as Float, IntType as Integer, StringType as String
+    )
+
+
+@pytest.fixture
+def Reading(dynamo_local, request):
+    class Reading(DynaModel):
+        class Table:
+            name = 'readings'
+            hash_key = 'sensor'
+            range_key = 'at'
+            read = 5
+            write = 5
+            native_numbers = True
+
+        class Schema:
+            sensor = String(required=True)
+            at = Integer(required=True)
+            value = Float()
+            total = DecimalField()
+
+    Reading.Table.create_table()
+    request.addfinalizer(Reading.Table.delete)
+
+    for at in range(3):
+        Reading.Table.put({'sensor': 'a', 'at': at, 'value': Decimal('1.5') * at, 'total': Decimal('10.25'),
+                           'extra': 7, 'nested': {'count': 1}})
+    return Reading
+
+
+def assert_native(item):
+    assert type(item['at']) is int
+    assert type(item['value']) is float
+    assert type(item['total']) is Decimal
+    assert type(item['extra']) is Decimal
+    assert type(item['nested']['count']) is Decimal
+
+
+def test_native_numbers(Reading):
+    assert_native(Reading.Table.get(sensor='a', at=1))
+    assert Reading.Table.get(sensor='a', at=1)['value'] == 1.5
+    assert_native(list(Reading.Table.get_batch([{'sensor': 'a', 'at': 2}]))[0])
+    for item in Reading.Table.query(sensor='a')['Items'] + Reading.Table.scan()['Items']:
+        assert_native(item)
+
+    response = Reading.Table.update(sensor='a', at=0, value=Decimal('2.5'),
+                                    update_item_kwargs={'ReturnValues': 'ALL_NEW'})
+    assert_native(response['Attributes'])
+
+    reading = Reading.get(sensor='a', at=2)
+    assert (reading.at, reading.value, reading.total) == (2, 3.0, Decimal('10.25'))
+    assert [reading.at for reading in Reading.query(sensor='a', at__gt=0)] == [1, 2]
+
+    # incremental reads parse the numbers of each item as it is decoded
+    read = Reading.query(sensor='a').incremental()
+    assert [(reading.at, reading.value) for reading in read] == [(0, 2.5), (1, 1.5), (2, 3.0)]
+    assert_native(read.resp['Items'][2])
+
+
+def test_number_parser(Reading):
+    image = {'sensor': {'S': 'a'}, 'at': {'N': '3'}, 'value': {'N': '1e3'}, 'total': {'N': '1.10'},
+             'extra': {'N': '2'}}
+    item = Reading.Table.number_parser.deserialize(image)
+    assert item == {'sensor': 'a', 'at': 3, 'value': 1000.0, 'total': Decimal('1.10'), 'extra': Decimal('2')}
+    assert type(item['at']) is int and type(item['value']) is float
+    assert image['at'] == {'N': '3'}
+
+    # stream records are parsed in the same way
+    processor = Reading.stream_processor(lambda records: None, store=MemoryCheckpointStore())
+    assert processor.deserialize(image) == item
+
+    # numbers that can't be parsed by their field's type are left as Decimals
+    assert NumberParser(Reading.Schema).deserialize({'at': {'N': '1.5'}}) == {'at': Decimal('1.5')}
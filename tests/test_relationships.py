@@ -3,10 +3,10 @@ import os
 
 import pytest
 
-from dynamorm.exceptions import ValidationError
+from dynamorm.exceptions import DynaModelException, ValidationError
 from dynamorm.model import DynaModel
 from dynamorm.indexes import GlobalIndex, ProjectKeys
-from dynamorm.relationships import OneToOne, OneToMany, ManyToOne
+from dynamorm.relationships import OneToOne, OneToMany, ManyToOne, Relationship
 
 if 'marshmallow' in (os.getenv('SERIALIZATION_PKG') or ''):
     from marshmallow.fields import String, Integer as Number
@@ -262,3 +262,190 @@ def test_one_to_many(dynamo_local, request):
 
     assert [r.forum_thread for r in bob.replies] == ['general\nTopic #1']
     assert [r.forum_thread for r in alice.replies] == ['general\nTopic #1']
+
+
+def test_prefetch(dynamo_local, request, mocker):
+    class User(DynaModel):
+        class Table:
+            name = 'users'
+            hash_key = 'name'
+            read = 1
+            write = 1
+
+        class Schema:
+            name = String(required=True)
+
+    class Thread(DynaModel):
+        class Table:
+            name = 'threads'
+            hash_key = 'forum_name'
+            range_key = 'subject'
+            read = 1
+            write = 1
+
+        class ByUser(GlobalIndex):
+            name = 'threads-by-user'
+            hash_key = 'user_name'
+            range_key = 'subject'
+            projection = ProjectKeys()
+            read = 1
+            write = 1
+
+        class Schema:
+            forum_name = String(required=True)
+            user_name = String(required=True)
+            subject = String(required=True)
+
+        user = ManyToOne(
+            User,
+            query=lambda thread: dict(name=thread.user_name),
+            back_index='ByUser',
+            back_query=lambda user: dict(user_name=user.name)
+        )
+
+    User.Table.create_table()
+    request.addfinalizer(User.Table.delete)
+
+    Thread.Table.create_table()
+    request.addfinalizer(Thread.Table.delete)
+
+    User.put_batch({'name': 'alice'}, {'name': 'bob'})
+    Thread.put_batch(
+        {'forum_name': 'general', 'user_name': 'alice', 'subject': 'Topic #1'},
+        {'forum_name': 'general', 'user_name': 'bob', 'subject': 'Topic #2'},
+        {'forum_name': 'general', 'user_name': 'alice', 'subject': 'Topic #3'},
+        {'forum_name': 'general', 'user_name': 'carol', 'subject': 'Topic #4'},
+    )
+
+    get_batch = mocker.spy(User.Table.__class__, 'get_batch')
+    threads = list(Thread.query(forum_name='general').prefetch('user'))
+
+    # all of the users were loaded through a single batch get
+    assert get_batch.call_count == 1
+    assert [thread.user.name for thread in threads] == ['alice', 'bob', 'alice', 'carol']
+    assert get_batch.call_count == 1
+
+    # threads by the same user share the same user instance, and missing users are automatically created
+    assert threads[0].user is threads[2].user
+    assert threads[3].user.name == 'carol'
+
+    # the back reference is a one to many relationship, which is loaded with concurrent queries
+    query = mocker.spy(Thread.Table.__class__, 'query')
+    users = list(User.scan().prefetch('threads'))
+    assert query.call_count == 2
+
+    threads_by_user = dict((user.name, sorted(thread.subject for thread in user.threads)) for user in users)
+    assert threads_by_user == {'alice': ['Topic #1', 'Topic #3'], 'bob': ['Topic #2']}
+    assert [len(user.threads) for user in users] == [len(threads_by_user[user.name]) for user in users]
+    assert query.call_count == 2
+
+    with pytest.raises(DynaModelException):
+        list(User.scan().prefetch('nope'))
+
+    # the default prefetch loads the relationship for each instance separately
+    threads = list(Thread.query(forum_name='general'))
+    get_other_inst = mocker.spy(Thread.user, 'get_other_inst')
+    Relationship.prefetch(Thread.user, threads)
+    assert get_other_inst.call_count == 4
+    assert [thread.user.name for thread in threads] == ['alice', 'bob', 'alice', 'carol']
+    assert get_other_inst.call_count == 4
+
+
+def test_relationship_cache(dynamo_local, request, mocker):
+    class Details(DynaModel):
+        class Table:
+            name = 'details'
+            hash_key = 'thing_name'
+            read = 1
+            write = 1
+
+        class Schema:
+            thing_name = String(required=True)
+            attr1 = String()
+
+    class Part(DynaModel):
+        class Table:
+            name = 'parts'
+            hash_key = 'thing_name'
+            range_key = 'name'
+            read = 1
+            write = 1
+
+        class Schema:
+            thing_name = String(required=True)
+            name = String(required=True)
+
+    class Thing(DynaModel):
+        class Table:
+            name = 'things'
+            hash_key = 'name'
+            read = 1
+            write = 1
+
+        class Schema:
+            name = String(required=True)
+
+        details = OneToOne(
+            Details,
+            query=lambda thing: dict(thing_name=thing.name),
+            back_query=lambda details: dict(name=details.thing_name)
+        )
+        parts = OneToMany(
+            Part,
+            query=lambda thing: dict(thing_name=thing.name),
+            back_query=lambda part: dict(name=part.thing_name)
+        )
+
+    for model in (Details, Part, Thing):
+        model.Table.create_table()
+        request.addfinalizer(model.Table.delete)
+
+    Thing.put_batch({'name': 'one'}, {'name': 'two'})
+    Details.put_batch({'thing_name': 'one', 'attr1': 'first'}, {'thing_name': 'two', 'attr1': 'second'})
+    Part.put_batch({'thing_name': 'one', 'name': 'a'}, {'thing_name': 'one', 'name': 'b'})
+
+    details_query = mocker.spy(Details.Table.__class__, 'query')
+    one = Thing.get(name='one')
+    two = Thing.get(name='two')
+
+    # each instance sees its own related instance, which is only loaded once
+    assert one.details.attr1 == 'first'
+    assert two.details.attr1 == 'second'
+    assert one.details.attr1 == 'first'
+    assert details_query.call_count == 2
+
+    # assigning replaces the cached value
+    one.details = Details(attr1='replaced', partial=True)
+    assert one.details.attr1 == 'replaced'
+    assert details_query.call_count == 2
+
+    # and refreshing loads it again
+    one.refresh_relationships('details')
+    assert one.details.attr1 == 'first'
+    assert details_query.call_count == 3
+
+    # reassigning forgets the back reference of the instance that was replaced, as well as the new one's
+    old_details = one.details
+    assert old_details.thing.name == 'one'
+    back_reference = Thing.details.back_reference_relationship
+    assert back_reference in Relationship.cache_for(old_details)
+    new_details = Details(attr1='new', partial=True)
+    one.details = new_details
+    assert back_reference not in Relationship.cache_for(old_details)
+    assert back_reference not in Relationship.cache_for(new_details)
+    one.refresh_relationships('details')
+
+    # the many side of a relationship is also only loaded once
+    parts_query = mocker.spy(Part.Table.__class__, 'query')
+    assert [part.name for part in one.parts] == ['a', 'b']
+    assert len(one.parts) == 2
+    assert len(two.parts) == 0
+    assert parts_query.call_count == 2
+
+    one.parts.refresh()
+    assert len(one.parts) == 2
+    assert parts_query.call_count == 3
+
+    # creating a new part through the relationship invalidates the cached parts
+    Part(thing=one, name='c').save()
+    assert [part.name for part in one.parts] == ['a', 'b', 'c']
@@ -0,0 +1,178 @@
+import os
+
+import pytest
+
+from dynamorm.exceptions import StreamNotEnabled, ValidationError
+from dynamorm.model import DynaModel
+from dynamorm.streams import SHARD_END, CheckpointStore, FileCheckpointStore, MemoryCheckpointStore, StreamProcessor
+
+if os.environ.get('SERIALIZATION_PKG', '').startswith('marshmallow'):
+    from marshmallow.fields import String, Integer as Number
+else:
+    from schematics.types import StringType as String, IntType as Number
+
+
+@pytest.fixture
+def Widget(dynamo_local, request):
+    class Widget(DynaModel):
+        class Table:
+            name = 'widgets'
+            hash_key = 'id'
+            read = 5
+            write = 5
+            stream = 'NEW_AND_OLD_IMAGES'
+
+        class Schema:
+            id = String(required=True)
+            size = Number()
+
+    Widget.Table.create_table()
+    request.addfinalizer(Widget.Table.delete)
+    return Widget
+
+
+def test_stream_processor(Widget, tmpdir):
+    batches = []
+    path = str(tmpdir.join('checkpoints.json'))
+
+    Widget.put({'id': 'one', 'size': 1})
+    Widget.put({'id': 'two', 'size': 2})
+    Widget.get(id='one').update(size=10)
+    Widget.get(id='two').delete()
+
+    processor = Widget.stream_processor(batches.append, store=FileCheckpointStore(path))
+    assert processor.process() == 4
+
+    records = [record for batch in batches for record in batch]
+    assert [record.event_name for record in records] == ['INSERT', 'INSERT', 'MODIFY', 'REMOVE']
+    assert [record.keys for record in records] == [{'id': 'one'}, {'id': 'two'}, {'id': 'one'}, {'id': 'two'}]
+    assert isinstance(records[2].new, Widget)
+    assert (records[2].old.size, records[2].new.size) == (1, 10)
+    assert records[3].new is None
+
+    # the checkpoints are kept in the file, so processing resumes where it stopped
+    del batches[:]
+    Widget.put({'id': 'three', 'size': 3})
+    processor = Widget.stream_processor(batches.append, store=FileCheckpointStore(path))
+    assert processor.process() == 1
+    assert batches[0][0].new.id == 'three'
+    assert processor.process() == 0
+
+
+def test_stream_not_enabled(TestModel, TestModel_table):
+    with pytest.raises(StreamNotEnabled):
+        TestModel.stream_processor(lambda records: None, store=MemoryCheckpointStore()).process()
+
+
+class FakeStreamsClient(object):
+    """Serve the records of a parent shard that has been closed, and its child which is still open
+
+    None in the records of a shard is an empty batch, which DynamoDB can return before the records that follow it.
+    """
+    def __init__(self):
+        self.shards = {
+            'parent': [None, None, None, self.raw_record('INSERT', 'one', '1'), self.raw_record('MODIFY', 'one', '2')],
+            'child': [None, self.raw_record('REMOVE', 'one', '3')],
+        }
+
+    @staticmethod
+    def raw_record(event_name, foo, sequence_number):
+        image = {'foo': {'S': foo}, 'bar': {'S': sequence_number}} if foo else {'bar': {'S': sequence_number}}
+        dynamodb = {'Keys': {'foo': {'S': foo}}, 'SequenceNumber': sequence_number}
+        dynamodb['OldImage' if event_name == 'REMOVE' else 'NewImage'] = image
+        return {'eventName': event_name, 'dynamodb': dynamodb}
+
+    def describe_stream(self, StreamArn):
+        return {'StreamDescription': {'Shards': [
+            {'ShardId': 'child', 'ParentShardId': 'parent', 'SequenceNumberRange': {'StartingSequenceNumber': '3'}},
+            {'ShardId': 'parent', 'SequenceNumberRange': {'StartingSequenceNumber': '1', 'EndingSequenceNumber': '2'}},
+        ]}}
+
+    def get_shard_iterator(self, StreamArn, ShardId, ShardIteratorType, SequenceNumber=None):
+        position = 0
+        if ShardIteratorType == 'AFTER_SEQUENCE_NUMBER':
+            numbers = [record and record['dynamodb']['SequenceNumber'] for record in self.shards[ShardId]]
+            position = numbers.index(SequenceNumber) + 1
+        return {'ShardIterator': (ShardId, position)}
+
+    def get_records(self, ShardIterator, Limit):
+        shard_id, position = ShardIterator
+        records = []
+        while position < len(self.shards[shard_id]) and len(records) < Limit:
+            position += 1
+            if self.shards[shard_id][position - 1] is None:
+                break
+            records.append(self.shards[shard_id][position - 1])
+        if shard_id == 'parent' and position == len(self.shards[shard_id]):
+            return {'Records': records}
+        return {'Records': records, 'NextShardIterator': (shard_id, position)}
+
+
+def test_stream_processor_shard_order(TestModelTwo, mocker):
+    mocker.patch.object(StreamProcessor, 'stream_arn', 'arn:fake')
+
+    batches = []
+    store = MemoryCheckpointStore()
+    processor = StreamProcessor(TestModelTwo, batches.append, store=store, batch_size=1)
+    processor._client = FakeStreamsClient()
+
+    # the child is only read once the parent has been read to its end
+    assert processor.process() == 3
+    assert [(batch[0].shard_id, batch[0].event_name) for batch in batches] == [
+        ('parent', 'INSERT'), ('parent', 'MODIFY'), ('child', 'REMOVE')
+    ]
+    assert store.checkpoints == {'parent': SHARD_END, 'child': '3'}
+
+    processor._client.shards['child'].append(FakeStreamsClient.raw_record('INSERT', 'two', '4'))
+    assert processor.process() == 1
+    assert (batches[-1][0].new.foo, batches[-1][0].new.bar) == ('two', '4')
+    assert store.checkpoints['child'] == '4'
+
+    # records are handed over again if the handler fails
+    processor._client.shards['child'].append(FakeStreamsClient.raw_record('INSERT', 'three', '5'))
+    processor.handler = mocker.Mock(side_effect=RuntimeError('boom'))
+    with pytest.raises(RuntimeError):
+        processor.process()
+    assert store.checkpoints['child'] == '4'
+
+    # a record that fails validation is reported, and the checkpoint moves past it rather than retrying it forever
+    processor.handler = batches.append
+    assert processor.process() == 1
+    assert batches[-1][0].new.foo == 'three'
+
+    errors = []
+    processor.on_error = lambda raw, exc: errors.append((raw, exc))
+    processor._client.shards['child'].extend([
+        FakeStreamsClient.raw_record('INSERT', None, '6'), FakeStreamsClient.raw_record('INSERT', 'four', '7')
+    ])
+    processor.batch_size = 2
+    assert processor.process() == 2
+    assert [record.new.foo for record in batches[-1]] == ['four']
+    assert errors[0][0]['dynamodb']['SequenceNumber'] == '6'
+    assert isinstance(errors[0][1], ValidationError)
+    assert store.checkpoints['child'] == '7'
+
+    with pytest.raises(ValidationError):
+        processor.record('child', FakeStreamsClient.raw_record('INSERT', None, '8'))
+
+
+def test_stream_processor_empty_polls(TestModelTwo, mocker):
+    mocker.patch.object(StreamProcessor, 'stream_arn', 'arn:fake')
+
+    batches = []
+    processor = StreamProcessor(TestModelTwo, batches.append, store=MemoryCheckpointStore(), max_empty_polls=1)
+    processor._client = FakeStreamsClient()
+    processor._client.shards['child'] = [None, None, FakeStreamsClient.raw_record('INSERT', 'one', '3')]
+
+    # the closed parent is read to its end through its empty batches, but the open child stops at its first one
+    assert processor.process() == 2
+    assert processor.store.checkpoints == {'parent': SHARD_END}
+
+    processor.max_empty_polls = 3
+    assert processor.process() == 1
+    assert processor.store.checkpoints['child'] == '3'
+
+
+def test_checkpoint_store_abstract():
+    with pytest.raises(TypeError):
+        CheckpointStore()
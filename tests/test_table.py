@@ -1,16 +1,30 @@
 """These tests require dynamo local running"""
+import array
 import datetime
 import dateutil.tz
+import math
+import operator
 import os
+import threading
 
 from decimal import Decimal
 
 import pytest
 
-from dynamorm import Q
+from dynamorm import Avg, Count, Max, Min, Q, Sum
 
-from dynamorm.table import DynamoTable3, QueryIterator, ScanIterator
-from dynamorm.exceptions import HashKeyExists, InvalidSchemaField, ValidationError, ConditionFailed
+from dynamorm import processes
+from dynamorm.aggregates import Aggregate
+from dynamorm.model import DynaModel
+from dynamorm.table import DynamoTable3, QueryIterator, ScanIterator, log
+from dynamorm.exceptions import HashKeyExists, InvalidKey, InvalidSchemaField, ValidationError, ConditionFailed
+
+from .conftest import Gadget, wait_until
+
+if os.environ.get('SERIALIZATION_PKG', '').startswith('marshmallow'):
+    from marshmallow.fields import String, Integer as Number
+else:
+    from schematics.types import StringType as String, IntType as Number
 
 
 def is_marshmallow():
@@ -45,6 +59,38 @@ def test_put_remove_nones(TestModel, TestModel_table, dynamo_local, mocker):
     )
 
 
+def test_get_coalesced(TestModel, mocker):
+    """Concurrent, eventually consistent gets for the same key should share a single request"""
+    mocker.patch.object(TestModel.Table.__class__, '_table', create=True)
+    mocker.patch.object(TestModel.Table.__class__, 'coalesce_reads', True)
+    release = threading.Event()
+
+    def get_item(**kwargs):
+        release.wait(5)
+        return {'Item': {'foo': 'first', 'bar': 'one', 'baz': 'lol'}}
+    TestModel.Table.__class__._table.get_item.side_effect = get_item
+
+    saved = TestModel.Table.single_flight.saved
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(TestModel.get(foo='first', bar='one')))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: TestModel.Table.single_flight.saved - saved == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert TestModel.Table.__class__._table.get_item.call_count == 1
+    assert [result.baz for result in results] == ['lol'] * 5
+
+    # consistent reads are never coalesced
+    TestModel.get(foo='first', bar='one', consistent=True)
+    assert TestModel.Table.__class__._table.get_item.call_count == 2
+
+
 def test_schema_change(TestModel, TestModel_table, dynamo_local):
     """Simulate a schema change and make sure we get the record correctly"""
     data = {'foo': '1', 'bar': '2', 'bad_key': 10, 'baz': 'baz'}
@@ -99,6 +145,23 @@ def test_get_batch_invalid_field(TestModel):
         )))
 
 
+def test_get_batch_chunks(TestModel, mocker):
+    """Batch gets should drop duplicate keys and request at most 100 keys at a time"""
+    resource = mocker.patch.object(TestModel.Table.__class__, 'get_resource').return_value
+    resource.batch_get_item.side_effect = lambda RequestItems: {
+        'Responses': {'peanut-butter': RequestItems['peanut-butter']['Keys']},
+    }
+
+    keys = [{'foo': 'first', 'bar': str(i)} for i in range(250)]
+    items = list(TestModel.Table.get_batch(keys + keys[:10]))
+
+    assert len(items) == 250
+    assert [
+        len(call[1]['RequestItems']['peanut-butter']['Keys'])
+        for call in resource.batch_get_item.call_args_list
+    ] == [100, 100, 50]
+
+
 def test_get_non_existant(TestModel, TestModel_table, dynamo_local):
     """Getting a non-existant item should return None"""
     assert TestModel.get(foo="fifth", bar="derp") is None
@@ -555,3 +618,471 @@ def test_config():
 
     with pytest.raises(TypeError):
         BadConfigTable.get_resource()
+
+
+def test_read_iterator_chaining(TestModel, TestModel_entries, dynamo_local):
+    """Chained methods return new iterators, leaving the original unchanged"""
+    query = TestModel.query(foo="first")
+    filtered = query.filter(count__gt=200)
+    reversed_query = query.reverse()
+
+    assert filtered is not query
+    assert 'ScanIndexForward' not in query.dynamo_kwargs
+    assert [result.count for result in query] == [111, 333, 222]
+    assert [result.count for result in filtered] == [333, 222]
+    assert [result.count for result in reversed_query] == [222, 333, 111]
+    assert [result.count for result in filtered.filter(Q(count__lt=300))] == [222]
+
+    only = query.only('foo', 'bar')
+    assert [result.baz for result in only] == [None, None, None]
+
+
+def test_read_iterator_memoized(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'query')
+    query = TestModel.query(foo="first")
+
+    assert len(list(query)) == 3
+    assert len(list(query)) == 3
+    assert query.count() == 3
+    assert query.first().count == 111
+    assert query.exists()
+    assert [result.count for result in query[1:]] == [333, 222]
+    assert TestModel.Table.query.call_count == 1
+
+    # recursive reads don't keep their results, so they don't hold a whole partition in memory
+    recursive = TestModel.query(foo="first").recursive()
+    assert len(list(recursive)) == 3
+    assert recursive._results == []
+    assert list(recursive) == []
+    assert recursive.count() == 3
+    assert TestModel.Table.query.call_count == 3
+
+    # reads of a maximum number of items are bounded, so they keep theirs
+    bounded = TestModel.query(foo="first").max_items(2)
+    assert len(list(bounded)) == 2
+    assert len(list(bounded)) == 2
+
+
+def test_read_iterator_first_exists(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'query')
+
+    assert TestModel.query(foo="first").first().count == 111
+    assert TestModel.query(foo="first").reverse().first().count == 222
+    assert TestModel.query(foo="nope").first() is None
+
+    assert TestModel.query(foo="first").exists()
+    assert not TestModel.query(foo="nope").exists()
+
+    # every read only asked for a single item
+    for call in TestModel.Table.query.call_args_list:
+        assert call[1]['query_kwargs']['Limit'] == 1
+
+    # exists only asks for the keys
+    assert call[1]['query_kwargs']['ProjectionExpression'] == '#pe0_0, #pe1_0'
+
+    # filters cause items to be skipped, so we keep reading until we find one
+    assert TestModel.query(foo="first", count__gt=300).first().count == 333
+    assert not TestModel.query(foo="first", count__gt=1000).exists()
+
+
+def test_read_iterator_slicing(TestModel, TestModel_entries, dynamo_local):
+    results = TestModel.query(foo="first")[:2]
+    assert [result.count for result in results] == [111, 333]
+    assert results.last is not None
+
+    results = TestModel.query(foo="first")[results.last:2]
+    assert [result.count for result in results] == [222]
+
+    assert [result.count for result in TestModel.scan(count__gt=0)[1:3]] == [333, 222]
+    assert TestModel.query(foo="first")[2].count == 222
+
+    with pytest.raises(IndexError):
+        TestModel.query(foo="first")[3]
+
+    with pytest.raises(ValueError):
+        TestModel.query(foo="first")[-1]
+
+
+def test_count_pages(TestModel, TestModel_entries_xlarge, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'scan')
+
+    assert ScanIterator(TestModel).count() == 4000
+    assert TestModel.Table.scan.call_count > 1
+
+    counts = TestModel.scan(foo__begins_with='1').counts()
+    assert counts.count == 1111
+    assert counts.scanned_count == 4000
+
+    assert TestModel.scan(foo__begins_with='1').counts(segments=4) == (1111, 4000)
+    segments = set(
+        call[1]['scan_kwargs'].get('Segment')
+        for call in TestModel.Table.scan.call_args_list
+    )
+    assert segments >= set([0, 1, 2, 3])
+
+
+def test_map_reduce(TestModel, TestModel_entries, dynamo_local, mocker):
+    # the model is defined in a fixture, so it can't be pickled and the segments are mapped in threads
+    mocker.spy(processes.log, 'warning')
+    mocker.spy(TestModel.Table.__class__, 'scan')
+
+    def add(left, right):
+        return left + right
+
+    assert TestModel.scan().map_reduce(lambda thing: thing.count, add, processes=2, segments=3) == 666
+    assert processes.log.warning.call_count == 1
+    assert set(call[1]['scan_kwargs']['Segment'] for call in TestModel.Table.scan.call_args_list) == set([0, 1, 2])
+
+    assert TestModel.scan(baz='bbq').map_reduce(lambda thing: [thing.bar], add, processes=0) in (
+        ['one', 'three'], ['three', 'one']
+    )
+    assert TestModel.scan(baz='nope').map_reduce(lambda thing: thing.count, add, processes=0) is None
+    assert TestModel.scan(baz='nope').map_reduce(lambda thing: thing.count, add, initial=0, processes=0) == 0
+    assert TestModel.scan().map_reduce(lambda thing: thing.count, add, initial=1000, processes=0) == 1666
+
+
+def gadget_size(gadget):
+    return gadget.size
+
+
+def test_map_reduce_processes(Gadget_table, mocker):
+    Gadget.put_batch(*[{'id': str(number), 'size': number} for number in range(100)])
+    mocker.spy(processes.log, 'warning')
+
+    assert Gadget.scan().map_reduce(gadget_size, operator.add, processes=2, segments=4) == 4950
+    assert processes.log.warning.call_count == 0
+    assert Gadget.scan(size__gt=90).map_reduce(gadget_size, max, processes=2) == 99
+
+
+def test_aggregate(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'scan')
+    mocker.spy(TestModel, 'new_from_raw')
+
+    assert TestModel.scan().aggregate(items=Count(), total=Sum('count'), low=Min('count'), high=Max('count'),
+                                      average=Avg('count')) == {
+        'items': 3, 'total': 666, 'low': 111, 'high': 333, 'average': 222
+    }
+    assert TestModel.scan().aggregate(by='baz', total=Sum('count'), subs=Count('child.sub')) == {
+        'bbq': {'total': 444, 'subs': 2}, 'wtf': {'total': 222, 'subs': 1}
+    }
+    by_sub = TestModel.query(foo='first', bar__begins_with='t').aggregate(by=['baz', 'child.sub'], total=Sum('count'))
+    assert by_sub == {('bbq', 'three'): {'total': 333}, ('wtf', 'two'): {'total': 222}}
+
+    # only the needed attributes are read, and no instances are created
+    scan_kwargs = TestModel.Table.scan.call_args_list[1][1]['scan_kwargs']
+    assert sorted(scan_kwargs['ExpressionAttributeNames'].values()) == ['baz', 'child', 'count', 'sub']
+    assert TestModel.new_from_raw.call_count == 0
+
+    assert TestModel.scan(baz='nope').aggregate(items=Count(), total=Sum('count'), high=Max('count')) == {
+        'items': 0, 'total': 0, 'high': None
+    }
+    assert TestModel.scan(baz='nope').aggregate(by='baz', items=Count()) == {}
+
+    assert TestModel.scan().aggregate(by='baz', segments=3, total=Sum('count'), average=Avg('count')) == {
+        'bbq': {'total': 444, 'average': 222}, 'wtf': {'total': 222, 'average': 222}
+    }
+    segments = set(call[1]['scan_kwargs'].get('Segment') for call in TestModel.Table.scan.call_args_list)
+    assert segments >= set([0, 1, 2])
+
+    with pytest.raises(ValueError):
+        TestModel.scan().aggregate(by='baz')
+
+    # maps (and lists & sets) are turned into values that can key the groups
+    assert TestModel.scan(bar='one').aggregate(by='child', items=Count()) == {(('sub', 'one'),): {'items': 1}}
+
+    class Incomplete(Aggregate):
+        def add(self, state, value):
+            return value
+
+    with pytest.raises(TypeError):
+        Incomplete('count')
+
+
+def test_to_columns(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'query')
+    mocker.spy(TestModel, 'new_from_raw')
+
+    columns = TestModel.query(foo='first').to_columns('bar', 'count', 'child.sub')
+    assert list(columns) == ['bar', 'count', 'child.sub']
+    assert columns['bar'] == ['one', 'three', 'two']
+    assert columns['count'] == array.array('q', [111, 333, 222])
+    assert columns['child.sub'] == ['one', 'three', 'two']
+
+    # only the columns are read, and no instances are created
+    query_kwargs = TestModel.Table.query.call_args[1]['query_kwargs']
+    assert sorted(query_kwargs['ExpressionAttributeNames'].values()) == ['bar', 'child', 'count', 'sub']
+    assert TestModel.new_from_raw.call_count == 0
+
+    # missing values, and values that don't match their field, make integer columns into float columns with NaN
+    TestModel.Table.put({'foo': 'first', 'bar': 'four', 'baz': 'bbq', 'count': 'many'})
+    TestModel.Table.put({'foo': 'first', 'bar': 'five', 'baz': 'bbq'})
+    columns = TestModel.query(foo='first').to_columns()
+    assert list(columns) == list(TestModel.Schema.dynamorm_fields())
+    assert columns['bar'] == ['five', 'four', 'one', 'three', 'two']
+    assert columns['count'].typecode == 'd'
+    assert [math.isnan(value) for value in columns['count']] == [True, True, False, False, False]
+    assert columns['child'] == [None, None, {'sub': 'one'}, {'sub': 'three'}, {'sub': 'two'}]
+
+    assert TestModel.query(foo='nope').to_columns('bar', 'count') == {'bar': [], 'count': array.array('q')}
+
+    # numbers with a fractional part aren't truncated to fit integer columns
+    TestModel.Table.put({'foo': 'first', 'bar': 'six', 'baz': 'bbq', 'count': Decimal('1.5')})
+    with pytest.raises(ValueError):
+        TestModel.query(foo='first').to_columns('count')
+
+
+def test_to_numpy(TestModel, TestModel_entries, dynamo_local):
+    numpy = pytest.importorskip('numpy')
+
+    arrays = TestModel.query(foo='first').to_numpy('bar', 'count')
+    assert arrays['count'].dtype == numpy.int64
+    assert arrays['count'].tolist() == [111, 333, 222]
+    assert arrays['bar'].tolist() == ['one', 'three', 'two']
+
+
+def test_to_arrow(TestModel, TestModel_entries, dynamo_local):
+    pyarrow = pytest.importorskip('pyarrow')
+
+    TestModel.Table.put({'foo': 'first', 'bar': 'four', 'baz': 'bbq'})
+    table = TestModel.query(foo='first').to_arrow('bar', 'count')
+    assert table.schema.field('count').type == pyarrow.int64()
+    assert table.column('count').to_pylist() == [None, 111, 333, 222]
+    assert table.column('bar').to_pylist() == ['four', 'one', 'three', 'two']
+
+
+def test_max_items(TestModel, TestModel_entries_xlarge, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'scan')
+    mocker.spy(log, 'warning')
+
+    results = TestModel.scan(foo__begins_with='1').max_items(50)
+    assert len(list(results)) == 50
+
+    limits = [call[1]['scan_kwargs']['Limit'] for call in TestModel.Table.scan.call_args_list]
+    assert limits[0] == results.FIRST_PAGE_SIZE
+    assert all(limit <= previous * results.PAGE_GROWTH for previous, limit in zip(limits, limits[1:]))
+
+    # we resume from the last item produced, not the last item read
+    next_results = list(TestModel.scan(foo__begins_with='1').max_items(10).start(results.last))
+    assert len(next_results) == 10
+    assert not set(result.foo for result in next_results) & set(result.foo for result in results)
+
+    # setting both a limit and recursive only warns once
+    assert len(list(TestModel.scan().limit(5).recursive())) == 5
+    assert log.warning.call_count == 1
+
+
+def test_plan_query(TestModel):
+    plan = TestModel.query(foo="first").explain()
+    assert plan.index_name is None
+    assert plan.key_fields == ['foo']
+
+    plan = TestModel.query(foo="first", bar__begins_with="t", count__gt=100).explain()
+    assert plan.index_name is None
+    assert plan.key_fields == ['foo', 'bar']
+    assert plan.filter_fields == ['count']
+
+    # the local index has a condition on its range key, and fetches the attributes it doesn't project
+    plan = TestModel.query(foo="first", when__gt=0).explain()
+    assert plan.index_name == 'by_date'
+    assert plan.select == 'ALL_ATTRIBUTES'
+    assert not plan.partial
+    assert str(plan) == (
+        "Query the LocalIndex 'by_date' with a key condition on foo, when, "
+        "fetching the attributes that are not projected from the table"
+    )
+
+    plan = TestModel.query(bar="one").explain()
+    assert plan.index_name == 'bar'
+    assert str(plan) == "Query the GlobalIndex 'bar' with a key condition on bar"
+
+    # global indexes don't support consistent reads
+    with pytest.raises(InvalidSchemaField):
+        TestModel.query(bar="one").consistent().explain()
+
+    # the baz index only projects count, so it can only be used when nothing else is needed
+    with pytest.raises(InvalidSchemaField):
+        TestModel.query(baz="bbq").explain()
+
+    plan = TestModel.query(baz="bbq").only('foo', 'bar', 'count').explain()
+    assert plan.index_name == 'baz'
+    assert plan.partial
+
+    with pytest.raises(InvalidSchemaField):
+        TestModel.query(baz="bbq", child__sub="one").only('foo', 'bar', 'count').explain()
+
+    # naming an index always uses it
+    assert TestModel.ByBaz.query(baz="bbq").explain().index_name == 'baz'
+
+
+def test_plan_query_warnings(TestModel, mocker):
+    mocker.spy(log, 'warning')
+
+    # queries that can only use an index don't warn
+    TestModel.query(bar="one").explain()
+    assert log.warning.call_count == 0
+
+    # but routing a query that the table could run to an index does
+    TestModel.query(foo="first", when__gt=0).explain()
+    assert log.warning.call_count == 1
+    assert log.warning.call_args[0][1:4] == ('peanut-butter', 'LocalIndex', 'by_date')
+
+
+def test_query_plan_cached(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'plan_query')
+    mocker.spy(TestModel.Table.__class__, 'query')
+    mocker.patch.object(QueryIterator, 'FIRST_PAGE_SIZE', 1)
+
+    # the plan is chosen once, and used for every page
+    query = TestModel.query(foo="first").max_items(3)
+    assert query.explain() is query.explain()
+    assert len(list(query)) == 3
+    assert TestModel.Table.query.call_count > 1
+    assert TestModel.Table.plan_query.call_count == 1
+
+    # chained methods plan their own query
+    assert query.consistent().explain() is not query.explain()
+    assert TestModel.Table.plan_query.call_count == 2
+
+
+def test_query_planned_index(TestModel, TestModel_entries, dynamo_local):
+    results = list(TestModel.query(bar="two"))
+    assert len(results) == 1
+    assert results[0].count == 222
+
+    results = list(TestModel.query(baz="bbq").only('foo', 'bar', 'count'))
+    assert sorted(result.count for result in results) == [111, 333]
+
+
+def test_hydrate(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'get_batch')
+
+    partial = list(TestModel.ByBaz.query(baz="bbq"))
+    assert [result.child for result in partial] == [None, None]
+
+    results = list(TestModel.ByBaz.query(baz="bbq").hydrate())
+    assert [result.bar for result in results] == ['one', 'three']
+    assert [result.child['sub'] for result in results] == ['one', 'three']
+    assert TestModel.Table.get_batch.call_count == 1
+
+    # reads that return full items don't need hydrating
+    assert len(list(TestModel.query(foo="first").hydrate())) == 3
+    assert TestModel.Table.get_batch.call_count == 1
+
+    # items that were deleted after the index was read are skipped
+    mocker.stopall()
+    mocker.patch.object(TestModel.Table.__class__, 'get_batch', return_value=[
+        {"foo": "first", "bar": "three", "baz": "bbq", "count": 333, "child": {"sub": "three"}},
+    ])
+    results = list(TestModel.ByBaz.query(baz="bbq").hydrate())
+    assert [result.bar for result in results] == ['three']
+
+
+def test_query_many(TestModel, TestModel_entries, dynamo_local, mocker):
+    TestModel.put_batch(
+        {"foo": "second", "bar": "four", "baz": "bbq", "count": 444},
+        {"foo": "second", "bar": "zero", "baz": "bbq", "count": 0},
+    )
+
+    results = TestModel.query_many(["first", "second", "third", "first"])
+    assert [result.bar for result in results] == ['four', 'one', 'three', 'two', 'zero']
+
+    results = TestModel.query_many(["first", "second"], reverse=True)
+    assert [result.bar for result in results] == ['zero', 'two', 'three', 'one', 'four']
+
+    results = TestModel.query_many(["first", "second"], count__gt=200)
+    assert [result.bar for result in results] == ['four', 'three', 'two']
+
+    # once enough items have been produced no more pages are read
+    mocker.spy(TestModel.Table.__class__, 'query')
+    results = list(TestModel.query_many(["first", "second"], max_items=1))
+    assert [result.bar for result in results] == ['four']
+    assert TestModel.Table.query.call_count == 2
+    for call in TestModel.Table.query.call_args_list:
+        assert call[1]['query_kwargs']['Limit'] == 1
+
+
+def test_query_union(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'query')
+
+    results = list(TestModel.query_union([
+        dict(foo="first", bar="one"),
+        dict(bar="two"),
+        dict(foo="first", bar__begins_with="t"),
+    ]))
+    assert sorted(result.count for result in results) == [111, 222, 333]
+    assert TestModel.Table.query.call_count == 3
+
+    # conditions that are shared by the branches
+    results = list(TestModel.query_union([dict(bar="one"), dict(bar="two")], count__gt=200))
+    assert [result.count for result in results] == [222]
+
+
+def test_get_keys(TestModel, TestModel_entries, dynamo_local, mocker):
+    mocker.spy(TestModel.Table.__class__, 'query')
+    mocker.spy(TestModel.Table.__class__, 'scan')
+    mocker.spy(TestModel.Table.__class__, 'get_batch')
+
+    # the items are read by their keys, in order, and any other conditions are applied to them
+    results = TestModel.query(foo='first', bar__in=['three', 'one', 'nope', 'two'], get_keys=True)
+    assert [result.count for result in results] == [333, 111, 222]
+    assert TestModel.Table.get_batch.call_count == 1
+
+    results = TestModel.scan(foo__in=['first', 'second'], bar__in=['one', 'two', 'three'], baz='bbq',
+                             get_keys=True)
+    assert [result.count for result in results] == [111, 333]
+    assert list(TestModel.scan(foo='first', bar='two', get_keys=True).filter(Q(count__gt=300))) == []
+    assert TestModel.Table.query.call_count == 0
+    assert TestModel.Table.scan.call_count == 0
+
+    # paging through the keys
+    results = TestModel.query(foo='first', bar__in=['one', 'two', 'three'], get_keys=True).limit(2)
+    assert [result.count for result in results] == [111, 222]
+    assert [result.count for result in results.again()] == [333]
+    assert results.last is None
+
+    results = TestModel.query(foo='first', bar__in=['one', 'nope', 'two', 'three'], get_keys=True)
+    assert [result.count for result in results[:2]] == [111, 222]
+    assert results.count() == 3
+    assert results.filter(baz='wtf').count() == 1
+
+    # projections still include the keys
+    result = TestModel.query(foo='first', bar__in=['two'], get_keys=True).only('count').first()
+    assert result.count == 222
+    assert result.bar == 'two'
+
+    # filtered reads fetch the whole items, but only return what was asked for
+    result = TestModel.query(foo='first', bar__in=['two'], baz='wtf', get_keys=True).only('count').first()
+    assert result._raw == {'foo': 'first', 'bar': 'two', 'count': 222}
+
+    # reads are only sent as batched gets when asked to
+    assert isinstance(TestModel.query(foo='first', bar__in=['one']), QueryIterator)
+    assert isinstance(TestModel.scan(foo='first', bar='one'), ScanIterator)
+    assert [result.count for result in TestModel.scan(foo='first', bar='one')] == [111]
+    with pytest.raises(InvalidKey):
+        TestModel.query(foo='first', get_keys=True)
+    with pytest.raises(InvalidKey):
+        TestModel.scan(foo='first', bar='one', scan_kwargs={'Segment': 0, 'TotalSegments': 2}, get_keys=True)
+
+
+def test_get_keys_normalized(dynamo_local, request):
+    class Reading(DynaModel):
+        class Table:
+            name = 'readings'
+            hash_key = 'sensor'
+            range_key = 'number'
+            read = 5
+            write = 5
+
+        class Schema:
+            sensor = String(required=True)
+            number = Number(required=True)
+
+    Reading.Table.create_table()
+    request.addfinalizer(Reading.Table.delete)
+    Reading.put_batch({'sensor': 'a', 'number': 1}, {'sensor': 'a', 'number': 2})
+
+    # key values are converted by the schema, just like the keys of get
+    assert Reading.get(sensor='a', number='2').number == 2
+    results = Reading.query(sensor='a', number__in=['2', '1', '3'], get_keys=True)
+    assert [result.number for result in results] == [2, 1]
+    assert [result.number for result in Reading.scan(sensor='a', number__eq='1', get_keys=True)] == [1]